@@ -1,12 +1,42 @@
 import random
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from guidance import get_guidance_index
+from price_store import get_indicator_snapshot
+from stock_universe import get_stock_universe
 
 class FinancialAIAdvisor:
     """
     AI-powered financial advisor that provides investment suggestions and financial guidance
     """
     
+    # Stock risk levels each user risk profile may be recommended
+    PROFILE_RISK_TIERS = {
+        "Conservative": ("Conservative",),
+        "Moderate": ("Conservative", "Moderate", "Aggressive"),
+        "Aggressive": ("Moderate", "Aggressive")
+    }
+    
+    # Strategic asset allocation each user risk profile stands for (see monte_carlo.py)
+    PROFILE_ALLOCATIONS = {
+        "Conservative": {"stocks": 0.30, "bonds": 0.55, "cash": 0.15},
+        "Moderate": {"stocks": 0.60, "bonds": 0.35, "cash": 0.05},
+        "Aggressive": {"stocks": 0.90, "bonds": 0.10, "cash": 0.00}
+    }
+
+    # Market sentiment -> (primary sectors, secondary sectors); also the tie-break
+    # order when ranking sectors by their own news sentiment
+    SENTIMENT_SECTORS = {
+        "bullish": (["Technology", "Consumer Discretionary", "Financial Services"], ["Healthcare", "Industrials"]),
+        "bearish": (["Consumer Staples", "Healthcare", "Utilities"], ["Financial Services", "Energy"]),
+        "neutral": (["Technology", "Healthcare", "Financial Services"], ["Consumer Staples", "Energy"])
+    }
+    
+    # Pseudo-articles of neutral news added to each sector when ranking, so a
+    # sector with a handful of positive headlines does not outrank a well-covered one
+    SECTOR_PRIOR_ARTICLES = 5
+    
     def __init__(self):
         self.risk_levels = ["Conservative", "Moderate", "Aggressive"]
         self.investment_types = {
@@ -24,51 +54,11 @@ class FinancialAIAdvisor:
             "Materials", "Real Estate", "Utilities", "Communication Services"
         ]
         
-        # Stock recommendations database
-        self.stock_recommendations = {
-            "Technology": {
-                "AAPL": {"name": "Apple Inc.", "sector": "Technology", "risk": "Moderate", "description": "Leading consumer electronics and software company"},
-                "MSFT": {"name": "Microsoft Corporation", "sector": "Technology", "risk": "Moderate", "description": "Software and cloud services leader"},
-                "GOOGL": {"name": "Alphabet Inc.", "sector": "Technology", "risk": "Moderate", "description": "Internet services and advertising giant"},
-                "NVDA": {"name": "NVIDIA Corporation", "sector": "Technology", "risk": "Aggressive", "description": "Semiconductor and AI technology leader"},
-                "TSLA": {"name": "Tesla Inc.", "sector": "Technology", "risk": "Aggressive", "description": "Electric vehicles and clean energy"},
-                "AMZN": {"name": "Amazon.com Inc.", "sector": "Technology", "risk": "Moderate", "description": "E-commerce and cloud computing leader"}
-            },
-            "Healthcare": {
-                "JNJ": {"name": "Johnson & Johnson", "sector": "Healthcare", "risk": "Conservative", "description": "Pharmaceutical and medical devices"},
-                "PFE": {"name": "Pfizer Inc.", "sector": "Healthcare", "risk": "Conservative", "description": "Pharmaceutical company"},
-                "UNH": {"name": "UnitedHealth Group", "sector": "Healthcare", "risk": "Moderate", "description": "Healthcare insurance and services"},
-                "ABBV": {"name": "AbbVie Inc.", "sector": "Healthcare", "risk": "Moderate", "description": "Biopharmaceutical company"},
-                "TMO": {"name": "Thermo Fisher Scientific", "sector": "Healthcare", "risk": "Moderate", "description": "Life sciences and laboratory equipment"}
-            },
-            "Financial Services": {
-                "JPM": {"name": "JPMorgan Chase & Co.", "sector": "Financial Services", "risk": "Moderate", "description": "Leading banking and financial services"},
-                "BAC": {"name": "Bank of America Corp.", "sector": "Financial Services", "risk": "Moderate", "description": "Major banking institution"},
-                "WFC": {"name": "Wells Fargo & Co.", "sector": "Financial Services", "risk": "Moderate", "description": "Diversified financial services"},
-                "GS": {"name": "Goldman Sachs Group", "sector": "Financial Services", "risk": "Aggressive", "description": "Investment banking and securities"},
-                "V": {"name": "Visa Inc.", "sector": "Financial Services", "risk": "Moderate", "description": "Digital payments technology"}
-            },
-            "Consumer Discretionary": {
-                "TSLA": {"name": "Tesla Inc.", "sector": "Consumer Discretionary", "risk": "Aggressive", "description": "Electric vehicles and clean energy"},
-                "NKE": {"name": "Nike Inc.", "sector": "Consumer Discretionary", "risk": "Moderate", "description": "Athletic footwear and apparel"},
-                "SBUX": {"name": "Starbucks Corporation", "sector": "Consumer Discretionary", "risk": "Moderate", "description": "Coffee retail and beverages"},
-                "HD": {"name": "Home Depot Inc.", "sector": "Consumer Discretionary", "risk": "Moderate", "description": "Home improvement retail"},
-                "MCD": {"name": "McDonald's Corporation", "sector": "Consumer Discretionary", "risk": "Conservative", "description": "Fast food restaurant chain"}
-            },
-            "Energy": {
-                "XOM": {"name": "Exxon Mobil Corporation", "sector": "Energy", "risk": "Moderate", "description": "Oil and gas exploration and production"},
-                "CVX": {"name": "Chevron Corporation", "sector": "Energy", "risk": "Moderate", "description": "Integrated oil and gas company"},
-                "COP": {"name": "ConocoPhillips", "sector": "Energy", "risk": "Aggressive", "description": "Oil and gas exploration and production"},
-                "EOG": {"name": "EOG Resources Inc.", "sector": "Energy", "risk": "Aggressive", "description": "Oil and gas exploration and production"}
-            },
-            "Consumer Staples": {
-                "PG": {"name": "Procter & Gamble Co.", "sector": "Consumer Staples", "risk": "Conservative", "description": "Consumer goods and household products"},
-                "KO": {"name": "Coca-Cola Company", "sector": "Consumer Staples", "risk": "Conservative", "description": "Beverage company"},
-                "WMT": {"name": "Walmart Inc.", "sector": "Consumer Staples", "risk": "Conservative", "description": "Retail and e-commerce"},
-                "COST": {"name": "Costco Wholesale Corp.", "sector": "Consumer Staples", "risk": "Moderate", "description": "Membership-based retail"},
-                "PEP": {"name": "PepsiCo Inc.", "sector": "Consumer Staples", "risk": "Conservative", "description": "Beverages and snacks"}
-            }
-        }
+        # (stock universe, price indicators) the pick index was built from; rebuilt when either reloads
+        self._indexed_sources = None
+        
+        # Knowledge-base intent matcher for provide_financial_guidance
+        self.guidance_index = get_guidance_index()
     
     def analyze_market_sentiment(self, news_items: List[Dict]) -> Dict:
         """
@@ -77,16 +67,26 @@ class FinancialAIAdvisor:
         if not news_items:
             return {"sentiment": "neutral", "confidence": 0.5, "trend": "stable"}
         
-        positive_count = sum(1 for item in news_items if item.get("sentiment") == "positive")
-        negative_count = sum(1 for item in news_items if item.get("sentiment") == "negative")
-        neutral_count = sum(1 for item in news_items if item.get("sentiment") == "neutral")
+        sentiment_counts = {}
+        for item in news_items:
+            sentiment_counts[item.get("sentiment")] = sentiment_counts.get(item.get("sentiment"), 0) + 1
+        return self.analyze_sentiment_counts(sentiment_counts, len(news_items))
+    
+    def analyze_sentiment_counts(self, sentiment_counts: Dict[str, int], total: int) -> Dict:
+        """
+        analyze_market_sentiment over precomputed per-label counts of `total` news items
+        """
+        if not total:
+            return {"sentiment": "neutral", "confidence": 0.5, "trend": "stable"}
         
-        total = len(news_items)
+        positive_count = sentiment_counts.get("positive", 0)
+        negative_count = sentiment_counts.get("negative", 0)
+        neutral_count = sentiment_counts.get("neutral", 0)
         
         # Calculate sentiment scores
-        positive_score = positive_count / total if total > 0 else 0
-        negative_score = negative_count / total if total > 0 else 0
-        neutral_score = neutral_count / total if total > 0 else 0
+        positive_score = positive_count / total
+        negative_score = negative_count / total
+        neutral_score = neutral_count / total
         
         # Determine overall sentiment
         if positive_score > 0.6:
@@ -222,119 +222,34 @@ class FinancialAIAdvisor:
     
     def provide_financial_guidance(self, question: str, context: Dict = None) -> Dict:
         """
-        Provide AI-powered financial guidance for common questions
+        Provide AI-powered financial guidance for common questions.
+        The question is matched against the guidance knowledge base (see guidance.py);
+        the best topic supplies the answer and the ranked matches are included.
+        context may carry "related_news" (article dicts with a sentiment) to attach.
         """
-        question_lower = question.lower()
+        matches = self.guidance_index.match(question)
+        topic = self.guidance_index.topics[matches[0][0]] if matches else self.guidance_index.default
         
         guidance = {
-            "answer": "",
-            "key_points": [],
-            "recommendations": [],
-            "resources": []
-        }
-        
-        # Investment strategy guidance
-        if any(word in question_lower for word in ["start", "begin", "invest", "first time"]):
-            guidance["answer"] = "For beginners, start with a diversified approach using index funds or ETFs. Consider your risk tolerance and investment timeline."
-            guidance["key_points"] = [
-                "Start with index funds for broad market exposure",
-                "Diversify across different asset classes",
-                "Consider your risk tolerance and time horizon",
-                "Use dollar-cost averaging to reduce timing risk"
-            ]
-            guidance["recommendations"] = [
-                "Open a retirement account (401k, IRA)",
-                "Start with S&P 500 index fund",
-                "Set up automatic monthly contributions",
-                "Educate yourself about basic investment concepts"
-            ]
-        
-        # Risk management guidance
-        elif any(word in question_lower for word in ["risk", "safe", "protect", "secure"]):
-            guidance["answer"] = "Risk management is crucial for long-term investment success. Diversification and proper asset allocation are key."
-            guidance["key_points"] = [
-                "Diversify across different asset classes",
-                "Don't put all eggs in one basket",
-                "Consider your investment timeline",
-                "Regularly rebalance your portfolio"
-            ]
-            guidance["recommendations"] = [
-                "Maintain emergency fund (3-6 months expenses)",
-                "Use asset allocation based on age and risk tolerance",
-                "Consider bonds for stability",
-                "Review portfolio quarterly"
-            ]
-        
-        # Market timing guidance
-        elif any(word in question_lower for word in ["timing", "when", "best time", "market"]):
-            guidance["answer"] = "Market timing is extremely difficult. Focus on time in the market rather than timing the market."
-            guidance["key_points"] = [
-                "Time in the market beats timing the market",
-                "Dollar-cost averaging reduces timing risk",
-                "Focus on long-term investment goals",
-                "Don't try to predict short-term market movements"
-            ]
-            guidance["recommendations"] = [
-                "Use dollar-cost averaging strategy",
-                "Set up automatic monthly investments",
-                "Focus on long-term goals (5+ years)",
-                "Ignore short-term market noise"
-            ]
-        
-        # Retirement planning guidance
-        elif any(word in question_lower for word in ["retirement", "401k", "ira", "pension"]):
-            guidance["answer"] = "Start early and maximize tax-advantaged accounts. Compound interest is your friend for retirement planning."
-            guidance["key_points"] = [
-                "Start saving for retirement as early as possible",
-                "Maximize employer matching contributions",
-                "Use tax-advantaged accounts (401k, IRA)",
-                "Consider your retirement timeline and goals"
-            ]
-            guidance["recommendations"] = [
-                "Contribute to employer 401k up to match",
-                "Open and fund IRA accounts",
-                "Increase contributions annually",
-                "Consider Roth vs Traditional IRA based on tax situation"
-            ]
-        
-        # Stock vs ETF guidance
-        elif any(word in question_lower for word in ["stock", "etf", "fund", "individual"]):
-            guidance["answer"] = "ETFs offer instant diversification and are great for most investors. Individual stocks require more research and carry higher risk."
-            guidance["key_points"] = [
-                "ETFs provide instant diversification",
-                "Individual stocks require more research",
-                "ETFs typically have lower fees",
-                "Consider your time and expertise"
-            ]
-            guidance["recommendations"] = [
-                "Start with broad market ETFs",
-                "Use ETFs for sector exposure",
-                "Consider individual stocks for 5-10% of portfolio",
-                "Research companies thoroughly before investing"
-            ]
-        
-        # General financial advice
-        else:
-            guidance["answer"] = "Focus on building a solid financial foundation: emergency fund, debt management, and long-term investing."
-            guidance["key_points"] = [
-                "Build emergency fund first",
-                "Pay off high-interest debt",
-                "Start investing early and regularly",
-                "Diversify your investments"
-            ]
-            guidance["recommendations"] = [
-                "Create and follow a budget",
-                "Build 3-6 months emergency fund",
-                "Pay off credit card debt",
-                "Start investing in index funds"
+            "answer": topic["answer"],
+            "key_points": list(topic["key_points"]),
+            "recommendations": list(topic["recommendations"]),
+            "resources": list(topic.get("resources", self.guidance_index.resources)),
+            "topic": topic["id"],
+            "matches": [
+                {"topic": topic_id, "title": self.guidance_index.topics[topic_id]["title"], "score": score}
+                for topic_id, score in matches
             ]
+        }
         
-        guidance["resources"] = [
-            "Financial education websites",
-            "Investment books and courses",
-            "Financial advisor consultation",
-            "Online investment platforms"
-        ]
+        # Relevant stored articles (context["related_news"], see news_search.py) and their overall tone
+        related_news = (context or {}).get("related_news")
+        if related_news:
+            sentiment_counts = {}
+            for item in related_news:
+                sentiment_counts[item.get("sentiment")] = sentiment_counts.get(item.get("sentiment"), 0) + 1
+            guidance["related_news"] = related_news
+            guidance["news_sentiment"] = self.analyze_sentiment_counts(sentiment_counts, len(related_news))
         
         return guidance
     
@@ -349,35 +264,43 @@ class FinancialAIAdvisor:
         recent_news = [item for item in news_items if item.get("publishedAt") and 
                       (datetime.now() - item["publishedAt"]).days <= 7]
         
+        sentiment_counts = {}
+        countries = {}
+        for item in recent_news:
+            sentiment_counts[item.get("sentiment")] = sentiment_counts.get(item.get("sentiment"), 0) + 1
+            country = item.get("country", "Unknown")
+            countries[country] = countries.get(country, 0) + 1
+        return self.market_insights_from_counts(sentiment_counts, countries, len(recent_news))
+    
+    def market_insights_from_counts(self, sentiment_counts: Dict[str, int], country_counts: Dict[str, int],
+                                    recent_total: int) -> Dict:
+        """
+        generate_market_insights over precomputed counts for the last 7 days
+        """
         insights = []
         trends = []
         
         # Analyze sentiment trends
-        positive_news = [item for item in recent_news if item.get("sentiment") == "positive"]
-        negative_news = [item for item in recent_news if item.get("sentiment") == "negative"]
+        positive_count = sentiment_counts.get("positive", 0)
+        negative_count = sentiment_counts.get("negative", 0)
         
-        if len(positive_news) > len(negative_news) * 2:
+        if positive_count > negative_count * 2:
             insights.append("Strong positive sentiment in recent news suggests bullish market conditions.")
-        elif len(negative_news) > len(positive_news) * 2:
+        elif negative_count > positive_count * 2:
             insights.append("Strong negative sentiment in recent news suggests cautious market approach.")
         else:
             insights.append("Mixed market sentiment indicates balanced approach to investing.")
         
         # Analyze geographic trends
-        countries = {}
-        for item in recent_news:
-            country = item.get("country", "Unknown")
-            countries[country] = countries.get(country, 0) + 1
-        
-        if countries:
-            top_countries = sorted(countries.items(), key=lambda x: x[1], reverse=True)[:3]
+        if country_counts:
+            top_countries = sorted(country_counts.items(), key=lambda x: x[1], reverse=True)[:3]
             trends.append(f"Major news focus: {', '.join([f'{country} ({count})' for country, count in top_countries])}")
         
         # Generate summary
-        summary = f"Analysis of {len(recent_news)} recent news items shows "
-        if len(positive_news) > len(negative_news):
+        summary = f"Analysis of {recent_total} recent news items shows "
+        if positive_count > negative_count:
             summary += "generally positive market sentiment with opportunities for growth investments."
-        elif len(negative_news) > len(positive_news):
+        elif negative_count > positive_count:
             summary += "cautious market sentiment suggesting defensive positioning."
         else:
             summary += "balanced market sentiment requiring careful analysis of individual opportunities."
@@ -386,13 +309,118 @@ class FinancialAIAdvisor:
             "insights": insights,
             "trends": trends,
             "summary": summary,
-            "recent_news_count": len(recent_news),
-            "positive_ratio": len(positive_news) / len(recent_news) if recent_news else 0
+            "recent_news_count": recent_total,
+            "positive_ratio": positive_count / recent_total if recent_total else 0
         }
     
-    def generate_stock_recommendations(self, market_sentiment: Dict, user_risk_profile: str = "Moderate", max_recommendations: int = 6) -> Dict:
+    def market_insights_from_windows(self, windows: Dict[str, Dict]) -> Dict:
         """
-        Generate specific stock recommendations based on market sentiment and risk profile
+        Market insights from sliding-window counts (see market_window.py):
+        the 7-day window drives the insights, with 24h/1h activity as trends
+        """
+        week = windows["7d"]
+        if not week["total"]:
+            return {"insights": [], "trends": [], "summary": "No news data available for analysis.",
+                    "recent_news_count": 0, "positive_ratio": 0, "windows": {}}
+        
+        market_insights = self.market_insights_from_counts(week["sentiment_counts"], week["region_counts"], week["total"])
+        for name, label in (("24h", "Last 24 hours"), ("1h", "Last hour")):
+            window = windows.get(name)
+            if window and window["total"]:
+                positive_ratio = window["sentiment_counts"].get("positive", 0) / window["total"]
+                negative_ratio = window["sentiment_counts"].get("negative", 0) / window["total"]
+                market_insights["trends"].append(
+                    f"{label}: {window['total']} articles, {positive_ratio:.0%} positive / {negative_ratio:.0%} negative")
+        market_insights["windows"] = {
+            name: {"total": window["total"], "sentiment_counts": window["sentiment_counts"]}
+            for name, window in windows.items()
+        }
+        return market_insights
+    
+    @property
+    def stock_recommendations(self) -> Dict[str, Dict[str, Dict]]:
+        """Stock universe as sector -> symbol -> info (see stock_universe.py)"""
+        return get_stock_universe().sector_map()
+    
+    def _ensure_pick_index(self):
+        sources = (get_stock_universe(), get_indicator_snapshot())
+        if self._indexed_sources is None or any(a is not b for a, b in zip(sources, self._indexed_sources)):
+            self._build_pick_index(*sources)
+            self._indexed_sources = sources
+    
+    def _build_pick_index(self, universe, indicators):
+        """
+        Precompute pick records for generate_stock_recommendations.
+        _pick_index maps (sector, user risk profile) to the stocks that profile
+        may hold, in universe order, as (record, reasoning by sentiment) pairs
+        with the URLs already formatted; _chart_links maps symbol to its chart
+        URLs. Building is linear in the universe size and a recommendation call
+        only touches the picks it returns.
+        Risk tiers come from measured volatility (price_store.py) where the
+        local price store has history, and from the universe file otherwise.
+        """
+        pick_index = {}
+        chart_links = {}
+        measured_tiers = indicators.risk_tiers()
+        for sector, sector_stocks in universe.sector_map().items():
+            for symbol, stock_info in sector_stocks.items():
+                exchange = stock_info["exchange"]
+                if symbol in measured_tiers:
+                    stock_info = dict(stock_info, risk=measured_tiers[symbol])
+                record = {
+                    "symbol": symbol,
+                    "name": stock_info["name"],
+                    "sector": stock_info["sector"],
+                    "risk_level": stock_info["risk"],
+                    "risk_source": "measured" if symbol in measured_tiers else "assigned",
+                    "description": stock_info["description"],
+                    "exchange": exchange,
+                    "indicators": indicators.metrics.get(symbol),
+                    "chart_url": f"https://www.tradingview.com/symbols/{exchange}-{symbol}/",
+                    "analysis_url": f"https://finance.yahoo.com/quote/{symbol}"
+                }
+                chart_links.setdefault(symbol, {
+                    "tradingview": f"https://www.tradingview.com/symbols/{exchange}-{symbol}/",
+                    "yahoo_finance": f"https://finance.yahoo.com/quote/{symbol}",
+                    "marketwatch": f"https://www.marketwatch.com/investing/stock/{symbol}",
+                    "google_finance": f"https://www.google.com/finance/quote/{symbol}:{exchange}"
+                })
+                for risk_profile, allowed_risks in self.PROFILE_RISK_TIERS.items():
+                    if stock_info["risk"] not in allowed_risks:
+                        continue
+                    reasoning = {sentiment: self._generate_stock_reasoning(symbol, stock_info, sentiment, risk_profile)
+                                 for sentiment in self.SENTIMENT_SECTORS}
+                    pick_index.setdefault((sector, risk_profile), []).append((record, reasoning))
+        # swap both at once so concurrent requests never see a half-built index
+        self._pick_index, self._chart_links = pick_index, chart_links
+
+    def rank_sectors(self, sector_sentiment: Optional[Dict[str, Dict]], sentiment: str = "neutral") -> Tuple[List[str], List[str]]:
+        """
+        (primary, secondary) sectors ranked by the sentiment of each sector's own news
+        (see sectors.query_sector_sentiment). Only sectors with stocks are ranked,
+        sectors without news score neutral and ties keep the SENTIMENT_SECTORS order
+        for the market sentiment. Without any sector news that mapping is returned.
+        """
+        primary, secondary = self.SENTIMENT_SECTORS.get(sentiment, self.SENTIMENT_SECTORS["neutral"])
+        if not sector_sentiment:
+            return primary, secondary
+        fallback = list(dict.fromkeys(primary + secondary + list(self.stock_recommendations)))
+        
+        def shrunk_net(sector):
+            stats = sector_sentiment.get(sector)
+            if not stats:
+                return 0.0
+            return (stats["positive"] - stats["negative"]) / (stats["total"] + self.SECTOR_PRIOR_ARTICLES)
+        
+        ranked = sorted((sector for sector in fallback if sector in self.stock_recommendations),
+                        key=lambda sector: (-shrunk_net(sector), fallback.index(sector)))
+        return ranked[:len(primary)], ranked[len(primary):len(primary) + len(secondary)]
+    
+    def generate_stock_recommendations(self, market_sentiment: Dict, user_risk_profile: str = "Moderate", max_recommendations: int = 6,
+                                       sector_sentiment: Optional[Dict[str, Dict]] = None) -> Dict:
+        """
+        Generate specific stock recommendations based on market sentiment and risk profile.
+        With sector_sentiment (sector -> rolling news sentiment) sectors are chosen by rank_sectors.
         """
         sentiment = market_sentiment.get("sentiment", "neutral")
         confidence = market_sentiment.get("confidence", 0.5)
@@ -405,94 +433,57 @@ class FinancialAIAdvisor:
             "analysis": {}
         }
         
-        # Select sectors based on sentiment
-        if sentiment == "bullish":
-            primary_sectors = ["Technology", "Consumer Discretionary", "Financial Services"]
-            secondary_sectors = ["Healthcare", "Industrials"]
-        elif sentiment == "bearish":
-            primary_sectors = ["Consumer Staples", "Healthcare", "Utilities"]
-            secondary_sectors = ["Financial Services", "Energy"]
-        else:
-            primary_sectors = ["Technology", "Healthcare", "Financial Services"]
-            secondary_sectors = ["Consumer Staples", "Energy"]
-        
-        # Generate stock picks
-        all_picks = []
-        
-        # Add stocks from primary sectors
-        for sector in primary_sectors:
-            if sector in self.stock_recommendations:
-                sector_stocks = self.stock_recommendations[sector]
-                for symbol, stock_info in sector_stocks.items():
-                    # Filter by risk profile
-                    if user_risk_profile == "Conservative" and stock_info["risk"] == "Conservative":
-                        all_picks.append((symbol, stock_info, "primary"))
-                    elif user_risk_profile == "Aggressive" and stock_info["risk"] in ["Moderate", "Aggressive"]:
-                        all_picks.append((symbol, stock_info, "primary"))
-                    elif user_risk_profile == "Moderate":
-                        all_picks.append((symbol, stock_info, "primary"))
-        
-        # Add stocks from secondary sectors
-        for sector in secondary_sectors:
-            if sector in self.stock_recommendations:
-                sector_stocks = self.stock_recommendations[sector]
-                for symbol, stock_info in sector_stocks.items():
-                    if user_risk_profile == "Conservative" and stock_info["risk"] == "Conservative":
-                        all_picks.append((symbol, stock_info, "secondary"))
-                    elif user_risk_profile == "Aggressive" and stock_info["risk"] in ["Moderate", "Aggressive"]:
-                        all_picks.append((symbol, stock_info, "secondary"))
-                    elif user_risk_profile == "Moderate":
-                        all_picks.append((symbol, stock_info, "secondary"))
-        
-        # Select top picks (limit to max_recommendations)
-        selected_picks = all_picks[:max_recommendations]
-        
-        # Format recommendations
-        for symbol, stock_info, priority in selected_picks:
-            recommendation = {
-                "symbol": symbol,
-                "name": stock_info["name"],
-                "sector": stock_info["sector"],
-                "risk_level": stock_info["risk"],
-                "description": stock_info["description"],
-                "priority": priority,
-                "chart_url": f"https://www.tradingview.com/symbols/NASDAQ-{symbol}/",
-                "analysis_url": f"https://finance.yahoo.com/quote/{symbol}",
-                "reasoning": self._generate_stock_reasoning(symbol, stock_info, sentiment, user_risk_profile)
-            }
-            recommendations["top_picks"].append(recommendation)
+        self._ensure_pick_index()
+        pick_index, chart_links = self._pick_index, self._chart_links
+        
+        # Select sectors by their own news sentiment (the fixed mapping when there is none)
+        primary_sectors, secondary_sectors = self.rank_sectors(sector_sentiment, sentiment)
+        
+        # Take picks sector by sector from the precomputed index until max_recommendations
+        top_picks = recommendations["top_picks"]
+        picks_by_sector = {}
+        for priority, sectors in (("primary", primary_sectors), ("secondary", secondary_sectors)):
+            for sector in sectors:
+                for record, reasoning in pick_index.get((sector, user_risk_profile), ()):
+                    if len(top_picks) >= max_recommendations:
+                        break
+                    pick = dict(record, priority=priority, reasoning=reasoning.get(sentiment, reasoning["neutral"]))
+                    top_picks.append(pick)
+                    picks_by_sector.setdefault(sector, []).append(pick)
         
         # Generate sector recommendations
-        for sector in primary_sectors + secondary_sectors:
-            if sector in self.stock_recommendations:
-                sector_stocks = [stock for stock in recommendations["top_picks"] if stock["sector"] == sector]
-                if sector_stocks:
-                    recommendations["sector_recommendations"][sector] = {
-                        "stocks": sector_stocks,
-                        "sentiment": "positive" if sentiment == "bullish" else "neutral" if sentiment == "neutral" else "negative",
-                        "reasoning": f"{sector} sector shows {sentiment} sentiment based on market analysis"
-                    }
+        sector_label = "positive" if sentiment == "bullish" else "neutral" if sentiment == "neutral" else "negative"
+        for sector, sector_stocks in picks_by_sector.items():
+            stats = (sector_sentiment or {}).get(sector)
+            if stats:
+                net = stats["net"]
+                recommendations["sector_recommendations"][sector] = {
+                    "stocks": sector_stocks,
+                    "sentiment": "positive" if net > 0.1 else "negative" if net < -0.1 else "neutral",
+                    "reasoning": f"{sector} news is net {net:+.0%} ({stats['positive']} positive, {stats['negative']} negative of {stats['total']} recent articles)",
+                    "news": stats
+                }
+                continue
+            recommendations["sector_recommendations"][sector] = {
+                "stocks": sector_stocks,
+                "sentiment": sector_label,
+                "reasoning": f"{sector} sector shows {sentiment} sentiment based on market analysis"
+            }
         
         # Generate risk-adjusted picks
-        conservative_picks = [stock for stock in recommendations["top_picks"] if stock["risk_level"] == "Conservative"]
-        moderate_picks = [stock for stock in recommendations["top_picks"] if stock["risk_level"] == "Moderate"]
-        aggressive_picks = [stock for stock in recommendations["top_picks"] if stock["risk_level"] == "Aggressive"]
+        by_risk = {"Conservative": [], "Moderate": [], "Aggressive": []}
+        for stock in top_picks:
+            by_risk[stock["risk_level"]].append(stock)
         
         recommendations["risk_adjusted_picks"] = {
-            "conservative": conservative_picks[:2],
-            "moderate": moderate_picks[:3],
-            "aggressive": aggressive_picks[:2]
+            "conservative": by_risk["Conservative"][:2],
+            "moderate": by_risk["Moderate"][:3],
+            "aggressive": by_risk["Aggressive"][:2]
         }
         
         # Generate chart data URLs
-        for stock in recommendations["top_picks"]:
-            symbol = stock["symbol"]
-            recommendations["chart_data"][symbol] = {
-                "tradingview": f"https://www.tradingview.com/symbols/NASDAQ-{symbol}/",
-                "yahoo_finance": f"https://finance.yahoo.com/quote/{symbol}",
-                "marketwatch": f"https://www.marketwatch.com/investing/stock/{symbol}",
-                "google_finance": f"https://www.google.com/finance/quote/{symbol}:NASDAQ"
-            }
+        for stock in top_picks:
+            recommendations["chart_data"][stock["symbol"]] = dict(chart_links[stock["symbol"]])
         
         # Generate analysis summary
         recommendations["analysis"] = {
@@ -1,7 +1,9 @@
+import hashlib
+import math
 import os
-from flask import Flask, render_template, redirect, url_for, flash, request, session
+from flask import Flask, render_template, redirect, url_for, flash, request, session, Response, stream_with_context, jsonify
 from config import Config
-from models import db, User, NewsItem
+from models import db, User, NewsItem, NewsTicker, upgrade_schema
 from forms import RegisterForm, LoginForm
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -36,9 +38,22 @@ except ImportError as e:
         RSS_AVAILABLE = False
         print("⚠️  Using dummy RSS functions")
 
-from sentiment import analyze_text
-from strategy import generate_strategy
+from sentiment import analyze_text, get_sentiment_cache, lexicon_version
+from strategy import generate_strategy, get_strategy_rules
 from ai_advisor import FinancialAIAdvisor
+from news_export import export_news, parse_export_date, EXPORT_FORMATS
+from rescore import start_background_rescore
+from entities import get_entity_extractor, link_news_tickers
+from watermark import bump_watermark, read_watermark, WatermarkCache
+from news_aggregates import query_market_aggregates
+from market_window import SlidingWindowAggregator, to_utc_timestamp
+from news_search import index_news, search_news
+from sectors import get_sector_classifier, tag_news, query_sector_sentiment
+from monte_carlo import cached_simulation, DEFAULT_PATHS, DEFAULT_SEED
+from portfolio import covariance_cache, optimize_weights, weight_picks
+from stock_universe import get_stock_universe, RISK_TIERS
+from price_store import get_indicator_snapshot
+from sentiment_index import update_index, ensure_index, index_series, GRANULARITIES, ALL_REGIONS
 from flask_mail import Mail, Message
 from authlib.integrations.flask_client import OAuth
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -117,6 +132,76 @@ def create_app():
         
         return all_articles
 
+    def _store_articles(articles, default_region, force_region=False):
+        """
+        Score and store articles whose URL is not already in the database.
+        Returns the number of new items stored.
+        """
+        urls = [a["url"] for a in articles if a.get("url")]
+        existing = set()
+        for i in range(0, len(urls), 500):
+            batch = urls[i:i + 500]
+            existing.update(url for (url,) in db.session.query(NewsItem.url).filter(NewsItem.url.in_(batch)))
+
+        version = lexicon_version()
+        rules = get_strategy_rules()
+        extractor = get_entity_extractor()
+        classifier = get_sector_classifier()
+        tagged = []
+        sector_tagged = []
+        indexed = []
+        new_items = []
+        stored = 0
+        for a in articles:
+            # avoid duplicates by url (checked before any scoring work)
+            if not a.get("url") or a["url"] in existing:
+                continue
+            existing.add(a["url"])
+            title = a.get("title") or ""
+            desc = a.get("description") or ""
+            text = title + ". " + desc
+            label, score = analyze_text(text)
+            ni = NewsItem(
+                title=title,
+                description=desc,
+                source=a.get("source"),
+                url=a.get("url"),
+                published_at=a.get("publishedAt"),
+                sentiment=label,
+                score=score,
+                region=default_region if force_region else a.get("country", default_region),
+                lexicon_version=version
+            )
+            db.session.add(ni)
+            new_items.append((ni.published_at, ni.region, label))
+            indexed.append(ni)
+            symbols = extractor.extract(text)
+            if symbols:
+                tagged.append((ni, symbols))
+            sectors = classifier.classify(text, symbols)
+            if sectors:
+                sector_tagged.append((ni, sectors, label))
+            stored += 1
+        if stored:
+            # advice for the whole batch, so /news/<id> pages do no rule evaluation
+            for ni, advice in zip(indexed, rules.advise_batch((ni.sentiment, ni.score, ni.region) for ni in indexed)):
+                ni.advice = advice
+            # assign ids to the new rows so ticker links and search postings can reference them
+            db.session.flush()
+            link_news_tickers((ni.id, symbols) for ni, symbols in tagged)
+            tag_news((ni.id, sectors, ni.published_at, label) for ni, sectors, label in sector_tagged)
+            index_news((ni.id, ni.title + ". " + ni.description) for ni in indexed)
+            update_index((published_at, region, label, 1) for published_at, region, label in new_items)
+        watermark_version = bump_watermark() if stored else None
+        db.session.commit()
+        if stored:
+            market_window.apply_ingest(new_items, watermark_version)
+
+        sentiment_cache = get_sentiment_cache()
+        if sentiment_cache is not None:
+            sentiment_cache.flush()
+        return stored
+
     # Login
     login_manager = LoginManager()
     login_manager.login_view = "login"
@@ -133,16 +218,79 @@ def create_app():
             'GOOGLE_SITE_VERIFICATION': app.config.get('GOOGLE_SITE_VERIFICATION', '')
         }
 
+    # 1h/24h/7d news counts for market insights, kept current by _store_articles
+    market_window = SlidingWindowAggregator()
+
     # Initialize database with error handling
     with app.app_context():
         try:
             print("🗄️  Initializing database...")
             db.create_all()
+            upgrade_schema()
             print("✅ Database initialized successfully")
+            market_window.rebuild()
+            ensure_index()
         except Exception as e:
             print(f"⚠️  Database initialization error: {e}")
             print("⚠️  Continuing without database initialization")
 
+    # Bring rows scored with an older lexicon up to date without blocking startup
+    if app.config.get("LEXICON_RESCORE_ON_STARTUP"):
+        start_background_rescore(app,
+                                 batch_size=app.config["LEXICON_RESCORE_BATCH_SIZE"],
+                                 sleep=app.config["LEXICON_RESCORE_SLEEP"])
+
+    def _conditional_json(validators, build, last_modified=None, max_age=None):
+        """
+        JSON response with a strong ETag hashed from `validators`, which must cover
+        every input of the body (usually the news watermark version plus the
+        view's parameters). A client presenting the current ETag (or, without
+        one, an If-Modified-Since not older than `last_modified`) gets a 304 and
+        build() is never called. build() may return an (error body, status)
+        tuple, which is sent as is without validators.
+        """
+        etag = hashlib.sha1(repr(validators).encode("utf-8")).hexdigest()[:24]
+        if request.if_none_match:
+            fresh = request.if_none_match.contains(etag)
+        else:
+            since = request.if_modified_since
+            fresh = (last_modified is not None and since is not None
+                     and last_modified.replace(microsecond=0) <= since.replace(tzinfo=None))
+        if fresh:
+            response = Response(status=304)
+        else:
+            body = build()
+            if isinstance(body, tuple):
+                return body
+            response = jsonify(body)
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        response.cache_control.private = True
+        response.cache_control.max_age = app.config["JSON_API_MAX_AGE"] if max_age is None else max_age
+        return response
+
+    def _limit_arg(default, maximum):
+        """?limit= clamped to 1..maximum; ValueError when it is not an integer"""
+        try:
+            limit = int(request.args.get("limit", default))
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        return max(1, min(limit, maximum))
+
+    def _news_json(n):
+        return {
+            "id": n.id,
+            "title": n.title,
+            "description": n.description,
+            "source": n.source,
+            "url": n.url,
+            "published_at": n.published_at.isoformat() if n.published_at else None,
+            "sentiment": n.sentiment,
+            "score": n.score,
+            "region": n.region
+        }
+
     @app.route("/")
     def home():
         if current_user.is_authenticated:
@@ -311,6 +459,23 @@ def create_app():
         neu = sum(1 for n in news if n.sentiment == "neutral")
         return render_template("dashboard.html", news=news, total=total, pos=pos, neg=neg, neu=neu)
 
+    @app.route("/api/dashboard")
+    @login_required
+    def dashboard_json():
+        """Recent stored news and their sentiment counts, revalidated against the news watermark"""
+        try:
+            limit = _limit_arg(50, 200)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        version, updated_on = read_watermark()
+
+        def build():
+            news = NewsItem.query.order_by(NewsItem.published_at.desc()).limit(limit).all()
+            counts = {label: sum(1 for n in news if n.sentiment == label) for label in ("positive", "negative", "neutral")}
+            return {"total": len(news), **counts, "news": [_news_json(n) for n in news]}
+
+        return _conditional_json(("dashboard", version, limit), build, last_modified=updated_on)
+
     @app.route("/fetch-news", methods=["POST"])
     @login_required
     def fetch_news():
@@ -371,30 +536,7 @@ def create_app():
         all_articles = _merge_and_deduplicate_articles(newsapi_articles, rss_articles)
         
         # Analyze and store
-        stored = 0
-        for a in all_articles:
-            # avoid duplicates by url
-            if a["url"] is None:
-                continue
-            if NewsItem.query.filter_by(url=a["url"]).first():
-                continue
-            title = a.get("title") or ""
-            desc = a.get("description") or ""
-            text = title + ". " + desc
-            label, score = analyze_text(text)
-            ni = NewsItem(
-                title=title,
-                description=desc,
-                source=a.get("source"),
-                url=a.get("url"),
-                published_at=a.get("publishedAt"),
-                sentiment=label,
-                score=score,
-                region=a.get("country", country.upper())
-            )
-            db.session.add(ni)
-            stored += 1
-        db.session.commit()
+        stored = _store_articles(all_articles, country.upper())
         
         # Generate success message
         if use_rss == "both":
@@ -450,29 +592,7 @@ def create_app():
         all_articles = _merge_and_deduplicate_articles(newsapi_articles, rss_articles)
 
         # Analyze and store
-        stored = 0
-        for a in all_articles:
-            if a["url"] is None:
-                continue
-            if NewsItem.query.filter_by(url=a["url"]).first():
-                continue
-            title = a.get("title") or ""
-            desc = a.get("description") or ""
-            text = title + ". " + desc
-            label, score = analyze_text(text)
-            ni = NewsItem(
-                title=title,
-                description=desc,
-                source=a.get("source"),
-                url=a.get("url"),
-                published_at=a.get("publishedAt"),
-                sentiment=label,
-                score=score,
-                region=a.get("country", "INTERNATIONAL")
-            )
-            db.session.add(ni)
-            stored += 1
-        db.session.commit()
+        stored = _store_articles(all_articles, "INTERNATIONAL")
         
         # Generate success message
         if use_rss == "both":
@@ -536,29 +656,7 @@ def create_app():
         all_articles = _merge_and_deduplicate_articles(newsapi_articles, rss_articles)
 
         # Analyze and store
-        stored = 0
-        for a in all_articles:
-            if a["url"] is None:
-                continue
-            if NewsItem.query.filter_by(url=a["url"]).first():
-                continue
-            title = a.get("title") or ""
-            desc = a.get("description") or ""
-            text = title + ". " + desc
-            label, score = analyze_text(text)
-            ni = NewsItem(
-                title=title,
-                description=desc,
-                source=a.get("source"),
-                url=a.get("url"),
-                published_at=a.get("publishedAt"),
-                sentiment=label,
-                score=score,
-                region="GLOBAL"
-            )
-            db.session.add(ni)
-            stored += 1
-        db.session.commit()
+        stored = _store_articles(all_articles, "GLOBAL", force_region=True)
         
         # Generate success message
         if use_rss == "both":
@@ -575,50 +673,101 @@ def create_app():
     @login_required
     def news_item(news_id):
         n = NewsItem.query.get_or_404(news_id)
-        advice = generate_strategy(n.sentiment, region=n.region, user_type="investor")
+        # rows stored before advice was precomputed fall back to the rules
+        advice = n.advice or generate_strategy(n.sentiment, region=n.region, user_type="investor", score=n.score)
         return render_template("news_item.html", n=n, advice=advice)
 
+    @app.route("/api/news/<int:news_id>")
+    @login_required
+    def news_item_json(news_id):
+        """One stored news item with its strategy advice"""
+        version, updated_on = read_watermark()
+        # rows stored before advice was precomputed fall back to the rules, so their version is a validator too
+        rules = get_strategy_rules()
+
+        def build():
+            # only reached on a validator miss; a client can't hold an ETag for a missing item
+            n = db.session.get(NewsItem, news_id)
+            if n is None:
+                return {"error": f"News item {news_id} not found"}, 404
+            return {**_news_json(n), "advice": n.advice or rules.advise(n.sentiment, n.score, n.region)}
+
+        return _conditional_json(("news", version, news_id, rules.version), build, last_modified=updated_on)
+
     @app.route("/profile")
     @login_required
     def profile():
         return render_template("profile.html", user=current_user)
 
+    # /ai-advisor results per (news watermark, risk profile); see watermark.py.
+    # The TTL bounds staleness of the advisor's "last 7 days" window when no news arrives.
+    advisor_cache = WatermarkCache(ttl=app.config["ADVISOR_CACHE_TTL"])
+
     @app.route("/ai-advisor")
     @login_required
     def ai_advisor():
         """AI Advisor dashboard with investment suggestions and stock recommendations"""
-        # Get recent news for analysis
-        recent_news = NewsItem.query.order_by(NewsItem.published_at.desc()).limit(100).all()
-        
-        # Convert to dict format for AI advisor
-        news_data = []
-        for item in recent_news:
-            news_data.append({
-                "sentiment": item.sentiment,
-                "publishedAt": item.published_at,
-                "country": item.region
-            })
-        
-        # Get market sentiment analysis
-        market_sentiment = financial_advisor.analyze_market_sentiment(news_data)
+        risk_profile = request.args.get("risk_profile", "Moderate")
+        _, context = _cached_advisor_context(risk_profile)
+        return render_template("ai_advisor.html", **context)
+
+    @app.route("/api/ai-advisor")
+    @login_required
+    def ai_advisor_json():
+        """The AI Advisor dashboard's data for one risk profile"""
+        risk_profile = request.args.get("risk_profile", "Moderate")
+        if risk_profile not in financial_advisor.risk_levels:
+            return {"error": f"Unknown risk profile '{risk_profile}'"}, 400
+        validators, context = _cached_advisor_context(risk_profile)
+        return _conditional_json(validators, lambda: {
+            "risk_profile": risk_profile,
+            "market_sentiment": context["market_sentiment"],
+            "suggestions": context["suggestions"],
+            "stock_recommendations": context["stock_recommendations"],
+            "insights": context["insights"],
+            "generated_at": context["generated_at"].isoformat()
+        })
+
+    def _cached_advisor_context(risk_profile):
+        """
+        (validators, context): the context comes from advisor_cache, and the validators
+        name the exact cache entry, so an ETag goes stale when the entry is recomputed
+        """
+        version, _ = read_watermark()
+        # a reloaded stock universe or price store changes the picks without any news being written
+        key = (risk_profile, get_stock_universe().version, get_indicator_snapshot().version)
+        context = advisor_cache.get(version, key)
+        if context is None:
+            context = _advisor_context(risk_profile, version)
+            advisor_cache.put(version, key, context)
+        return ("ai-advisor", version, key, context["generated_at"]), context
+
+    def _advisor_context(risk_profile, version):
+        # One grouped query over the newest news replaces loading rows for the advisor
+        aggregates = query_market_aggregates(limit=app.config["ADVISOR_NEWS_LIMIT"])
+        market_sentiment = financial_advisor.analyze_sentiment_counts(aggregates["sentiment_counts"], aggregates["total"])
+        
+        # Generate market insights from the 1h/24h/7d sliding windows
+        market_window.sync(version)
+        market_insights = financial_advisor.market_insights_from_windows(market_window.snapshot())
         
         # Generate investment suggestions
-        risk_profile = request.args.get("risk_profile", "Moderate")
         investment_suggestions = financial_advisor.generate_investment_suggestions(market_sentiment, risk_profile)
         
-        # Generate stock recommendations
-        stock_recommendations = financial_advisor.generate_stock_recommendations(market_sentiment, risk_profile)
-        
-        # Generate market insights
-        market_insights = financial_advisor.generate_market_insights(news_data)
-        
-        return render_template("ai_advisor.html", 
-                             market_sentiment=market_sentiment,
-                             suggestions=investment_suggestions,
-                             stock_recommendations=stock_recommendations,
-                             insights=market_insights,
-                             risk_profiles=financial_advisor.risk_levels,
-                             current_risk=risk_profile)
+        # Generate stock recommendations, choosing sectors by their rolling news sentiment
+        sector_sentiment = query_sector_sentiment(days=app.config["SECTOR_WINDOW_DAYS"])
+        stock_recommendations = financial_advisor.generate_stock_recommendations(market_sentiment, risk_profile,
+                                                                                 sector_sentiment=sector_sentiment)
+        # Weight the picks with the profile's optimizer over local price history
+        stock_recommendations["portfolio"] = weight_picks(stock_recommendations["top_picks"], risk_profile)
+        
+        return dict(market_sentiment=market_sentiment,
+                    suggestions=investment_suggestions,
+                    stock_recommendations=stock_recommendations,
+                    insights=market_insights,
+                    risk_profiles=financial_advisor.risk_levels,
+                    current_risk=risk_profile,
+                    generated_at=datetime.utcnow())
 
     @app.route("/financial-guidance", methods=["GET", "POST"])
     @login_required
@@ -627,15 +776,172 @@ def create_app():
         if request.method == "POST":
             question = request.form.get("question", "")
             if question:
-                guidance = financial_advisor.provide_financial_guidance(question)
+                # Stored news relevant to the question, attached to the answer
+                limit = app.config["GUIDANCE_RELATED_NEWS"]
+                related_news = search_news(question, limit=limit) if limit else []
+                guidance = financial_advisor.provide_financial_guidance(question, context={"related_news": related_news})
                 return render_template("financial_guidance.html", guidance=guidance, question=question)
         
         return render_template("financial_guidance.html")
 
+    @app.route("/export/news")
+    @login_required
+    def export_news_items():
+        """Stream stored news as CSV or NDJSON (optionally gzipped)"""
+        fmt = request.args.get("format", "csv").lower()
+        compress = request.args.get("gzip", "false").lower() in ["1", "true", "yes"]
+        try:
+            since = parse_export_date(request.args.get("since"))
+            until = parse_export_date(request.args.get("until"), end_of_day=True)
+            limit = None
+            if request.args.get("limit"):
+                if not request.args["limit"].isdigit() or int(request.args["limit"]) < 1:
+                    raise ValueError("limit must be a positive integer")
+                limit = int(request.args["limit"])
+            if fmt not in EXPORT_FORMATS:
+                raise ValueError(f"Unsupported export format '{fmt}'")
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        chunks = export_news(
+            fmt,
+            region=request.args.get("region"),
+            sentiment=request.args.get("sentiment"),
+            since=since,
+            until=until,
+            limit=limit,
+            compress=compress
+        )
+        filename = f"news_export_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{fmt}"
+        mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+        headers = {"X-Accel-Buffering": "no"}
+        if compress:
+            filename += ".gz"
+            mimetype = "application/gzip"
+        headers["Content-Disposition"] = f"attachment; filename={filename}"
+        return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+    @app.route("/api/ticker/<symbol>/news")
+    @login_required
+    def ticker_news(symbol):
+        """News mentioning a ticker, newest first, read from the posting list"""
+        symbol = symbol.upper()
+        if symbol not in get_entity_extractor().symbols:
+            return {"error": f"Unknown ticker '{symbol}'"}, 404
+        try:
+            limit = _limit_arg(20, 100)
+            before_id = int(request.args["before_id"]) if request.args.get("before_id") else None
+        except ValueError:
+            return {"error": "limit and before_id must be integers"}, 400
+
+        query = (db.session.query(NewsItem)
+                 .join(NewsTicker, NewsTicker.news_id == NewsItem.id)
+                 .filter(NewsTicker.symbol == symbol))
+        if before_id is not None:
+            query = query.filter(NewsTicker.news_id < before_id)
+        items = query.order_by(NewsTicker.news_id.desc()).limit(limit).all()
+
+        return {
+            "symbol": symbol,
+            "news": [_news_json(n) for n in items],
+            # pass as before_id to fetch the next page
+            "next_before_id": items[-1].id if len(items) == limit else None
+        }
+
+    @app.route("/api/monte-carlo")
+    @login_required
+    def monte_carlo():
+        """Percentile bands of simulated wealth for the allocation behind each risk profile"""
+        profiles = request.args.getlist("profile") or list(financial_advisor.PROFILE_ALLOCATIONS)
+        unknown = [p for p in profiles if p not in financial_advisor.PROFILE_ALLOCATIONS]
+        if unknown:
+            return {"error": f"Unknown risk profile '{unknown[0]}'"}, 400
+        try:
+            years = int(request.args.get("years", 10))
+            initial = float(request.args.get("initial", 10000))
+            monthly = float(request.args.get("monthly", 0))
+            paths = int(request.args.get("paths", DEFAULT_PATHS))
+            seed = int(request.args.get("seed", DEFAULT_SEED))
+        except ValueError:
+            return {"error": "years, paths and seed must be integers; initial and monthly numbers"}, 400
+        max_paths = app.config["MONTE_CARLO_MAX_PATHS"]
+        # nan/inf parse as floats but would put bare NaN into the (cached) JSON
+        amounts_valid = all(math.isfinite(amount) and amount >= 0 for amount in (initial, monthly))
+        if not 1 <= years <= 50 or not 100 <= paths <= max_paths or not amounts_valid:
+            return {"error": f"years must be 1-50, paths 100-{max_paths}, initial and monthly finite and non-negative"}, 400
+
+        results = [cached_simulation(profile, years, initial, monthly, paths, seed,
+                                     workers=app.config["MONTE_CARLO_WORKERS"]) for profile in profiles]
+        return {"simulations": results}
+
+    @app.route("/api/portfolio")
+    @login_required
+    def portfolio_weights():
+        """Long-only weights for universe stocks under a risk profile's optimizer"""
+        symbols = [s.strip().upper() for s in request.args.get("symbols", "").split(",") if s.strip()]
+        if not symbols:
+            return {"error": "symbols is required (comma-separated tickers)"}, 400
+        unknown = [s for s in symbols if get_stock_universe().exchange(s) is None]
+        if unknown:
+            return {"error": f"Unknown ticker '{unknown[0]}'"}, 404
+        risk_profile = request.args.get("risk_profile", "Moderate")
+        if risk_profile not in financial_advisor.risk_levels:
+            return {"error": f"Unknown risk profile '{risk_profile}'"}, 400
+        return optimize_weights(symbols, risk_profile)
+
+    @app.route("/api/stocks")
+    @login_required
+    def screen_stocks():
+        """Screen the stock universe by sector, risk tier and exchange"""
+        risk = request.args.get("risk")
+        if risk and risk not in RISK_TIERS:
+            return {"error": f"risk must be one of {', '.join(RISK_TIERS)}"}, 400
+        try:
+            limit = _limit_arg(100, 1000)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        universe = get_stock_universe()
+        stocks = universe.screen(sector=request.args.get("sector"), risk=risk,
+                                 exchange=request.args.get("exchange"), limit=limit)
+        return {"stocks": stocks, "universe_size": len(universe)}
+
+    @app.route("/api/sentiment-index")
+    @login_required
+    def sentiment_index():
+        """Per-region net sentiment, volume and EWMA series as compact parallel arrays"""
+        region = request.args.get("region", ALL_REGIONS).upper()
+        granularity = request.args.get("granularity", "day")
+        if granularity not in GRANULARITIES:
+            return {"error": f"granularity must be one of {', '.join(GRANULARITIES)}"}, 400
+        try:
+            limit = _limit_arg(90, 2000)
+            since = parse_export_date(request.args.get("since"))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        # The series only changes when news is written, so the ingest watermark is its validator
+        version, updated_on = read_watermark()
+
+        def build():
+            points = index_series(region, granularity, since=since, limit=limit)
+            return {
+                "region": region,
+                "granularity": granularity,
+                "t": [int(to_utc_timestamp(p["t"])) for p in points],
+                "net": [round(p["net"], 4) for p in points],
+                "volume": [p["volume"] for p in points],
+                "ewma": [round(p["ewma"], 4) for p in points]
+            }
+
+        return _conditional_json(("sentiment-index", version, region, granularity, limit, since), build,
+                                 last_modified=updated_on, max_age=app.config["SENTIMENT_INDEX_MAX_AGE"])
+
     @app.route("/supported-countries")
     def supported_countries():
         """API endpoint to get supported countries"""
-        return {"countries": get_supported_countries()}
+        # a static list, so the list itself is the validator
+        countries = get_supported_countries()
+        return _conditional_json(("supported-countries", countries), lambda: {"countries": countries})
 
     @app.route("/health")
     def health_check():
@@ -646,8 +952,9 @@ def create_app():
             news_count = NewsItem.query.count()
             
             # Test imports
-            from sentiment import analyze_text
+            from sentiment import analyze_text, get_sentiment_cache, lexicon_version
             sentiment_result = analyze_text("test")
+            sentiment_cache = get_sentiment_cache()
             
             return {
                 "status": "healthy",
@@ -656,6 +963,9 @@ def create_app():
                 "database": "connected",
                 "news_count": news_count,
                 "sentiment": "working",
+                "sentiment_cache": sentiment_cache.stats() if sentiment_cache else None,
+                "advisor_cache": advisor_cache.stats(),
+                "covariance_cache": covariance_cache.stats(),
                 "rss_available": RSS_AVAILABLE
             }
         except Exception as e:
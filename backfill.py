@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Bulk historical backfill of NewsItem rows from news dumps
+
+Reads NewsAPI NDJSON archives and saved RSS XML files in streaming chunks,
+normalizes articles the same way the scrapers do, scores sentiment in a
+process pool, tags the tickers each article mentions and bulk-inserts new
+rows (deduplicated by URL) along with their search index postings. Progress
+is checkpointed after every committed chunk so an interrupted run resumes
+where it stopped.
+
+    python backfill.py dumps/newsapi-2023.ndjson.gz dumps/rss/*.xml --region US
+"""
+
+import argparse
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from news_scraper import normalize_newsapi_article
+from rss_scraper_alt import parse_rss_item
+from sentiment import BACKENDS, lexicon_version
+
+DEFAULT_CHUNK_SIZE = 2000
+# SQLite caps bound parameters per statement; keep IN (...) lookups below it
+URL_LOOKUP_BATCH = 500
+
+def _open_dump(path: str):
+    """Open a dump in binary mode, transparently handling .gz files"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+def _dump_kind(path: str) -> str:
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    if name.endswith((".xml", ".rss")):
+        return "rss"
+    raise ValueError(f"Unrecognized dump type for {path} (expected .ndjson/.jsonl or .xml/.rss)")
+
+def iter_ndjson_articles(path: str, default_region: str, start_offset: int = 0) -> Iterator[Tuple[int, Dict]]:
+    """
+    Yield (resume_offset, article) pairs from a NewsAPI NDJSON dump.
+    Each line is either a raw article or a full API response with an
+    "articles" list. The offset is the byte position after the line.
+    """
+    with _open_dump(path) as f:
+        if start_offset:
+            f.seek(start_offset)
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            offset = f.tell()
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            # valid JSON that isn't an article or API response object is as unusable as invalid JSON
+            raw_articles = None
+            if isinstance(record, dict):
+                raw_articles = (record["articles"] or []) if "articles" in record else [record]
+            if not isinstance(raw_articles, list):
+                print(f"⚠️  Skipping malformed line in {path} at byte {offset}")
+                continue
+            for raw in raw_articles:
+                if not isinstance(raw, dict):
+                    print(f"⚠️  Skipping malformed article in {path} at byte {offset}")
+                    continue
+                country = (raw.get("country") or default_region).upper()
+                yield offset, normalize_newsapi_article(raw, country)
+
+def iter_rss_articles(path: str, default_region: str, start_offset: int = 0) -> Iterator[Tuple[int, Dict]]:
+    """
+    Yield (resume_offset, article) pairs from a saved RSS XML file.
+    The file is parsed incrementally and each <item> is released once read;
+    the offset is the number of items consumed.
+    """
+    consumed = 0
+    with _open_dump(path) as f:
+        for event, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag != "item":
+                continue
+            consumed += 1
+            if consumed > start_offset:
+                article = parse_rss_item(elem)
+                if article:
+                    article["country"] = default_region.upper()
+                    yield consumed, article
+            elem.clear()
+
+def iter_dump_chunks(path: str, default_region: str, start_offset: int = 0,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[int, List[Dict]]]:
+    """
+    Group a dump into (resume_offset, articles) chunks
+    """
+    reader = iter_ndjson_articles if _dump_kind(path) == "ndjson" else iter_rss_articles
+    chunk = []
+    last_offset = start_offset
+    for offset, article in reader(path, default_region, start_offset):
+        # Only cut at offset boundaries so a resume never splits one NDJSON line
+        if offset != last_offset and len(chunk) >= chunk_size:
+            yield last_offset, chunk
+            chunk = []
+        chunk.append(article)
+        last_offset = offset
+    if chunk:
+        yield last_offset, chunk
+
+def score_texts(texts: List[str], backend: Optional[str] = None) -> List[Tuple[str, float, List[str], List[str]]]:
+    """
+    Process-pool worker: score a chunk of texts and extract the tickers and sectors each mentions
+    """
+    from entities import get_entity_extractor
+    from sectors import get_sector_classifier
+    from sentiment import analyze_texts
+    labels, scores = analyze_texts(texts, backend=backend)
+    extractor = get_entity_extractor()
+    classifier = get_sector_classifier()
+    results = []
+    for label, score, text in zip(labels, scores, texts):
+        symbols = extractor.extract(text)
+        results.append((str(label), float(score), sorted(symbols), sorted(classifier.classify(text, symbols))))
+    return results
+
+def _url_key(url: str) -> bytes:
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+
+class BackfillCheckpoint:
+    """
+    Per-file resume offsets persisted as JSON next to the run
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+
+    def offset(self, dump_path: str) -> int:
+        return self.state.get(os.path.abspath(dump_path), {}).get("offset", 0)
+
+    def is_done(self, dump_path: str) -> bool:
+        return self.state.get(os.path.abspath(dump_path), {}).get("done", False)
+
+    def update(self, dump_path: str, offset: int, done: bool = False):
+        self.state[os.path.abspath(dump_path)] = {"offset": offset, "done": done}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+class NewsBackfill:
+    """
+    Streams dump files through dedup -> parallel scoring -> bulk insert
+    """
+
+    def __init__(self, checkpoint: BackfillCheckpoint, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 workers: Optional[int] = None, default_region: str = "GLOBAL",
+                 backend: Optional[str] = None):
+        self.checkpoint = checkpoint
+        self.backend = backend
+        self.version = lexicon_version()
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.default_region = default_region
+        self.seen_urls = set()
+        self.read = 0
+        self.inserted = 0
+        self.started = None
+
+    def _filter_new(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Drop articles without a URL, repeated within this run, or already stored
+        """
+        from models import db, NewsItem
+
+        candidates = {}
+        for article in articles:
+            url = article.get("url")
+            if not url:
+                continue
+            key = _url_key(url)
+            if key in self.seen_urls or url in candidates:
+                continue
+            candidates[url] = article
+
+        urls = list(candidates)
+        for i in range(0, len(urls), URL_LOOKUP_BATCH):
+            batch = urls[i:i + URL_LOOKUP_BATCH]
+            for (url,) in db.session.query(NewsItem.url).filter(NewsItem.url.in_(batch)):
+                candidates.pop(url, None)
+
+        for url in candidates:
+            self.seen_urls.add(_url_key(url))
+        return list(candidates.values())
+
+    def _insert(self, articles: List[Dict], scores: List[Tuple[str, float, List[str], List[str]]]):
+        from entities import link_news_tickers
+        from models import db, NewsItem
+        from news_search import index_news
+        from sectors import tag_news
+        from strategy import get_strategy_rules
+        from watermark import bump_watermark
+
+        rules = get_strategy_rules()
+        rows = []
+        symbols_by_url = {}
+        sectors_by_url = {}
+        for article, (label, score, symbols, sectors) in zip(articles, scores):
+            if symbols:
+                symbols_by_url[article["url"]] = symbols
+            if sectors:
+                sectors_by_url[article["url"]] = (sectors, article.get("publishedAt"), label)
+            rows.append({
+                "title": article.get("title") or "",
+                "description": article.get("description") or "",
+                "source": article.get("source"),
+                "url": article["url"],
+                "published_at": article.get("publishedAt"),
+                "sentiment": label,
+                "score": score,
+                "region": article.get("country") or self.default_region,
+                "lexicon_version": self.version,
+            })
+        for row, advice in zip(rows, rules.advise_batch((row["sentiment"], row["score"], row["region"]) for row in rows)):
+            row["advice"] = advice
+        if rows:
+            db.session.execute(NewsItem.__table__.insert(), rows)
+            bump_watermark()
+        # executemany does not return ids; look the new rows up by URL to link tickers and index them
+        texts_by_url = {row["url"]: row["title"] + ". " + row["description"] for row in rows}
+        urls = list(texts_by_url)
+        for i in range(0, len(urls), URL_LOOKUP_BATCH):
+            batch = urls[i:i + URL_LOOKUP_BATCH]
+            ids = db.session.query(NewsItem.id, NewsItem.url).filter(NewsItem.url.in_(batch)).all()
+            link_news_tickers((news_id, symbols_by_url[url]) for news_id, url in ids if url in symbols_by_url)
+            tag_news((news_id,) + sectors_by_url[url] for news_id, url in ids if url in sectors_by_url)
+            index_news((news_id, texts_by_url[url]) for news_id, url in ids)
+        db.session.commit()
+        self.inserted += len(rows)
+
+    def _report(self, path: str):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        print(f"   {os.path.basename(path)}: read {self.read}, inserted {self.inserted} "
+              f"({self.read / elapsed:,.0f} rows/sec read, {self.inserted / elapsed:,.0f} rows/sec inserted)")
+
+    def run_file(self, executor: ProcessPoolExecutor, path: str):
+        if self.checkpoint.is_done(path):
+            print(f"⏭️  {path} already backfilled, skipping")
+            return
+        start_offset = self.checkpoint.offset(path)
+        if start_offset:
+            print(f"↩️  Resuming {path} from offset {start_offset}")
+        else:
+            print(f"📥 Backfilling {path}")
+
+        # Keep a bounded window of chunks in flight. Results are consumed in
+        # submission order so the checkpoint only ever advances past rows that
+        # are committed.
+        in_flight = deque()
+        max_in_flight = self.workers * 2
+
+        def drain_one():
+            offset, articles, future = in_flight.popleft()
+            self._insert(articles, future.result())
+            self.checkpoint.update(path, offset)
+            self._report(path)
+
+        for offset, chunk in iter_dump_chunks(path, self.default_region, start_offset, self.chunk_size):
+            self.read += len(chunk)
+            new_articles = self._filter_new(chunk)
+            texts = [(a.get("title") or "") + ". " + (a.get("description") or "") for a in new_articles]
+            in_flight.append((offset, new_articles, executor.submit(score_texts, texts, self.backend)))
+            if len(in_flight) >= max_in_flight:
+                drain_one()
+        while in_flight:
+            drain_one()
+        self.checkpoint.update(path, self.checkpoint.offset(path), done=True)
+
+    def run(self, paths: List[str]):
+        self.started = time.monotonic()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for path in paths:
+                self.run_file(executor, path)
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        print(f"✅ Backfill complete: read {self.read}, inserted {self.inserted} in {elapsed:.1f}s "
+              f"({self.inserted / elapsed:,.0f} rows/sec)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill historical news from NDJSON / RSS XML dumps")
+    parser.add_argument("paths", nargs="+", help="Dump files (.ndjson/.jsonl/.xml/.rss, optionally .gz)")
+    parser.add_argument("--region", default="GLOBAL", help="Region for articles without a country")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, help="Scoring processes (default: all cores)")
+    parser.add_argument("--backend", choices=BACKENDS, help="Sentiment scoring backend")
+    parser.add_argument("--checkpoint", default="backfill.checkpoint.json",
+                        help="Checkpoint file used to resume interrupted runs")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        try:
+            _dump_kind(path)
+        except ValueError as e:
+            parser.error(str(e))
+
+    with contextlib.redirect_stdout(sys.stderr):
+        from app import app
+    with app.app_context():
+        backfill = NewsBackfill(BackfillCheckpoint(args.checkpoint), chunk_size=args.chunk_size,
+                                workers=args.workers, default_region=args.region.upper(),
+                                backend=args.backend)
+        backfill.run(args.paths)
+        if backfill.inserted:
+            # historical rows land in old buckets; recompute the index in one vectorized pass
+            from sentiment_index import rebuild_index
+            print(f"📈 Rebuilt sentiment index ({rebuild_index()} points)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Vectorized backtests of the sentiment-driven allocation rules
+
+Daily news sentiment for a region (from the database, or a date,positive,
+negative,neutral CSV) is aligned with a local OHLCV price file and the
+advisor's rule is simulated over the whole date range with array operations:
+over a trailing window of days, a positive share above `threshold` is bullish
+and a negative share above it is bearish (FinancialAIAdvisor uses 0.6);
+generate_strategy's advice maps to an equity weight per state ("consider
+equity exposure" / "maintain diversification" / "reduce exposure"), and the
+rest is held in cash. Signals act on the next day's return.
+
+    python backtest.py --symbol SPY --region US
+    python backtest.py --symbol SPY --region US --sweep threshold=0.5,0.55,0.6,0.65 --sweep lookback=1,3,7
+"""
+
+import argparse
+import contextlib
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+OHLCV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ohlcv")
+TRADING_DAYS = 252
+
+DEFAULT_PARAMS = {
+    "threshold": 0.6,
+    "lookback": 1,           # days of news pooled into each day's sentiment
+    "bull_weight": 1.0,      # "Opportunity: consider selective equity exposure"
+    "neutral_weight": 0.6,   # "Neutral: maintain diversification"
+    "bear_weight": 0.2,      # "Caution: reduce exposure to high-volatility assets"
+    "cost_bps": 5.0,         # transaction cost per unit of turnover
+    "cash_rate": 0.02,       # annual return on the uninvested share
+}
+
+def resolve_ohlcv_path(symbol_or_path: str) -> str:
+    if os.path.exists(symbol_or_path):
+        return symbol_or_path
+    return os.path.join(OHLCV_DIR, f"{symbol_or_path.upper()}.csv")
+
+def load_ohlcv_csv(path: str) -> Dict[str, np.ndarray]:
+    """
+    Read a Date,Open,High,Low,Close,Volume CSV (Yahoo Finance layout; Adj Close
+    is preferred over Close when present) into arrays sorted by date
+    """
+    with open(path, newline="") as f:
+        rows = [row for row in csv.DictReader(f) if row.get("Close") not in (None, "", "null")]
+    if not rows:
+        raise ValueError(f"No price rows in {path}")
+    dates = np.array([row["Date"][:10] for row in rows], dtype="datetime64[D]")
+    close_key = "Adj Close" if "Adj Close" in rows[0] else "Close"
+    series = {"date": dates}
+    for key, column in (("open", "Open"), ("high", "High"), ("low", "Low"), ("close", close_key), ("volume", "Volume")):
+        series[key] = np.array([float(row.get(column) or "nan") for row in rows])
+    order = np.argsort(dates, kind="stable")
+    return {key: values[order] for key, values in series.items()}
+
+def load_sentiment_csv(path: str) -> Dict[str, np.ndarray]:
+    """Read a daily date,positive,negative,neutral count CSV"""
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    return {
+        "date": np.array([row["date"][:10] for row in rows], dtype="datetime64[D]"),
+        "positive": np.array([int(row["positive"]) for row in rows]),
+        "negative": np.array([int(row["negative"]) for row in rows]),
+        "neutral": np.array([int(row.get("neutral") or 0) for row in rows]),
+    }
+
+def load_sentiment_series(region: Optional[str] = None, since: Optional[date] = None,
+                          until: Optional[date] = None) -> Dict[str, np.ndarray]:
+    """
+    Daily positive/negative/neutral counts of stored news, one grouped query
+    """
+    from sqlalchemy import func
+    from models import db, NewsItem
+
+    day = func.date(NewsItem.published_at)
+    query = (db.session.query(day, NewsItem.sentiment, func.count())
+             .filter(NewsItem.published_at.isnot(None)))
+    if region:
+        query = query.filter(NewsItem.region == region.upper())
+    if since:
+        query = query.filter(NewsItem.published_at >= datetime.combine(since, datetime.min.time()))
+    if until:
+        query = query.filter(NewsItem.published_at <= datetime.combine(until, datetime.max.time()))
+    counts = {}
+    for day_value, sentiment, count in query.group_by(day, NewsItem.sentiment):
+        counts.setdefault(str(day_value)[:10], {})[sentiment] = count
+    days = sorted(counts)
+    return {
+        "date": np.array(days, dtype="datetime64[D]"),
+        "positive": np.array([counts[d].get("positive", 0) for d in days]),
+        "negative": np.array([counts[d].get("negative", 0) for d in days]),
+        "neutral": np.array([counts[d].get("neutral", 0) for d in days]),
+    }
+
+def align_sentiment(price_dates: np.ndarray, sentiment: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Sentiment counts per trading day; news published on non-trading days is
+    added to the next trading day
+    """
+    slots = np.searchsorted(price_dates, sentiment["date"], side="left")
+    keep = slots < len(price_dates)
+    aligned = {}
+    for key in ("positive", "negative", "neutral"):
+        aligned[key] = np.bincount(slots[keep], weights=sentiment[key][keep], minlength=len(price_dates))
+    return aligned
+
+def _trailing_sum(values: np.ndarray, window: int) -> np.ndarray:
+    cumulative = np.concatenate([[0.0], np.cumsum(values)])
+    start = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+    return cumulative[1:] - cumulative[start]
+
+def simulate(close: np.ndarray, aligned: Dict[str, np.ndarray], params: Optional[Dict] = None) -> Dict:
+    """
+    Simulate the rule over every day at once and return the daily weights,
+    strategy returns and summary metrics
+    """
+    p = dict(DEFAULT_PARAMS, **(params or {}))
+    lookback = max(int(p["lookback"]), 1)
+    positive = _trailing_sum(aligned["positive"], lookback)
+    negative = _trailing_sum(aligned["negative"], lookback)
+    total = positive + negative + _trailing_sum(aligned["neutral"], lookback)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        positive_share = np.where(total > 0, positive / total, 0.0)
+        negative_share = np.where(total > 0, negative / total, 0.0)
+    state = np.where(positive_share > p["threshold"], 1, np.where(negative_share > p["threshold"], -1, 0))
+    weight = np.select([state == 1, state == -1], [p["bull_weight"], p["bear_weight"]], p["neutral_weight"])
+
+    # Days without any news keep the previous day's weight
+    has_news = total > 0
+    last_with_news = np.maximum.accumulate(np.where(has_news, np.arange(len(weight)), -1))
+    weight = np.where(last_with_news >= 0, weight[np.maximum(last_with_news, 0)], p["neutral_weight"])
+
+    asset_returns = np.zeros(len(close))
+    asset_returns[1:] = close[1:] / close[:-1] - 1.0
+    held = np.concatenate([[p["neutral_weight"]], weight[:-1]])  # decided at yesterday's close
+    trades = np.abs(np.diff(held, prepend=held[0]))
+    cash_daily = (1 + p["cash_rate"]) ** (1 / TRADING_DAYS) - 1
+    returns = held * asset_returns + (1 - held) * cash_daily - trades * p["cost_bps"] / 10000
+    returns[0] = 0.0
+
+    return {
+        "params": p,
+        "weight": held,
+        "returns": returns,
+        "metrics": performance_metrics(returns, trades, held, asset_returns),
+    }
+
+def performance_metrics(returns: np.ndarray, trades: np.ndarray, weights: np.ndarray,
+                        benchmark_returns: np.ndarray) -> Dict:
+    equity = np.cumprod(1 + returns)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+    years = max(len(returns) - 1, 1) / TRADING_DAYS
+    volatility = float(np.std(returns[1:]) * np.sqrt(TRADING_DAYS)) if len(returns) > 2 else 0.0
+    cagr = float(equity[-1] ** (1 / years) - 1)
+    benchmark = np.cumprod(1 + benchmark_returns)
+    return {
+        "total_return": round(float(equity[-1] - 1), 4),
+        "cagr": round(cagr, 4),
+        "volatility": round(volatility, 4),
+        "sharpe": round(cagr / volatility, 3) if volatility else None,
+        "max_drawdown": round(float(drawdown.min()), 4),
+        "turnover_per_year": round(float(trades.sum() / years), 3),
+        "average_exposure": round(float(weights.mean()), 3),
+        "buy_and_hold_return": round(float(benchmark[-1] - 1), 4),
+        "buy_and_hold_max_drawdown": round(float((benchmark / np.maximum.accumulate(benchmark) - 1).min()), 4),
+        "days": int(len(returns)),
+    }
+
+def _run_one(close: np.ndarray, aligned: Dict[str, np.ndarray], params: Dict) -> Dict:
+    """Process-pool worker: metrics only, so results stay small"""
+    result = simulate(close, aligned, params)
+    return {"params": params, "metrics": result["metrics"]}
+
+def parameter_grid(grid: Dict[str, List[float]]) -> List[Dict]:
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def sweep(close: np.ndarray, aligned: Dict[str, np.ndarray], grid: Dict[str, List[float]],
+          workers: Optional[int] = None, sort_by: str = "sharpe") -> List[Dict]:
+    """
+    Backtest every parameter combination in a process pool, best first
+    """
+    combinations = parameter_grid(grid)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(combinations) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_run_one, itertools.repeat(close), itertools.repeat(aligned), combinations,
+                                    chunksize=chunksize))
+    return sorted(results, key=lambda r: (r["metrics"].get(sort_by) is None, -(r["metrics"].get(sort_by) or 0)))
+
+def _parse_sweep(values: List[str]) -> Dict[str, List[float]]:
+    grid = {}
+    for value in values or []:
+        name, _, options = value.partition("=")
+        if name not in DEFAULT_PARAMS or not options:
+            raise ValueError(f"Bad --sweep '{value}', expected name=v1,v2 with name in {', '.join(DEFAULT_PARAMS)}")
+        grid[name] = [float(option) for option in options.split(",")]
+    return grid
+
+def _format_metrics(metrics: Dict) -> str:
+    return (f"return {metrics['total_return']:+.1%}  CAGR {metrics['cagr']:+.1%}  sharpe {metrics['sharpe']}  "
+            f"maxDD {metrics['max_drawdown']:.1%}  turnover/yr {metrics['turnover_per_year']:.2f}  "
+            f"exposure {metrics['average_exposure']:.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest sentiment-driven allocation rules")
+    parser.add_argument("--symbol", required=True, help=f"Ticker in {OHLCV_DIR} or a path to an OHLCV CSV")
+    parser.add_argument("--region", help="Region whose news sentiment drives the signal (default: all)")
+    parser.add_argument("--sentiment-csv", help="Daily date,positive,negative,neutral counts instead of the database")
+    for name, default in DEFAULT_PARAMS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=default)
+    parser.add_argument("--sweep", action="append", metavar="NAME=V1,V2,...",
+                        help="Sweep a parameter over values (repeatable)")
+    parser.add_argument("--workers", type=int, help="Processes for sweeps (default: all cores)")
+    parser.add_argument("--top", type=int, default=10, help="Sweep results to print")
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        grid = _parse_sweep(args.sweep)
+    except ValueError as e:
+        parser.error(str(e))
+
+    prices = load_ohlcv_csv(resolve_ohlcv_path(args.symbol))
+    if args.sentiment_csv:
+        sentiment = load_sentiment_csv(args.sentiment_csv)
+    else:
+        with contextlib.redirect_stdout(sys.stderr):
+            from app import app
+        with app.app_context():
+            sentiment = load_sentiment_series(args.region, since=prices["date"][0].item(),
+                                              until=prices["date"][-1].item())
+    aligned = align_sentiment(prices["date"], sentiment)
+    news_days = int(np.count_nonzero(aligned["positive"] + aligned["negative"] + aligned["neutral"]))
+    print(f"📈 {args.symbol}: {len(prices['date'])} trading days {prices['date'][0]}..{prices['date'][-1]}, "
+          f"{news_days} with news")
+
+    params = {name: getattr(args, name) for name in DEFAULT_PARAMS}
+    if grid:
+        started = time.perf_counter()
+        grid = {name: grid.get(name, [params[name]]) for name in DEFAULT_PARAMS}
+        results = sweep(prices["close"], aligned, grid, workers=args.workers)
+        elapsed = time.perf_counter() - started
+        print(f"🔁 {len(results)} combinations in {elapsed:.2f}s")
+        swept = [name for name, values in grid.items() if len(values) > 1]
+        for result in results[:args.top]:
+            label = ", ".join(f"{name}={result['params'][name]:g}" for name in swept)
+            print(f"   {label:40} {_format_metrics(result['metrics'])}")
+        output = {"symbol": args.symbol, "region": args.region, "sweep": results}
+    else:
+        result = simulate(prices["close"], aligned, params)
+        print(f"   {_format_metrics(result['metrics'])}")
+        print(f"   buy & hold {result['metrics']['buy_and_hold_return']:+.1%}  "
+              f"maxDD {result['metrics']['buy_and_hold_max_drawdown']:.1%}")
+        output = {"symbol": args.symbol, "region": args.region, "params": result["params"], "metrics": result["metrics"]}
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(output, f, indent=2)
+        print(f"✅ Results written to {args.json_path}")
+
+if __name__ == "__main__":
+    main()
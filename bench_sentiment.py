@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Sentiment benchmark suite
+
+Measures analyze_text throughput, p50/p99 latency and memory for each scorer
+on the bundled corpus of financial headlines (cold = every call misses the
+result cache, warm = repeated headlines hit it), compares the batch backends
+and checks label agreement against the hand-labelled golden set. Results can
+be written as JSON so scorer changes can be compared run to run:
+
+    python bench_sentiment.py --json bench.json
+    python bench_sentiment.py --scorer finance --min-accuracy 0.6
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import sentiment
+from sentiment import analyze_text, analyze_texts, lexicon_version, BACKENDS, NUMPY_AVAILABLE, SCORERS, SentimentCache
+from sentiment_model import read_labelled_csv, LABELS
+
+DEFAULT_GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sentiment_golden.csv")
+
+def available_scorers() -> List[str]:
+    """Scorers that can run here (the model scorer needs trained weights)"""
+    scorers = []
+    for scorer in SCORERS:
+        try:
+            lexicon_version(scorer)
+        except RuntimeError:
+            continue
+        scorers.append(scorer)
+    return scorers
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+def _latency_stats(latencies_ns: List[int]) -> Dict:
+    latencies_ns = sorted(latencies_ns)
+    total = sum(latencies_ns) / 1e9
+    return {
+        "calls": len(latencies_ns),
+        "texts_per_sec": round(len(latencies_ns) / total, 1) if total else None,
+        "p50_us": round(percentile(latencies_ns, 0.50) / 1000, 2),
+        "p99_us": round(percentile(latencies_ns, 0.99) / 1000, 2),
+    }
+
+def _use_fresh_cache(size: int):
+    """Swap in an empty in-memory result cache so runs do not touch instance/ or each other"""
+    sentiment._sentiment_cache = SentimentCache(max(size, 1), path=None) if sentiment.SENTIMENT_CACHE_SIZE > 0 else None
+
+def bench_analyze_text(texts: List[str], scorer: str, passes: int = 5) -> Dict:
+    """
+    Per-call latency of analyze_text: one cold pass over distinct texts, then
+    `passes` warm passes, and the traced peak allocation of a cold pass
+    """
+    distinct = list(dict.fromkeys(texts))
+    clock = time.perf_counter_ns
+
+    _use_fresh_cache(len(distinct))
+    analyze_text(distinct[0], scorer=scorer)  # load lexicon/model outside the timings
+    _use_fresh_cache(len(distinct))
+    cold = []
+    for text in distinct:
+        start = clock()
+        analyze_text(text, scorer=scorer)
+        cold.append(clock() - start)
+    warm = []
+    for _ in range(passes):
+        for text in distinct:
+            start = clock()
+            analyze_text(text, scorer=scorer)
+            warm.append(clock() - start)
+
+    _use_fresh_cache(len(distinct))
+    tracemalloc.start()
+    for text in distinct:
+        analyze_text(text, scorer=scorer)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "version": lexicon_version(scorer),
+        "cold": _latency_stats(cold),
+        "warm": _latency_stats(warm),
+        "peak_alloc_kib": round(peak / 1024, 1),
+    }
+
+def bench_backends(texts: List[str], size: int, repeat: int = 3) -> Dict:
+    """Batch throughput of analyze_texts per backend, with label/score mismatches vs scalar"""
+    corpus = (texts * (size // len(texts) + 1))[:size]
+    results = {}
+    outputs = {}
+    for backend in BACKENDS:
+        if backend == "vectorized" and not NUMPY_AVAILABLE:
+            continue
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            labels, scores = analyze_texts(corpus, backend=backend, scorer="keyword")
+            best = min(best, time.perf_counter() - start)
+        outputs[backend] = (list(labels), list(scores))
+        results[backend] = {"texts": size, "seconds": round(best, 4), "texts_per_sec": round(size / best, 1)}
+
+    reference = outputs.get("scalar")
+    for backend, (labels, scores) in outputs.items():
+        results[backend]["mismatches_vs_scalar"] = sum(
+            1 for a, b, x, y in zip(reference[0], labels, reference[1], scores) if a != b or x != y)
+    return results
+
+def label_agreement(texts: List[str], expected: List[str], scorer: str) -> Dict:
+    """Accuracy and confusion matrix (expected -> predicted -> count) against golden labels"""
+    predicted, _ = analyze_texts(texts, scorer=scorer)
+    confusion = {label: {other: 0 for other in LABELS} for label in LABELS}
+    correct = 0
+    for want, got in zip(expected, predicted):
+        confusion[want][str(got)] += 1
+        correct += want == got
+    per_label = {}
+    for label in LABELS:
+        support = sum(confusion[label].values())
+        predicted_count = sum(confusion[other][label] for other in LABELS)
+        per_label[label] = {
+            "support": support,
+            "recall": round(confusion[label][label] / support, 3) if support else None,
+            "precision": round(confusion[label][label] / predicted_count, 3) if predicted_count else None,
+        }
+    return {
+        "accuracy": round(correct / len(expected), 4) if expected else None,
+        "per_label": per_label,
+        "confusion": confusion,
+    }
+
+def run_suite(golden_path: str = DEFAULT_GOLDEN_PATH, scorers: Optional[List[str]] = None,
+              passes: int = 5, backend_size: int = 100000, repeat: int = 3) -> Dict:
+    texts, labels = read_labelled_csv(golden_path)
+    scorers = scorers or available_scorers()
+    # maxrss is KiB on Linux, bytes on macOS
+    rss_divisor = 1024 if sys.platform == "darwin" else 1
+    return {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": NUMPY_AVAILABLE,
+            "cache_size": sentiment.SENTIMENT_CACHE_SIZE,
+        },
+        "corpus": {"path": os.path.relpath(golden_path), "texts": len(texts)},
+        "analyze_text": {scorer: bench_analyze_text(texts, scorer, passes) for scorer in scorers},
+        "backends": bench_backends(texts, backend_size, repeat) if backend_size else {},
+        "agreement": {scorer: label_agreement(texts, labels, scorer) for scorer in scorers},
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // rss_divisor,
+    }
+
+def print_report(results: Dict, out=sys.stdout):
+    print(f"📊 {results['corpus']['texts']} headlines from {results['corpus']['path']}", file=out)
+    for scorer, stats in results["analyze_text"].items():
+        cold, warm = stats["cold"], stats["warm"]
+        print(f"{scorer:>10}: cold {cold['texts_per_sec']:>12,.0f} texts/sec  p50 {cold['p50_us']:>8.1f}µs  "
+              f"p99 {cold['p99_us']:>8.1f}µs | warm {warm['texts_per_sec']:>12,.0f} texts/sec  "
+              f"p99 {warm['p99_us']:>6.1f}µs | peak {stats['peak_alloc_kib']:,.0f} KiB", file=out)
+    for backend, stats in results["backends"].items():
+        print(f"{backend:>10}: {stats['texts_per_sec']:>12,.0f} texts/sec batch  "
+              f"({stats['mismatches_vs_scalar']} mismatches vs scalar)", file=out)
+    for scorer, stats in results["agreement"].items():
+        recalls = ", ".join(f"{label} {v['recall']}" for label, v in stats["per_label"].items())
+        print(f"{scorer:>10}: accuracy {stats['accuracy']:.3f}  (recall: {recalls})", file=out)
+    print(f"   max RSS {results['max_rss_kib'] / 1024:,.1f} MiB", file=out)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark sentiment scoring speed and accuracy")
+    parser.add_argument("--golden", default=DEFAULT_GOLDEN_PATH, help="Labelled CSV (text,label) used as the corpus")
+    parser.add_argument("--scorer", action="append", choices=SCORERS,
+                        help="Scorer to benchmark (repeatable; default: all available)")
+    parser.add_argument("--passes", type=int, default=5, help="Warm-cache passes over the corpus")
+    parser.add_argument("--size", type=int, default=100000, help="Texts per batch-backend run (0 to skip)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this path ('-' for stdout)")
+    parser.add_argument("--min-accuracy", type=float, help="Exit non-zero if any scorer's accuracy is below this")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.golden, args.scorer, args.passes, args.size, args.repeat)
+    print_report(results, out=sys.stderr if args.json_path == "-" else sys.stdout)
+    if args.json_path == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results written to {args.json_path}")
+
+    if args.min_accuracy is not None:
+        failing = [s for s, stats in results["agreement"].items() if stats["accuracy"] < args.min_accuracy]
+        if failing:
+            print(f"❌ Accuracy below {args.min_accuracy} for: {', '.join(failing)}", file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,28 @@ class Config:
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     NEWSAPI_KEY = os.getenv("NEWSAPI_KEY", "")
+
+    # Background rescoring of news stored under an older sentiment lexicon
+    LEXICON_RESCORE_ON_STARTUP = os.getenv("LEXICON_RESCORE_ON_STARTUP", "False") == "True"
+    LEXICON_RESCORE_BATCH_SIZE = int(os.getenv("LEXICON_RESCORE_BATCH_SIZE", 500))
+    LEXICON_RESCORE_SLEEP = float(os.getenv("LEXICON_RESCORE_SLEEP", 0.5))
+
+    # Seconds an /ai-advisor result stays cached when no new news is committed
+    ADVISOR_CACHE_TTL = float(os.getenv("ADVISOR_CACHE_TTL", 600))
+    # Newest news items the advisor's sentiment and insights are aggregated over
+    ADVISOR_NEWS_LIMIT = int(os.getenv("ADVISOR_NEWS_LIMIT", 5000))
+    # Relevant stored articles attached to /financial-guidance answers (0 disables)
+    GUIDANCE_RELATED_NEWS = int(os.getenv("GUIDANCE_RELATED_NEWS", 5))
+    # Days of sector news sentiment /ai-advisor ranks sectors by
+    SECTOR_WINDOW_DAYS = int(os.getenv("SECTOR_WINDOW_DAYS", 7))
+    # Largest Monte Carlo run /api/monte-carlo accepts, and processes for runs big enough to split (0 = all cores)
+    MONTE_CARLO_MAX_PATHS = int(os.getenv("MONTE_CARLO_MAX_PATHS", 100000))
+    MONTE_CARLO_WORKERS = int(os.getenv("MONTE_CARLO_WORKERS", 0)) or None
+    # Seconds clients may reuse /api/sentiment-index responses before revalidating
+    SENTIMENT_INDEX_MAX_AGE = int(os.getenv("SENTIMENT_INDEX_MAX_AGE", 60))
+    # Seconds clients may reuse the other JSON API responses (/api/dashboard, /api/news/<id>, ...) before revalidating
+    JSON_API_MAX_AGE = int(os.getenv("JSON_API_MAX_AGE", 0))
+
     MAIL_SERVER = os.getenv("MAIL_SERVER", "")
     MAIL_PORT = int(os.getenv("MAIL_PORT", 587))
     MAIL_USE_TLS = os.getenv("MAIL_USE_TLS", "True") == "True"
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Ticker and company entity extraction
+
+An EntityExtractor is compiled from the stock universe: company
+names and aliases go into a token-level Aho-Corasick automaton (shared with
+the finance lexicon) and tickers into a set, so extracting every entity from
+an article is a single pass over its tokens. Bare tickers only count when
+written in upper case (or as a $cashtag) to avoid matching words like "cost".
+
+Matches are stored as a posting list (news_tickers table) that
+/api/ticker/<symbol>/news reads through its primary-key index. Existing news
+can be indexed with:
+
+    python entities.py reindex
+"""
+
+import argparse
+import contextlib
+import re
+import sys
+from typing import Dict, Iterable, List, Optional, Set
+
+from lexicon import AhoCorasickAutomaton
+
+# Extra names the news uses for companies in the universe
+COMPANY_ALIASES = {
+    "AAPL": ["Apple"],
+    "MSFT": ["Microsoft"],
+    "GOOGL": ["Google", "Alphabet"],
+    "NVDA": ["Nvidia"],
+    "TSLA": ["Tesla"],
+    "AMZN": ["Amazon"],
+    "JNJ": ["J&J", "Johnson and Johnson"],
+    "PFE": ["Pfizer"],
+    "UNH": ["UnitedHealth"],
+    "ABBV": ["AbbVie"],
+    "TMO": ["Thermo Fisher"],
+    "JPM": ["JPMorgan", "JP Morgan", "J.P. Morgan"],
+    "BAC": ["Bank of America", "BofA"],
+    "WFC": ["Wells Fargo"],
+    "GS": ["Goldman Sachs", "Goldman"],
+    "V": ["Visa Inc"],
+    "NKE": ["Nike"],
+    "SBUX": ["Starbucks"],
+    "HD": ["Home Depot"],
+    "MCD": ["McDonald's", "McDonalds"],
+    "XOM": ["Exxon", "ExxonMobil", "Exxon Mobil"],
+    "CVX": ["Chevron"],
+    "COP": ["ConocoPhillips"],
+    "EOG": ["EOG Resources"],
+    "PG": ["Procter & Gamble", "P&G"],
+    "KO": ["Coca-Cola", "Coca Cola", "Coke"],
+    "WMT": ["Walmart"],
+    "COST": ["Costco"],
+    "PEP": ["PepsiCo", "Pepsi"],
+}
+
+# Legal suffixes dropped to derive the short form of a company name
+NAME_SUFFIXES = {"inc", "corp", "corporation", "co", "company", "group", "ltd", "plc", "holdings", "llc"}
+
+_TOKEN_RE = re.compile(r"\$?\w+")
+
+def _tokens(text: str) -> List[str]:
+    return [token.lstrip("$").lower() for token in _TOKEN_RE.findall(text)]
+
+class EntityExtractor:
+    """
+    One-pass extraction of ticker symbols mentioned in a text
+    """
+
+    def __init__(self, names: Dict[str, Iterable[str]]):
+        """
+        names: symbol -> company names/aliases
+        """
+        self.symbols = {symbol.upper() for symbol in names}
+        patterns = []
+        for symbol, symbol_names in names.items():
+            for name in set(symbol_names):
+                tokens = tuple(_tokens(name))
+                if tokens:
+                    patterns.append((tokens, symbol.upper()))
+        self.automaton = AhoCorasickAutomaton(patterns)
+
+    @classmethod
+    def from_universe(cls, stock_universe: Dict[str, Dict[str, Dict]],
+                      aliases: Dict[str, List[str]] = COMPANY_ALIASES) -> "EntityExtractor":
+        """
+        Build from StockUniverse.sector_map() (sector -> symbol -> info)
+        """
+        names = {}
+        for sector_stocks in stock_universe.values():
+            for symbol, info in sector_stocks.items():
+                symbol_names = names.setdefault(symbol, set())
+                full_name = info.get("name", "")
+                symbol_names.add(full_name)
+                short = [t for t in _tokens(full_name) if t not in NAME_SUFFIXES]
+                # Only use a one-word short form when an alias vouches for it
+                # ("Apple" yes, "Visa" no - it is also a common noun)
+                if len(short) > 1:
+                    symbol_names.add(" ".join(short))
+                symbol_names.update(aliases.get(symbol, []))
+        return cls(names)
+
+    def extract(self, text: str) -> Set[str]:
+        if not text:
+            return set()
+        raw_tokens = _TOKEN_RE.findall(text)
+        # In all-caps headlines every word looks like a ticker; trust cashtags only
+        shouting = text.isupper()
+        found = set()
+        lowered = []
+        for raw in raw_tokens:
+            bare = raw.lstrip("$")
+            if bare in self.symbols and (raw.startswith("$") or (not shouting and len(bare) > 1)):
+                found.add(bare)
+            lowered.append(bare.lower())
+        for _, _, symbol in self.automaton.search(lowered):
+            found.add(symbol)
+        return found
+
+_default_extractor = None
+_extractor_universe = None
+
+def get_entity_extractor() -> EntityExtractor:
+    """Extractor for the stock universe, rebuilt when the universe is reloaded"""
+    global _default_extractor, _extractor_universe
+    from stock_universe import get_stock_universe
+    universe = get_stock_universe()
+    if _default_extractor is None or universe is not _extractor_universe:
+        _default_extractor = EntityExtractor.from_universe(universe.sector_map())
+        _extractor_universe = universe
+    return _default_extractor
+
+def link_news_tickers(news_symbols: Iterable) -> int:
+    """
+    Insert posting-list rows for (news_id, symbols) pairs; caller commits
+    """
+    from models import db, NewsTicker
+
+    rows = [{"symbol": symbol, "news_id": news_id} for news_id, symbols in news_symbols for symbol in symbols]
+    if rows:
+        db.session.execute(NewsTicker.__table__.insert(), rows)
+    return len(rows)
+
+def reindex(batch_size: int = 1000, extractor: Optional[EntityExtractor] = None) -> int:
+    """
+    Rebuild the posting list for all stored news, in id-ordered batches
+    """
+    from models import db, NewsItem, NewsTicker
+
+    extractor = extractor or get_entity_extractor()
+    db.session.query(NewsTicker).delete()
+    db.session.commit()
+    last_id = 0
+    linked = 0
+    while True:
+        rows = (db.session.query(NewsItem.id, NewsItem.title, NewsItem.description)
+                .filter(NewsItem.id > last_id).order_by(NewsItem.id).limit(batch_size).all())
+        if not rows:
+            break
+        linked += link_news_tickers(
+            (news_id, extractor.extract((title or "") + ". " + (description or "")))
+            for news_id, title, description in rows)
+        db.session.commit()
+        last_id = rows[-1][0]
+    return linked
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ticker entity index maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rebuild = sub.add_parser("reindex", help="Rebuild news -> ticker links for all stored news")
+    rebuild.add_argument("--batch-size", type=int, default=1000)
+    extract = sub.add_parser("extract", help="Print the tickers found in a text")
+    extract.add_argument("text")
+    args = parser.parse_args(argv)
+
+    if args.command == "extract":
+        print(", ".join(sorted(get_entity_extractor().extract(args.text))) or "(none)")
+        return
+
+    with contextlib.redirect_stdout(sys.stderr):
+        from app import app
+    with app.app_context():
+        linked = reindex(batch_size=args.batch_size)
+        print(f"✅ Linked {linked} news -> ticker mentions")
+
+if __name__ == "__main__":
+    main()
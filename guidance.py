@@ -0,0 +1,115 @@
+"""
+Knowledge-base intent matching for financial guidance questions
+
+Guidance topics (example questions, answer, key points, recommendations) live
+in data/guidance_kb.json. At startup each topic's title and examples are
+turned into a TF-IDF vector over stemmed unigrams and bigrams and stored in an
+inverted index (term -> [(topic, weight)]), so matching a question only
+touches the postings of its own terms and stays sub-millisecond as the
+knowledge base grows. Results for repeated questions come from an LRU cache.
+"""
+
+import json
+import math
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from lexicon import tokenize
+
+DEFAULT_KB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "guidance_kb.json")
+MIN_SCORE = 0.1
+MATCH_CACHE_SIZE = 4096
+
+STOPWORDS = frozenset([
+    "a", "about", "am", "an", "and", "any", "are", "as", "at", "be", "can", "do", "does", "for", "get", "have",
+    "how", "i", "if", "in", "is", "it", "me", "my", "of", "on", "or", "put", "should", "so", "that", "the",
+    "this", "to", "what", "which", "will", "with", "would", "you", "your"
+])
+
+def stem(token: str) -> str:
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(token) > len(suffix) + 3 and token.endswith(suffix):
+            return token[:-len(suffix)]
+    return token
+
+def question_terms(text: str) -> List[str]:
+    """Stemmed unigrams plus adjacent-pair bigrams, stopwords removed"""
+    tokens = [stem(token) for token in tokenize(text) if token not in STOPWORDS]
+    return tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+
+def _tf_weights(terms: List[str]) -> Dict[str, float]:
+    counts = {}
+    for term in terms:
+        counts[term] = counts.get(term, 0) + 1
+    return {term: 1.0 + math.log(count) for term, count in counts.items()}
+
+class GuidanceIndex:
+    """
+    TF-IDF intent matcher over knowledge-base topics
+    """
+
+    def __init__(self, topics: List[Dict], default: Dict, resources: Optional[List[str]] = None,
+                 min_score: float = MIN_SCORE, cache_size: int = MATCH_CACHE_SIZE):
+        self.topics = {topic["id"]: topic for topic in topics}
+        self.default = default
+        self.resources = resources or []
+        self.min_score = min_score
+
+        documents = []
+        for topic in topics:
+            # the title counts twice so it outweighs any single example
+            text = " . ".join([topic["title"], topic["title"]] + topic.get("examples", []))
+            documents.append((topic["id"], _tf_weights(question_terms(text))))
+
+        document_frequency = {}
+        for _, weights in documents:
+            for term in weights:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        n = len(documents)
+        self.idf = {term: math.log((n + 1) / (df + 1)) + 1.0 for term, df in document_frequency.items()}
+
+        self.postings: Dict[str, List[Tuple[str, float]]] = {}
+        for topic_id, weights in documents:
+            vector = {term: tf * self.idf[term] for term, tf in weights.items()}
+            norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+            for term, w in vector.items():
+                self.postings.setdefault(term, []).append((topic_id, w / norm))
+
+        self._match_terms = lru_cache(maxsize=cache_size)(self._match_terms)
+
+    @classmethod
+    def from_json(cls, path: str = DEFAULT_KB_PATH, **kwargs) -> "GuidanceIndex":
+        with open(path, encoding="utf-8") as f:
+            kb = json.load(f)
+        return cls(kb["topics"], kb["default"], kb.get("resources"), **kwargs)
+
+    def _match_terms(self, terms: Tuple[str, ...], top_k: int) -> Tuple[Tuple[str, float], ...]:
+        query = {term: tf * self.idf[term] for term, tf in _tf_weights(list(terms)).items() if term in self.idf}
+        norm = math.sqrt(sum(w * w for w in query.values()))
+        if not norm:
+            return ()
+        scores = {}
+        for term, w in query.items():
+            for topic_id, topic_weight in self.postings[term]:
+                scores[topic_id] = scores.get(topic_id, 0.0) + w / norm * topic_weight
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return tuple((topic_id, round(score, 4)) for topic_id, score in ranked[:top_k] if score >= self.min_score)
+
+    def match(self, question: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Ranked (topic_id, cosine score) matches above min_score, best first
+        """
+        return list(self._match_terms(tuple(sorted(question_terms(question))), top_k))
+
+    def cache_info(self):
+        return self._match_terms.cache_info()
+
+_default_index = None
+
+def get_guidance_index() -> GuidanceIndex:
+    """Load and index the configured knowledge base once per process"""
+    global _default_index
+    if _default_index is None:
+        _default_index = GuidanceIndex.from_json(os.getenv("GUIDANCE_KB_PATH", DEFAULT_KB_PATH))
+    return _default_index
@@ -0,0 +1,160 @@
+"""
+Weighted finance lexicon compiled into an Aho-Corasick automaton
+
+Terms (single words and multi-word phrases) are loaded from a CSV data file
+and compiled once into a token-level Aho-Corasick automaton. Scoring a text
+is a single left-to-right pass over its word tokens regardless of how many
+terms the lexicon holds; overlapping hits are resolved leftmost-longest so
+"profit warning" wins over "profit", and negators ("not", "fails to", ...)
+flip the polarity of terms that start within a short window after them.
+"""
+
+import csv
+import hashlib
+import os
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "finance_lexicon.csv")
+CATEGORIES = ("positive", "negative", "negator")
+NEGATION_WINDOW = 3
+
+_TOKEN_RE = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, consistent with the keyword scorer's \\b\\w+\\b"""
+    return _TOKEN_RE.findall(text.lower())
+
+class AhoCorasickAutomaton:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    Patterns are token tuples; each pattern carries an arbitrary payload.
+    search() yields (start, end, payload) for every occurrence in one pass.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[Tuple[str, ...], object]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # outputs[state] -> [(pattern_length, payload)], including those inherited via fail links
+        self._outputs: List[List[Tuple[int, object]]] = [[]]
+        for tokens, payload in patterns:
+            self._add(tokens, payload)
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self._goto)
+
+    def _add(self, tokens, payload):
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((len(tokens), payload))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def search(self, tokens: List[str]):
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for position, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, payload in outputs[state]:
+                yield position - length + 1, position + 1, payload
+
+class WeightedLexicon:
+    """
+    Weighted positive/negative/negator terms with phrase matching
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, str, float]], negation_window: int = NEGATION_WINDOW,
+                 version: Optional[str] = None):
+        entries = []
+        for term, category, weight in terms:
+            if category not in CATEGORIES:
+                raise ValueError(f"Unknown lexicon category '{category}' for term '{term}'")
+            tokens = tuple(tokenize(term))
+            if not tokens:
+                continue
+            signed = 0.0 if category == "negator" else (weight if category == "positive" else -weight)
+            entries.append((tokens, (category, signed)))
+        self.size = len(entries)
+        self.negation_window = negation_window
+        self.version = version or hashlib.sha1(repr(sorted(entries)).encode("utf-8")).hexdigest()[:12]
+        self.automaton = AhoCorasickAutomaton(entries)
+
+    @classmethod
+    def from_csv(cls, path: str = DEFAULT_LEXICON_PATH, **kwargs) -> "WeightedLexicon":
+        """
+        Load a lexicon file with term,category,weight columns ('#' lines are comments)
+        """
+        with open(path, newline="", encoding="utf-8") as f:
+            content = f.read()
+        rows = csv.DictReader(line for line in content.splitlines() if line.strip() and not line.startswith("#"))
+        terms = [(row["term"], row["category"].strip().lower(), float(row["weight"] or 0)) for row in rows]
+        kwargs.setdefault("version", "finance-" + hashlib.sha1(content.encode("utf-8")).hexdigest()[:12])
+        return cls(terms, **kwargs)
+
+    def matches(self, tokens: List[str]) -> List[Tuple[int, int, str, float]]:
+        """
+        Leftmost-longest, non-overlapping term matches as (start, end, category, weight)
+        """
+        found = sorted(self.automaton.search(tokens), key=lambda m: (m[0], -(m[1] - m[0])))
+        selected = []
+        covered_until = 0
+        for start, end, (category, weight) in found:
+            if start >= covered_until:
+                selected.append((start, end, category, weight))
+                covered_until = end
+        return selected
+
+    def weigh(self, text: str) -> Tuple[float, float]:
+        """
+        Return (positive_weight, negative_weight) for a text.
+        A term starting within `negation_window` tokens after a negator has its
+        polarity flipped.
+        """
+        positive = negative = 0.0
+        last_negator_end = None
+        for start, end, category, weight in self.matches(tokenize(text)):
+            if category == "negator":
+                last_negator_end = end
+                continue
+            if last_negator_end is not None and start - last_negator_end < self.negation_window:
+                weight = -weight
+            if weight > 0:
+                positive += weight
+            else:
+                negative -= weight
+        return positive, negative
+
+_default_lexicon = None
+
+def get_finance_lexicon() -> WeightedLexicon:
+    """Load and compile the bundled finance lexicon once per process"""
+    global _default_lexicon
+    if _default_lexicon is None:
+        _default_lexicon = WeightedLexicon.from_csv(os.getenv("FINANCE_LEXICON_PATH", DEFAULT_LEXICON_PATH))
+    return _default_lexicon
@@ -0,0 +1,163 @@
+"""
+Sliding-window news counts for market insights
+
+SlidingWindowAggregator keeps (region, sentiment) counts in a ring of
+fixed-width time buckets covering the longest window (7 days), plus a running
+total per window (1h, 24h, 7d). Adding an article touches one bucket and the
+window totals; as time moves forward each bucket is subtracted once from each
+window it leaves, so reads never depend on how many articles were counted.
+
+Timestamps are normalized to UTC: aware datetimes are converted and naive
+ones (what the database returns) are taken to already be UTC.
+
+The aggregator is rebuilt from the database at startup and follows the news
+watermark: ingestion in this process is applied incrementally, and if the
+watermark moved for any other reason (another worker, backfill, rescoring)
+the next sync() rebuilds it from the last 7 days of rows.
+"""
+
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+BUCKET_SECONDS = 300
+WINDOWS = {"1h": 3600, "24h": 24 * 3600, "7d": 7 * 24 * 3600}
+
+def to_utc_timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+class SlidingWindowAggregator:
+    """
+    Per-window (region, sentiment) counts over a ring of time buckets
+    """
+
+    def __init__(self, windows: Dict[str, int] = WINDOWS, bucket_seconds: int = BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        # window name -> length in buckets
+        self.windows = {name: max(1, seconds // bucket_seconds) for name, seconds in windows.items()}
+        self.horizon = max(self.windows.values())
+        self.version = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        # slot -> (bucket id, Counter of (region, sentiment)) or None
+        self._slots = [None] * self.horizon
+        self._totals = {name: Counter() for name in self.windows}
+        self._current = None
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def _advance(self, now_bucket: int):
+        """Move the newest bucket to `now_bucket`, expiring buckets as they leave each window"""
+        if self._current is None:
+            self._current = now_bucket
+            return
+        if now_bucket <= self._current:
+            return
+        if now_bucket - self._current >= self.horizon:
+            self._reset()
+            self._current = now_bucket
+            return
+        for bucket in range(self._current + 1, now_bucket + 1):
+            for name, length in self.windows.items():
+                leaving = self._slots[(bucket - length) % self.horizon]
+                if leaving is not None and leaving[0] == bucket - length:
+                    self._totals[name] -= leaving[1]
+            # this slot last held bucket - horizon, which has now left every window
+            self._slots[bucket % self.horizon] = None
+        self._current = now_bucket
+
+    def _add(self, published_at: datetime, region: Optional[str], sentiment: Optional[str]):
+        bucket = self._bucket(to_utc_timestamp(published_at))
+        # clock skew: articles "from the future" count as now
+        bucket = min(bucket, self._current)
+        if bucket <= self._current - self.horizon:
+            return
+        slot = bucket % self.horizon
+        if self._slots[slot] is None or self._slots[slot][0] != bucket:
+            self._slots[slot] = (bucket, Counter())
+        key = (region or "Unknown", sentiment)
+        self._slots[slot][1][key] += 1
+        for name, length in self.windows.items():
+            if bucket > self._current - length:
+                self._totals[name][key] += 1
+
+    def add(self, published_at: Optional[datetime], region: Optional[str], sentiment: Optional[str],
+            now: Optional[float] = None):
+        """Count one article; articles without a publication date or older than the horizon are ignored"""
+        if published_at is None:
+            return
+        with self._lock:
+            self._advance(self._bucket(time.time() if now is None else now))
+            self._add(published_at, region, sentiment)
+
+    def window(self, name: str, now: Optional[float] = None) -> Dict:
+        """
+        Counts for one window: total, sentiment_counts, region_counts and by_region
+        """
+        with self._lock:
+            self._advance(self._bucket(time.time() if now is None else now))
+            counts = dict(self._totals[name])
+        sentiment_counts = {}
+        region_counts = {}
+        by_region = {}
+        for (region, sentiment), count in counts.items():
+            sentiment_counts[sentiment] = sentiment_counts.get(sentiment, 0) + count
+            region_counts[region] = region_counts.get(region, 0) + count
+            by_region.setdefault(region, {})[sentiment] = count
+        return {
+            "total": sum(counts.values()),
+            "sentiment_counts": sentiment_counts,
+            "region_counts": dict(sorted(region_counts.items())),
+            "by_region": by_region,
+        }
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Dict]:
+        now = time.time() if now is None else now
+        return {name: self.window(name, now) for name in self.windows}
+
+    def rebuild(self, now: Optional[float] = None):
+        """
+        Recount from the database rows published within the horizon
+        """
+        from models import db, NewsItem
+        from watermark import read_watermark
+
+        now = time.time() if now is None else now
+        version, _ = read_watermark()
+        since = datetime.utcfromtimestamp(now - self.horizon * self.bucket_seconds)
+        rows = (db.session.query(NewsItem.published_at, NewsItem.region, NewsItem.sentiment)
+                .filter(NewsItem.published_at >= since)
+                .yield_per(1000))
+        with self._lock:
+            self._reset()
+            self._advance(self._bucket(now))
+            for published_at, region, sentiment in rows:
+                self._add(published_at, region, sentiment)
+            self.version = version
+
+    def apply_ingest(self, articles: Iterable[Tuple[Optional[datetime], Optional[str], Optional[str]]],
+                     version: int):
+        """
+        Count (published_at, region, sentiment) rows just committed with watermark `version`.
+        If other writes happened since the last sync they are left to the next sync().
+        """
+        with self._lock:
+            if self.version is None or version != self.version + 1:
+                return
+            self._advance(self._bucket(time.time()))
+            for published_at, region, sentiment in articles:
+                if published_at is not None:
+                    self._add(published_at, region, sentiment)
+            self.version = version
+
+    def sync(self, version: int):
+        """Rebuild if the database has moved past what this aggregator has seen"""
+        if version != self.version:
+            self.rebuild()
@@ -1,4 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
 from flask_login import UserMixin
 from datetime import datetime
 
@@ -23,12 +25,122 @@ class NewsItem(db.Model):
     title = db.Column(db.String(1000))
     description = db.Column(db.String(2000))
     source = db.Column(db.String(200))
-    url = db.Column(db.String(1000))
+    url = db.Column(db.String(1000), index=True)
     published_at = db.Column(db.DateTime)
     sentiment = db.Column(db.String(50))  # positive/neutral/negative
     score = db.Column(db.Float)  # confidence score
+    lexicon_version = db.Column(db.String(64), index=True)  # sentiment.lexicon_version() that produced sentiment/score
     region = db.Column(db.String(50))
+    advice = db.Column(db.String(500))  # strategy advice precomputed at ingest (see strategy.py)
     created_on = db.Column(db.DateTime, default=datetime.utcnow)
 
     def __repr__(self):
-        return f"<News {self.title[:40]}>"
\ No newline at end of file
+        return f"<News {self.title[:40]}>"
+
+class NewsTicker(db.Model):
+    """Posting list: one row per ticker mentioned in a news item (see entities.py)"""
+    __tablename__ = "news_tickers"
+    # (symbol, news_id) primary key doubles as the posting-list index
+    symbol = db.Column(db.String(16), primary_key=True)
+    news_id = db.Column(db.Integer, db.ForeignKey("news.id"), primary_key=True, index=True)
+
+    def __repr__(self):
+        return f"<NewsTicker {self.symbol} -> {self.news_id}>"
+
+class NewsTerm(db.Model):
+    """BM25 posting: term frequency of a term in one news item's title + description (see news_search.py)"""
+    __tablename__ = "news_terms"
+    # (term, news_id) primary key lets a term's newest postings be read as an index range
+    term = db.Column(db.String(64), primary_key=True)
+    news_id = db.Column(db.Integer, db.ForeignKey("news.id"), primary_key=True)
+    tf = db.Column(db.Integer, nullable=False)
+    doc_length = db.Column(db.Integer, nullable=False)  # denormalized so scoring needs no join
+
+class TermStat(db.Model):
+    """Document frequency per term, plus corpus totals under reserved non-word keys"""
+    __tablename__ = "news_term_stats"
+    term = db.Column(db.String(64), primary_key=True)
+    df = db.Column(db.Integer, nullable=False, default=0)
+
+class NewsSector(db.Model):
+    """Sector tag of a news item (see sectors.py)"""
+    __tablename__ = "news_sectors"
+    sector = db.Column(db.String(50), primary_key=True)
+    news_id = db.Column(db.Integer, db.ForeignKey("news.id"), primary_key=True, index=True)
+
+class SectorSentiment(db.Model):
+    """Daily sentiment counts of the news tagged with a sector"""
+    __tablename__ = "sector_sentiment"
+    # (sector, day) primary key; rolling windows are a range scan over the newest days
+    sector = db.Column(db.String(50), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    positive = db.Column(db.Integer, nullable=False, default=0)
+    negative = db.Column(db.Integer, nullable=False, default=0)
+    neutral = db.Column(db.Integer, nullable=False, default=0)
+
+class SentimentIndexPoint(db.Model):
+    """Sentiment counts and EWMA of the net score for one region and time bucket (see sentiment_index.py)"""
+    __tablename__ = "sentiment_index"
+    region = db.Column(db.String(50), primary_key=True)
+    granularity = db.Column(db.String(8), primary_key=True)  # 'hour' or 'day'
+    bucket_start = db.Column(db.DateTime, primary_key=True)  # UTC
+    positive = db.Column(db.Integer, nullable=False, default=0)
+    negative = db.Column(db.Integer, nullable=False, default=0)
+    neutral = db.Column(db.Integer, nullable=False, default=0)
+    ewma = db.Column(db.Float)
+
+class Watermark(db.Model):
+    """Version counter bumped in the same transaction as every write to a dataset (see watermark.py)"""
+    __tablename__ = "watermarks"
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_on = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Watermark {self.name}={self.version}>"
+
+def upgrade_schema():
+    """
+    Bring an existing database up to date with the models.
+    db.create_all() only creates missing tables, so columns and indexes added
+    to existing tables are created here.
+    """
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                with db.engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+def increment_counters(model, rows, counters):
+    """
+    Add each row's `counters` values to the stored row with the same primary key,
+    inserting rows that do not exist yet. On SQLite and PostgreSQL this is one
+    INSERT ... ON CONFLICT DO UPDATE SET col = col + excluded.col per batch, so
+    the addition happens in SQL and concurrent writers never lose increments.
+    Runs in the current transaction; the caller commits.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    keys = [column.name for column in table.primary_key.columns]
+    dialect = db.session.get_bind().dialect.name
+    insert = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}.get(dialect)
+    if insert is not None:
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c[key] for key in keys],
+            set_={name: table.c[name] + statement.excluded[name] for name in counters})
+        db.session.execute(statement, rows)
+        return
+    # Other databases: increment in place, insert the rows that were missing
+    for row in rows:
+        match = [table.c[key] == row[key] for key in keys]
+        result = db.session.execute(table.update().where(*match)
+                                    .values({name: table.c[name] + row[name] for name in counters}))
+        if result.rowcount == 0:
+            db.session.execute(table.insert().values(**row))
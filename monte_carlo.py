@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo outcomes of the advisor's risk-profile allocations
+
+Each profile in FinancialAIAdvisor.PROFILE_ALLOCATIONS is simulated as a
+monthly-rebalanced mix of asset classes with correlated log-normal monthly
+returns (ASSET_ASSUMPTIONS, ASSET_CORRELATION). Paths are generated in
+fixed-size chunks, each with its own child of one SeedSequence, so a seed
+reproduces the same paths whether the chunks run in-process or across a
+process pool (used once a run exceeds PARALLEL_PATHS). Wealth with monthly
+contributions is computed in closed form from cumulative growth, keeping
+every chunk a handful of array operations; only year-end wealth is kept for
+the percentile bands. Results are memoized per (profile, horizon, parameters).
+
+    python monte_carlo.py --profile Moderate --years 20 --paths 50000
+    python monte_carlo.py --years 10 --monthly 500 --json -
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ai_advisor import FinancialAIAdvisor
+
+# Annual expected return and volatility per asset class (long-run, nominal)
+ASSET_ASSUMPTIONS = {
+    "stocks": {"return": 0.07, "volatility": 0.16},
+    "bonds": {"return": 0.035, "volatility": 0.06},
+    "cash": {"return": 0.02, "volatility": 0.005},
+}
+ASSET_CORRELATION = {
+    ("stocks", "bonds"): 0.1,
+    ("stocks", "cash"): 0.0,
+    ("bonds", "cash"): 0.2,
+}
+PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_PATHS = 20000
+DEFAULT_SEED = 42
+CHUNK_PATHS = 4096
+# Runs with more paths than this are spread over a process pool
+PARALLEL_PATHS = 40000
+CACHE_SIZE = 128
+
+def _asset_model(allocation: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(weights, monthly log drift, monthly volatility, correlation Cholesky factor) over the allocated assets"""
+    assets = [asset for asset, weight in allocation.items() if weight > 0]
+    weights = np.array([allocation[asset] for asset in assets], dtype=float)
+    weights /= weights.sum()
+    annual_return = np.array([ASSET_ASSUMPTIONS[asset]["return"] for asset in assets])
+    annual_volatility = np.array([ASSET_ASSUMPTIONS[asset]["volatility"] for asset in assets])
+    monthly_volatility = annual_volatility / np.sqrt(12)
+    # log drift whose exponential has the expected arithmetic return
+    drift = np.log1p(annual_return) / 12 - monthly_volatility ** 2 / 2
+    correlation = np.eye(len(assets))
+    for i, a in enumerate(assets):
+        for j, b in enumerate(assets):
+            if i != j:
+                correlation[i, j] = ASSET_CORRELATION.get((a, b), ASSET_CORRELATION.get((b, a), 0.0))
+    return weights, drift, monthly_volatility, np.linalg.cholesky(correlation)
+
+def simulate_chunk(allocation: Dict[str, float], years: int, initial: float, monthly: float,
+                   paths: int, seed_sequence: np.random.SeedSequence) -> np.ndarray:
+    """
+    Year-end wealth of `paths` simulated portfolios, shape (paths, years)
+    """
+    weights, drift, volatility, cholesky = _asset_model(allocation)
+    rng = np.random.default_rng(seed_sequence)
+    months = years * 12
+    shocks = rng.standard_normal((paths, months, len(weights))) @ cholesky.T
+    asset_returns = np.expm1(drift + shocks * volatility)
+    growth = np.cumprod(1.0 + asset_returns @ weights, axis=1)
+    # W_t = G_t * (W_0 + c * sum_{s<=t} 1 / G_s) for a contribution c at each month end
+    wealth = growth * (initial + monthly * np.cumsum(1.0 / growth, axis=1))
+    return wealth[:, 11::12]
+
+def _run_chunk(args) -> np.ndarray:
+    return simulate_chunk(*args)
+
+def simulate(profile: str, years: int = 10, initial: float = 10000.0, monthly: float = 0.0,
+             paths: int = DEFAULT_PATHS, seed: int = DEFAULT_SEED, workers: Optional[int] = None) -> Dict:
+    """
+    Percentile bands of year-end wealth and summary statistics for one risk profile
+    """
+    allocations = FinancialAIAdvisor.PROFILE_ALLOCATIONS
+    if profile not in allocations:
+        raise ValueError(f"Unknown risk profile '{profile}'")
+    if years < 1 or paths < 1:
+        raise ValueError("years and paths must be positive")
+    allocation = allocations[profile]
+
+    sizes = [CHUNK_PATHS] * (paths // CHUNK_PATHS) + ([paths % CHUNK_PATHS] if paths % CHUNK_PATHS else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(allocation, years, initial, monthly, size, child) for size, child in zip(sizes, seeds)]
+    started = time.perf_counter()
+    if paths > PARALLEL_PATHS and len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_run_chunk, jobs))
+    else:
+        chunks = [_run_chunk(job) for job in jobs]
+    wealth = np.concatenate(chunks)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    final = wealth[:, -1]
+    contributed = initial + monthly * 12 * years
+    bands = np.percentile(wealth, PERCENTILES, axis=0)
+    final_percentiles = np.percentile(final, PERCENTILES)
+    median_cagr = None
+    if initial > 0 and not monthly:
+        # only meaningful for a lump sum; contributions are not growth
+        median_cagr = (final_percentiles[PERCENTILES.index(50)] / initial) ** (1 / years) - 1
+    return {
+        "profile": profile,
+        "allocation": allocation,
+        "years": years,
+        "initial": initial,
+        "monthly": monthly,
+        "paths": paths,
+        "seed": seed,
+        "contributed": round(contributed, 2),
+        "percentiles": list(PERCENTILES),
+        # bands[p][y] = p-th percentile of wealth at the end of year y + 1
+        "bands": {str(p): [round(float(v), 2) for v in row] for p, row in zip(PERCENTILES, bands)},
+        "final": {str(p): round(float(v), 2) for p, v in zip(PERCENTILES, final_percentiles)},
+        "mean_final": round(float(final.mean()), 2),
+        "probability_of_loss": round(float((final < contributed).mean()), 4),
+        "median_annual_return": round(float(median_cagr), 4) if median_cagr is not None else None,
+        "elapsed_ms": round(elapsed_ms, 1),
+    }
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _cached_simulation(profile: str, years: int, initial: float, monthly: float, paths: int, seed: int,
+                       workers: Optional[int]) -> str:
+    return json.dumps(simulate(profile, years, initial, monthly, paths, seed, workers))
+
+def cached_simulation(profile: str, years: int = 10, initial: float = 10000.0, monthly: float = 0.0,
+                      paths: int = DEFAULT_PATHS, seed: int = DEFAULT_SEED, workers: Optional[int] = None) -> Dict:
+    """
+    simulate() memoized per (profile, horizon, parameters); seeded runs are
+    deterministic, so a cached result is exactly what a rerun would produce
+    """
+    # stored serialized so callers cannot mutate the cached result
+    return json.loads(_cached_simulation(profile, int(years), float(initial), float(monthly), int(paths), int(seed),
+                                         workers))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo outcomes of the advisor's risk-profile allocations")
+    parser.add_argument("--profile", action="append", choices=list(FinancialAIAdvisor.PROFILE_ALLOCATIONS),
+                        help="Risk profile (repeatable; default: all)")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--initial", type=float, default=10000.0)
+    parser.add_argument("--monthly", type=float, default=0.0, help="Contribution at the end of each month")
+    parser.add_argument("--paths", type=int, default=DEFAULT_PATHS)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--workers", type=int, help="Processes for large runs (default: all cores)")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    results = [simulate(profile, args.years, args.initial, args.monthly, args.paths, args.seed, args.workers)
+               for profile in args.profile or FinancialAIAdvisor.PROFILE_ALLOCATIONS]
+    if args.json:
+        payload = json.dumps(results, indent=2)
+        if args.json == "-":
+            print(payload)
+        else:
+            with open(args.json, "w") as f:
+                f.write(payload + "\n")
+        return
+    for result in results:
+        final = result["final"]
+        print(f"🎲 {result['profile']}: {result['paths']} paths over {result['years']} years "
+              f"({result['elapsed_ms']:.0f}ms), contributed {result['contributed']:,.0f}")
+        print(f"   final wealth p5 {final['5']:,.0f} | p50 {final['50']:,.0f} | p95 {final['95']:,.0f}; "
+              f"P(loss) {result['probability_of_loss']:.1%}")
+
+if __name__ == "__main__":
+    main()
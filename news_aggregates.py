@@ -0,0 +1,33 @@
+"""
+Grouped SQL aggregates over recent news for the AI advisor
+
+query_market_aggregates() computes the sentiment counts FinancialAIAdvisor
+needs for its market sentiment in one GROUP BY query over the newest `limit`
+articles, so the advisor can cover thousands of articles without loading any
+rows into Python. (Market insights come from the sliding windows in
+market_window.py.)
+"""
+
+from typing import Dict
+
+from sqlalchemy import func
+
+from models import db, NewsItem
+
+DEFAULT_LIMIT = 5000
+
+def query_market_aggregates(limit: int = DEFAULT_LIMIT) -> Dict:
+    """
+    Returns {"total", "sentiment_counts"} over the newest `limit` news items by publication date
+    """
+    newest = (db.session.query(NewsItem.sentiment)
+              .order_by(NewsItem.published_at.desc())
+              .limit(limit)
+              .subquery())
+    rows = db.session.query(newest.c.sentiment, func.count()).group_by(newest.c.sentiment).all()
+
+    aggregates = {"total": 0, "sentiment_counts": {}}
+    for sentiment, count in rows:
+        aggregates["total"] += count
+        aggregates["sentiment_counts"][sentiment] = count
+    return aggregates
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Streaming export of analyzed news (CSV / NDJSON)
+
+Rows are read through a server-side cursor in fixed-size batches and written
+out as they arrive, so exporting years of history never materializes the
+table in memory. Used by the /export/news endpoint and as a CLI:
+
+    python news_export.py --format ndjson --region US --since 2024-01-01 --gzip -o news.ndjson.gz
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import sys
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, Optional
+
+from models import db, NewsItem
+
+EXPORT_FIELDS = ["id", "title", "description", "source", "url", "published_at",
+                 "sentiment", "score", "region", "created_on"]
+EXPORT_FORMATS = ("csv", "ndjson")
+DEFAULT_BATCH_SIZE = 1000
+
+def parse_export_date(value: Optional[str], end_of_day: bool = False) -> Optional[datetime]:
+    """
+    Parse an ISO date/datetime filter value. A bare date used as an upper
+    bound is extended to cover the whole day.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD")
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+def build_export_query(region: Optional[str] = None, sentiment: Optional[str] = None,
+                       since: Optional[datetime] = None, until: Optional[datetime] = None,
+                       limit: Optional[int] = None):
+    """
+    Column-only query over NewsItem with the export filters applied.
+    Selecting columns instead of entities skips ORM identity-map bookkeeping.
+    """
+    columns = [getattr(NewsItem, field) for field in EXPORT_FIELDS]
+    query = db.session.query(*columns)
+    if region:
+        query = query.filter(NewsItem.region == region.upper())
+    if sentiment:
+        query = query.filter(NewsItem.sentiment == sentiment.lower())
+    if since:
+        query = query.filter(NewsItem.published_at >= since)
+    if until:
+        query = query.filter(NewsItem.published_at < until)
+    query = query.order_by(NewsItem.id)
+    if limit:
+        query = query.limit(limit)
+    return query
+
+def iter_export_rows(query, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict]:
+    """
+    Yield export rows as dicts, fetching `batch_size` rows per round trip
+    from a server-side cursor.
+    """
+    streamed = query.execution_options(stream_results=True).yield_per(batch_size)
+    for row in streamed:
+        yield dict(zip(EXPORT_FIELDS, row))
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def stream_csv(rows: Iterable[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+    """
+    Render rows as CSV, yielding one chunk per `batch_size` rows
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    pending = 0
+    for row in rows:
+        writer.writerow([_format_value(row[field]) for field in EXPORT_FIELDS])
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    yield buffer.getvalue()
+
+def stream_ndjson(rows: Iterable[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+    """
+    Render rows as newline-delimited JSON, yielding one chunk per `batch_size` rows
+    """
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({field: _format_value(row[field]) for field in EXPORT_FIELDS},
+                                ensure_ascii=False))
+        if len(lines) >= batch_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+def gzip_stream(chunks: Iterable[str]) -> Iterator[bytes]:
+    """
+    Incrementally gzip a stream of text chunks
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_news(fmt: str = "csv", region: Optional[str] = None, sentiment: Optional[str] = None,
+                since: Optional[datetime] = None, until: Optional[datetime] = None,
+                limit: Optional[int] = None, compress: bool = False,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator:
+    """
+    Build the full export pipeline: filtered query -> rows -> encoded chunks.
+    Yields str chunks, or bytes when `compress` is set.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}', expected one of {', '.join(EXPORT_FORMATS)}")
+    query = build_export_query(region=region, sentiment=sentiment, since=since, until=until, limit=limit)
+    rows = iter_export_rows(query, batch_size=batch_size)
+    encoder = stream_csv if fmt == "csv" else stream_ndjson
+    chunks = encoder(rows, batch_size=batch_size)
+    return gzip_stream(chunks) if compress else chunks
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export analyzed news as CSV or NDJSON")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--region", help="Region code, e.g. US, IN, GLOBAL")
+    parser.add_argument("--sentiment", choices=["positive", "neutral", "negative"])
+    parser.add_argument("--since", help="Published on or after (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Published on or before (YYYY-MM-DD)")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--gzip", action="store_true", help="Gzip the output")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    try:
+        since = parse_export_date(args.since)
+        until = parse_export_date(args.until, end_of_day=True)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # app.py reports scraper availability on import; keep stdout clean for the export itself
+    with contextlib.redirect_stdout(sys.stderr):
+        from app import app
+    with app.app_context():
+        chunks = export_news(args.format, region=args.region, sentiment=args.sentiment,
+                             since=since, until=until, limit=args.limit,
+                             compress=args.gzip, batch_size=args.batch_size)
+        if args.output:
+            mode = "wb" if args.gzip else "w"
+            kwargs = {} if args.gzip else {"encoding": "utf-8", "newline": ""}
+            with open(args.output, mode, **kwargs) as out:
+                for chunk in chunks:
+                    out.write(chunk)
+            print(f"✅ Export written to {args.output}", file=sys.stderr)
+        else:
+            out = sys.stdout.buffer if args.gzip else sys.stdout
+            for chunk in chunks:
+                out.write(chunk)
+            out.flush()
+
+if __name__ == "__main__":
+    main()
@@ -57,6 +57,25 @@ SUPPORTED_COUNTRIES = {
     "lu": "Luxembourg"
 }
 
+def normalize_newsapi_article(a, country):
+    """
+    Convert a raw NewsAPI article into the article dict used across the app
+    """
+    published_at = None
+    if a.get("publishedAt"):
+        try:
+            published_at = datetime.fromisoformat(a["publishedAt"].replace("Z", "+00:00"))
+        except Exception:
+            published_at = None
+    return {
+        "title": a.get("title"),
+        "description": a.get("description"),
+        "url": a.get("url"),
+        "source": (a.get("source") or {}).get("name"),
+        "publishedAt": published_at,
+        "country": country
+    }
+
 def fetch_news_by_country(country="us", category="business", page_size=50):
     """
     Fetch news from a specific country
@@ -104,23 +123,7 @@ def fetch_news_by_country(country="us", category="business", page_size=50):
             print(f"No articles found for country {country}, trying search endpoint...")
             return fetch_news_by_country_search(country, page_size)
         
-        results = []
-        for a in articles:
-            published_at = None
-            if a.get("publishedAt"):
-                try:
-                    published_at = datetime.fromisoformat(a["publishedAt"].replace("Z", "+00:00"))
-                except Exception:
-                    published_at = None
-            results.append({
-                "title": a.get("title"),
-                "description": a.get("description"),
-                "url": a.get("url"),
-                "source": a.get("source", {}).get("name"),
-                "publishedAt": published_at,
-                "country": country.upper()
-            })
-        return results
+        return [normalize_newsapi_article(a, country.upper()) for a in articles]
     except requests.exceptions.RequestException as e:
         raise Exception(f"NewsAPI request failed: {str(e)}")
     except Exception as e:
@@ -171,23 +174,7 @@ def fetch_news_by_country_search(country="us", page_size=50):
             raise Exception(f"NewsAPI search error: {data.get('message', 'Unknown error')}")
             
         articles = data.get("articles", [])
-        results = []
-        for a in articles:
-            published_at = None
-            if a.get("publishedAt"):
-                try:
-                    published_at = datetime.fromisoformat(a["publishedAt"].replace("Z", "+00:00"))
-                except Exception:
-                    published_at = None
-            results.append({
-                "title": a.get("title"),
-                "description": a.get("description"),
-                "url": a.get("url"),
-                "source": a.get("source", {}).get("name"),
-                "publishedAt": published_at,
-                "country": country.upper()
-            })
-        return results
+        return [normalize_newsapi_article(a, country.upper()) for a in articles]
     except requests.exceptions.RequestException as e:
         raise Exception(f"NewsAPI search request failed: {str(e)}")
     except Exception as e:
@@ -255,23 +242,7 @@ def fetch_global_financial_news(query="financial markets", page_size=50):
             raise Exception(f"NewsAPI error: {error_msg}")
             
         articles = data.get("articles", [])
-        results = []
-        for a in articles:
-            published_at = None
-            if a.get("publishedAt"):
-                try:
-                    published_at = datetime.fromisoformat(a["publishedAt"].replace("Z", "+00:00"))
-                except Exception:
-                    published_at = None
-            results.append({
-                "title": a.get("title"),
-                "description": a.get("description"),
-                "url": a.get("url"),
-                "source": a.get("source", {}).get("name"),
-                "publishedAt": published_at,
-                "country": "GLOBAL"
-            })
-        return results
+        return [normalize_newsapi_article(a, "GLOBAL") for a in articles]
     except requests.exceptions.RequestException as e:
         if "429" in str(e) or "Too Many Requests" in str(e):
             raise Exception("NewsAPI rate limit exceeded. Please try again later or use RSS feeds instead.")
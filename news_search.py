@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+BM25 search over stored news
+
+Title and description terms are indexed at ingest into a postings table
+(news_terms, keyed by (term, news_id)) with document frequencies and corpus
+totals in news_term_stats, so the index lives in the database alongside the
+news and is never rebuilt at startup. A query reads, rarest term first, only
+the newest `max_postings` postings of each term through the primary-key
+index, which bounds latency regardless of how many articles are stored and
+favours recent news. Terms are skipped once the time budget is spent.
+
+Databases that predate the index can be backfilled with:
+
+    python news_search.py reindex
+    python news_search.py search "should I buy bonds now"
+"""
+
+import argparse
+import contextlib
+import heapq
+import math
+import sys
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from guidance import STOPWORDS, stem
+from lexicon import tokenize
+from models import db, increment_counters, NewsItem, NewsTerm, TermStat
+
+K1 = 1.2
+B = 0.75
+MAX_TERM_LENGTH = 64
+DEFAULT_MAX_POSTINGS = 2000
+DEFAULT_BUDGET_MS = 50.0
+# Corpus totals share news_term_stats with real terms; '#' never appears in a \w+ token
+DOCS_KEY = "#docs"
+LENGTH_KEY = "#length"
+
+def index_terms(text: str) -> List[str]:
+    """Stemmed word tokens without stopwords (the same normalization guidance questions use)"""
+    return [stem(token) for token in tokenize(text)
+            if token not in STOPWORDS and len(token) <= MAX_TERM_LENGTH]
+
+def _increment_stats(increments: Dict[str, int]):
+    """Add to df/corpus counters with one upsert per batch"""
+    increment_counters(TermStat, [{"term": term, "df": count} for term, count in increments.items()], ["df"])
+
+def index_news(documents: Iterable[Tuple[int, str]]) -> int:
+    """
+    Add (news_id, text) documents to the index inside the current transaction; the caller commits.
+    Returns the number of postings written.
+    """
+    postings = []
+    increments = Counter()
+    for news_id, text in documents:
+        terms = index_terms(text)
+        counts = Counter(terms)
+        for term, tf in counts.items():
+            postings.append({"term": term, "news_id": news_id, "tf": tf, "doc_length": len(terms)})
+        increments.update(counts.keys())
+        increments[DOCS_KEY] += 1
+        increments[LENGTH_KEY] += len(terms)
+    if postings:
+        db.session.execute(NewsTerm.__table__.insert(), postings)
+    _increment_stats(increments)
+    return len(postings)
+
+def search_news(query: str, limit: int = 5, max_postings: int = DEFAULT_MAX_POSTINGS,
+                budget_ms: Optional[float] = DEFAULT_BUDGET_MS) -> List[Dict]:
+    """
+    Top `limit` news items for a free-text query by BM25, best first.
+    Each result is the article's fields plus its "relevance" score.
+    """
+    terms = list(dict.fromkeys(index_terms(query)))
+    if not terms:
+        return []
+    started = time.perf_counter()
+    stats = dict(db.session.query(TermStat.term, TermStat.df).filter(TermStat.term.in_(terms + [DOCS_KEY, LENGTH_KEY])))
+    documents = stats.get(DOCS_KEY, 0)
+    if not documents:
+        return []
+    average_length = stats.get(LENGTH_KEY, 0) / documents or 1.0
+
+    scores = {}
+    for term in sorted((t for t in terms if stats.get(t)), key=lambda t: stats[t]):
+        if budget_ms is not None and scores and (time.perf_counter() - started) * 1000 > budget_ms:
+            break
+        df = stats[term]
+        idf = math.log(1 + (documents - df + 0.5) / (df + 0.5))
+        postings = (db.session.query(NewsTerm.news_id, NewsTerm.tf, NewsTerm.doc_length)
+                    .filter(NewsTerm.term == term)
+                    .order_by(NewsTerm.news_id.desc())
+                    .limit(max_postings))
+        for news_id, tf, doc_length in postings:
+            weight = tf * (K1 + 1) / (tf + K1 * (1 - B + B * doc_length / average_length))
+            scores[news_id] = scores.get(news_id, 0.0) + idf * weight
+
+    best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+    if not best:
+        return []
+    items = {n.id: n for n in NewsItem.query.filter(NewsItem.id.in_([news_id for news_id, _ in best]))}
+    results = []
+    for news_id, score in best:
+        n = items.get(news_id)
+        if n is None:
+            continue
+        results.append({
+            "id": n.id,
+            "title": n.title,
+            "description": n.description,
+            "source": n.source,
+            "url": n.url,
+            "published_at": n.published_at,
+            "sentiment": n.sentiment,
+            "region": n.region,
+            "relevance": round(score, 3),
+        })
+    return results
+
+def reindex(batch_size: int = 1000) -> int:
+    """
+    Rebuild the index for all stored news, in id-ordered batches
+    """
+    db.session.query(NewsTerm).delete()
+    db.session.query(TermStat).delete()
+    db.session.commit()
+    last_id = 0
+    postings = 0
+    while True:
+        rows = (db.session.query(NewsItem.id, NewsItem.title, NewsItem.description)
+                .filter(NewsItem.id > last_id).order_by(NewsItem.id).limit(batch_size).all())
+        if not rows:
+            break
+        postings += index_news((news_id, (title or "") + ". " + (description or ""))
+                               for news_id, title, description in rows)
+        db.session.commit()
+        last_id = rows[-1][0]
+    return postings
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BM25 news index maintenance and search")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rebuild = sub.add_parser("reindex", help="Rebuild the index for all stored news")
+    rebuild.add_argument("--batch-size", type=int, default=1000)
+    search = sub.add_parser("search", help="Print the best matching stored news")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        from app import app
+    with app.app_context():
+        if args.command == "reindex":
+            started = time.monotonic()
+            postings = reindex(batch_size=args.batch_size)
+            print(f"✅ Indexed {postings} postings in {time.monotonic() - started:.1f}s")
+        else:
+            started = time.perf_counter()
+            results = search_news(args.query, limit=args.limit)
+            elapsed = (time.perf_counter() - started) * 1000
+            for result in results:
+                print(f"{result['relevance']:7.3f}  [{result['sentiment']}] {result['title']}")
+            print(f"🔎 {len(results)} results in {elapsed:.1f}ms")
+
+if __name__ == "__main__":
+    main()
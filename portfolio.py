@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Long-only portfolio weights for recommended stocks
+
+Daily log returns of each candidate are read from the memory-mapped price
+store (price_store.py, imported from the backtester's data/ohlcv CSVs),
+aligned on common dates, and turned into an annualized covariance matrix and
+shrunk mean returns. The estimates are cached per symbol set and reused
+while the store's indicator snapshot version is unchanged, the same version
+the /ai-advisor cache is keyed on. Each risk profile maps to a solver
+(PROFILE_OPTIMIZERS):
+
+- risk parity: every holding contributes the same share of portfolio variance
+- mean-variance: maximize mu'w - (risk_aversion / 2) w'Sw
+
+both long-only, fully invested and capped at `max_weight` per holding, solved
+with vectorized fixed-point / projected-gradient iterations. Candidates with
+too little price history are left out; with fewer than two left the weights
+are equal.
+
+    python portfolio.py AAPL MSFT JNJ XOM --profile Conservative
+"""
+
+import argparse
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backtest import TRADING_DAYS
+from price_store import FIELDS, get_indicator_snapshot
+
+# Risk profile -> (method, risk aversion for mean-variance)
+PROFILE_OPTIMIZERS = {
+    "Conservative": ("risk_parity", None),
+    "Moderate": ("mean_variance", 6.0),
+    "Aggressive": ("mean_variance", 2.0),
+}
+LOOKBACK_DAYS = 3 * TRADING_DAYS
+MIN_HISTORY_DAYS = 60
+# Historical means are noisy; pull each towards the cross-sectional average
+RETURN_SHRINKAGE = 0.5
+DEFAULT_MAX_WEIGHT = 0.4
+MAX_ITERATIONS = 500
+TOLERANCE = 1e-9
+
+def project_capped_simplex(v: np.ndarray, cap: float = 1.0) -> np.ndarray:
+    """
+    Euclidean projection onto {w : 0 <= w <= cap, sum(w) = 1} by bisection on the shift
+    """
+    cap = max(cap, 1.0 / len(v))
+    low, high = v.min() - cap, v.max()
+    for _ in range(100):
+        shift = (low + high) / 2
+        total = np.clip(v - shift, 0.0, cap).sum()
+        if abs(total - 1.0) < 1e-12:
+            break
+        if total > 1.0:
+            low = shift
+        else:
+            high = shift
+    return np.clip(v - shift, 0.0, cap)
+
+def risk_parity_weights(cov: np.ndarray, max_weight: float = 1.0) -> np.ndarray:
+    """Equal risk contributions, w_i * (Sw)_i the same for every holding"""
+    weights = 1.0 / np.sqrt(np.diag(cov))
+    weights /= weights.sum()
+    for _ in range(MAX_ITERATIONS):
+        contributions = weights * (cov @ weights)
+        updated = weights * np.sqrt(contributions.mean() / contributions)
+        updated = project_capped_simplex(updated / updated.sum(), max_weight)
+        if np.abs(updated - weights).max() < TOLERANCE:
+            return updated
+        weights = updated
+    return weights
+
+def mean_variance_weights(mu: np.ndarray, cov: np.ndarray, risk_aversion: float,
+                          max_weight: float = 1.0) -> np.ndarray:
+    """Projected gradient ascent on mu'w - (risk_aversion / 2) w'Sw over the capped simplex"""
+    step = 1.0 / (risk_aversion * np.linalg.eigvalsh(cov)[-1])
+    weights = np.full(len(mu), 1.0 / len(mu))
+    for _ in range(MAX_ITERATIONS):
+        gradient = mu - risk_aversion * (cov @ weights)
+        updated = project_capped_simplex(weights + step * gradient, max_weight)
+        if np.abs(updated - weights).max() < TOLERANCE:
+            return updated
+        weights = updated
+    return weights
+
+def estimate_returns(prices: Dict[str, Dict[str, np.ndarray]],
+                     lookback: int = LOOKBACK_DAYS) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    (symbols kept, annualized shrunk mean returns, annualized covariance) from
+    close prices aligned on the dates every symbol has
+    """
+    symbols = [s for s, series in prices.items() if len(series["date"]) > MIN_HISTORY_DAYS]
+    if not symbols:
+        return [], np.empty(0), np.empty((0, 0))
+    common = prices[symbols[0]]["date"]
+    for symbol in symbols[1:]:
+        common = np.intersect1d(common, prices[symbol]["date"])
+    common = common[-(lookback + 1):]
+    if len(common) <= MIN_HISTORY_DAYS:
+        return [], np.empty(0), np.empty((0, 0))
+    closes = np.column_stack([prices[s]["close"][np.isin(prices[s]["date"], common)] for s in symbols])
+    log_returns = np.diff(np.log(closes), axis=0)
+    log_returns = log_returns[np.isfinite(log_returns).all(axis=1)]
+    mu = log_returns.mean(axis=0) * TRADING_DAYS
+    mu = (1 - RETURN_SHRINKAGE) * mu + RETURN_SHRINKAGE * mu.mean()
+    cov = np.atleast_2d(np.cov(log_returns, rowvar=False)) * TRADING_DAYS
+    return symbols, mu, cov
+
+class CovarianceCache:
+    """
+    Return estimates per symbol set, valid while the price store's snapshot version is unchanged
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbols: List[str]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        key = tuple(sorted(set(s.upper() for s in symbols)))
+        snapshot = get_indicator_snapshot()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == snapshot.version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        prices = {}
+        for symbol in key:
+            matrix = snapshot.store.load(symbol)
+            if matrix is not None:
+                prices[symbol] = {"date": matrix[:, 0], "close": matrix[:, FIELDS.index("close")]}
+        estimates = estimate_returns(prices)
+        with self._lock:
+            self._entries[key] = (snapshot.version, estimates)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return estimates
+
+    def stats(self) -> Dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+covariance_cache = CovarianceCache()
+
+def optimize_weights(symbols: List[str], risk_profile: str = "Moderate",
+                     max_weight: float = DEFAULT_MAX_WEIGHT) -> Dict:
+    """
+    Weights for `symbols` under the profile's optimizer:
+    {"weights": {symbol: weight}, "method", "expected_return", "volatility", "missing_prices"}
+    """
+    method, risk_aversion = PROFILE_OPTIMIZERS.get(risk_profile, PROFILE_OPTIMIZERS["Moderate"])
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    priced, mu, cov = covariance_cache.get(symbols)
+    result = {"method": method, "expected_return": None, "volatility": None,
+              "missing_prices": [s for s in symbols if s not in priced]}
+    if len(priced) < 2:
+        result["method"] = "equal"
+        result["weights"] = {s: round(1.0 / len(symbols), 4) for s in symbols} if symbols else {}
+        return result
+    cap = max(max_weight, 1.0 / len(priced))
+    if method == "risk_parity":
+        weights = risk_parity_weights(cov, cap)
+    else:
+        weights = mean_variance_weights(mu, cov, risk_aversion, cap)
+    result["weights"] = {s: round(float(w), 4) for s, w in zip(priced, weights)}
+    result["expected_return"] = round(float(mu @ weights), 4)
+    result["volatility"] = round(float(np.sqrt(weights @ cov @ weights)), 4)
+    return result
+
+def weight_picks(picks: List[Dict], risk_profile: str = "Moderate", max_weight: float = DEFAULT_MAX_WEIGHT) -> Dict:
+    """
+    Add a "weight" to each recommendation pick (None for picks without price data
+    when others have it) and return the optimizer summary. A symbol picked under
+    more than one sector is weighted once, on its first pick; repeats get None,
+    so the pick weights sum to the portfolio's.
+    """
+    portfolio = optimize_weights([pick["symbol"] for pick in picks], risk_profile, max_weight)
+    weighted = set()
+    for pick in picks:
+        symbol = pick["symbol"]
+        pick["weight"] = portfolio["weights"].get(symbol) if symbol not in weighted else None
+        weighted.add(symbol)
+    return portfolio
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Long-only weights for a set of stocks from local price files")
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--profile", choices=list(PROFILE_OPTIMIZERS), default="Moderate")
+    parser.add_argument("--max-weight", type=float, default=DEFAULT_MAX_WEIGHT)
+    args = parser.parse_args(argv)
+
+    portfolio = optimize_weights(args.symbols, args.profile, args.max_weight)
+    print(f"⚖️  {portfolio['method']} weights for a {args.profile} profile")
+    for symbol, weight in sorted(portfolio["weights"].items(), key=lambda item: item[1], reverse=True):
+        print(f"   {symbol:<8} {weight:6.1%}")
+    if portfolio["expected_return"] is not None:
+        print(f"   expected return {portfolio['expected_return']:.1%}, volatility {portfolio['volatility']:.1%}")
+    if portfolio["missing_prices"]:
+        print(f"⚠️  No usable price history for {', '.join(portfolio['missing_prices'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Local OHLCV store and vectorized technical indicators
+
+CSV price dumps (data/ohlcv/<SYMBOL>.csv, the backtester's Yahoo layout) are
+imported into one .npy file per ticker holding a float64 matrix of
+(day number, open, high, low, close, volume) rows, which PriceStore opens
+memory-mapped, so only the pages an indicator reads are loaded and every
+process shares them through the page cache. compute_indicators() aligns the
+closes of the whole universe on one date grid and derives moving averages,
+realized volatility, drawdowns and beta against a benchmark as matrix
+operations over all tickers at once.
+
+get_indicator_snapshot() keeps the latest indicators for the store, rebuilt
+when its files change, and its version keys everything derived from the
+store (e.g. the portfolio optimizer's return estimates); the advisor takes each stock's risk tier from the
+measured volatility (VOLATILITY_TIERS) and falls back to the universe file's
+label for tickers without price history.
+
+    python price_store.py import
+    python price_store.py indicators --benchmark SPY
+"""
+
+import argparse
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backtest import OHLCV_DIR, TRADING_DAYS, load_ohlcv_csv
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "price_store")
+FIELDS = ("day", "open", "high", "low", "close", "volume")
+DEFAULT_BENCHMARK = "SPY"
+# Trading days of history the indicators look at (covers the 200-day average)
+INDICATOR_WINDOW = 260
+MOVING_AVERAGES = (20, 50, 200)
+VOLATILITY_DAYS = 63
+# Annualized volatility ceilings of each risk tier; anything above is Aggressive
+VOLATILITY_TIERS = (("Conservative", 0.22), ("Moderate", 0.35))
+# Seconds between checks of the store directory for changes
+RELOAD_CHECK_INTERVAL = 5.0
+
+def risk_tier(volatility: float) -> str:
+    for tier, ceiling in VOLATILITY_TIERS:
+        if volatility <= ceiling:
+            return tier
+    return "Aggressive"
+
+class PriceStore:
+    """
+    Directory of per-ticker .npy OHLCV matrices, opened memory-mapped
+    """
+
+    def __init__(self, directory: str = DEFAULT_STORE_DIR):
+        self.directory = directory
+        self._arrays = {}
+
+    def path(self, symbol: str) -> str:
+        return os.path.join(self.directory, f"{symbol.upper()}.npy")
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(self.directory) if name.endswith(".npy"))
+
+    def signature(self) -> Tuple:
+        """Changes whenever a ticker file is added, removed or rewritten"""
+        if not os.path.isdir(self.directory):
+            return ()
+        return tuple(sorted((entry.name, entry.stat().st_mtime_ns) for entry in os.scandir(self.directory)
+                            if entry.name.endswith(".npy")))
+
+    def import_csv(self, symbol: str, csv_path: str) -> int:
+        """Convert a CSV dump into the ticker's .npy file; returns the number of rows"""
+        series = load_ohlcv_csv(csv_path)
+        matrix = np.column_stack([series["date"].astype("datetime64[D]").astype(np.int64).astype(float)]
+                                 + [series[field] for field in FIELDS[1:]])
+        os.makedirs(self.directory, exist_ok=True)
+        # write then rename so readers never map a half-written file
+        temporary = self.path(symbol) + ".tmp"
+        with open(temporary, "wb") as f:
+            np.save(f, matrix)
+        os.replace(temporary, self.path(symbol))
+        self._arrays.pop(symbol.upper(), None)
+        return len(matrix)
+
+    def import_dir(self, ohlcv_dir: str = OHLCV_DIR, symbols: Optional[List[str]] = None) -> Dict[str, int]:
+        """Import every CSV dump (or the given symbols) that is newer than its .npy file"""
+        imported = {}
+        if not os.path.isdir(ohlcv_dir):
+            return imported
+        for name in sorted(os.listdir(ohlcv_dir)):
+            symbol, extension = os.path.splitext(name)
+            symbol = symbol.upper()
+            if extension.lower() != ".csv" or (symbols and symbol not in symbols):
+                continue
+            csv_path = os.path.join(ohlcv_dir, name)
+            target = self.path(symbol)
+            if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(csv_path):
+                continue
+            imported[symbol] = self.import_csv(symbol, csv_path)
+        return imported
+
+    def load(self, symbol: str) -> Optional[np.ndarray]:
+        """The ticker's (rows, len(FIELDS)) matrix, memory-mapped read-only"""
+        symbol = symbol.upper()
+        cached = self._arrays.get(symbol)
+        path = self.path(symbol)
+        if not os.path.exists(path):
+            return None
+        mtime = os.path.getmtime(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, np.load(path, mmap_mode="r"))
+            self._arrays[symbol] = cached
+        return cached[1]
+
+    def close_panel(self, symbols: List[str], window: int = INDICATOR_WINDOW) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        (day numbers, symbols found, closes) with closes shaped (days, symbols) on the
+        union of the symbols' last `window` trading days, NaN where a ticker has no row
+        """
+        arrays = {}
+        for symbol in symbols:
+            matrix = self.load(symbol)
+            if matrix is not None and len(matrix):
+                arrays[symbol.upper()] = matrix[-window:]
+        if not arrays:
+            return np.empty(0), [], np.empty((0, 0))
+        days = np.unique(np.concatenate([matrix[:, 0] for matrix in arrays.values()]))[-window:]
+        closes = np.full((len(days), len(arrays)), np.nan)
+        close_column = FIELDS.index("close")
+        for column, matrix in enumerate(arrays.values()):
+            keep = matrix[:, 0] >= days[0]
+            closes[np.searchsorted(days, matrix[keep, 0]), column] = matrix[keep, close_column]
+        return days, list(arrays), closes
+
+def compute_indicators(closes: np.ndarray, benchmark: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    Indicators for every column of a (days, symbols) close matrix at its last row.
+    `benchmark` is the market's close series on the same days; without it the
+    equal-weight average of the columns stands in for the market.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = np.diff(np.log(closes), axis=0)
+        latest = closes[-1]
+        indicators = {"close": latest}
+        for days in MOVING_AVERAGES:
+            average = np.nanmean(closes[-days:], axis=0) if len(closes) >= days else np.full(closes.shape[1], np.nan)
+            indicators[f"sma_{days}"] = average
+            indicators[f"vs_sma_{days}"] = latest / average - 1
+        recent = returns[-VOLATILITY_DAYS:]
+        observed = np.isfinite(recent).sum(axis=0)
+        volatility = np.nanstd(recent, axis=0, ddof=1) * np.sqrt(TRADING_DAYS)
+        indicators["volatility"] = np.where(observed > 1, volatility, np.nan)
+
+        running_peak = np.fmax.accumulate(closes, axis=0)
+        drawdowns = closes / running_peak - 1
+        indicators["max_drawdown"] = np.nanmin(drawdowns, axis=0)
+        indicators["drawdown"] = drawdowns[-1]
+
+        if benchmark is not None:
+            market = np.diff(np.log(benchmark))
+        else:
+            market = np.nanmean(returns, axis=1)
+        mask = np.isfinite(returns) & np.isfinite(market)[:, None]
+        count = mask.sum(axis=0)
+        r = np.where(mask, returns, 0.0)
+        m = np.where(mask, market[:, None], 0.0)
+        mean_r, mean_m = r.sum(axis=0) / count, m.sum(axis=0) / count
+        covariance = (r * m).sum(axis=0) / count - mean_r * mean_m
+        variance = (m * m).sum(axis=0) / count - mean_m ** 2
+        indicators["beta"] = np.where(count > 1, covariance / variance, np.nan)
+    return indicators
+
+class IndicatorSnapshot:
+    """
+    Indicators of every ticker in a store at one point in time
+    """
+
+    def __init__(self, store: PriceStore, benchmark: str = DEFAULT_BENCHMARK, version: int = 0):
+        self.store = store
+        self.version = version
+        self.signature = store.signature()
+        self.metrics: Dict[str, Dict[str, float]] = {}
+        days, symbols, closes = store.close_panel(store.symbols())
+        if not symbols:
+            return
+        market = closes[:, symbols.index(benchmark)] if benchmark in symbols else None
+        indicators = compute_indicators(closes, market)
+        self.as_of = str(np.datetime64(int(days[-1]), "D"))
+        for column, symbol in enumerate(symbols):
+            values = {name: float(array[column]) for name, array in indicators.items()}
+            self.metrics[symbol] = {name: round(value, 4) for name, value in values.items() if np.isfinite(value)}
+
+    def risk_tiers(self) -> Dict[str, str]:
+        """Risk tier per ticker with a measured volatility"""
+        return {symbol: risk_tier(metrics["volatility"]) for symbol, metrics in self.metrics.items()
+                if "volatility" in metrics}
+
+_lock = threading.Lock()
+_snapshot = None
+_checked_at = 0.0
+
+def get_indicator_snapshot() -> IndicatorSnapshot:
+    """
+    Indicators for the configured store (PRICE_STORE_DIR), recomputed when its files change
+    """
+    global _snapshot, _checked_at
+    now = time.monotonic()
+    if _snapshot is not None and now - _checked_at < RELOAD_CHECK_INTERVAL:
+        return _snapshot
+    with _lock:
+        _checked_at = now
+        store = PriceStore(os.getenv("PRICE_STORE_DIR", DEFAULT_STORE_DIR))
+        if _snapshot is None or store.signature() != _snapshot.signature:
+            version = _snapshot.version + 1 if _snapshot is not None else 1
+            _snapshot = IndicatorSnapshot(store, os.getenv("PRICE_BENCHMARK", DEFAULT_BENCHMARK), version)
+        return _snapshot
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local OHLCV store and technical indicators")
+    parser.add_argument("--store", default=os.getenv("PRICE_STORE_DIR", DEFAULT_STORE_DIR))
+    sub = parser.add_subparsers(dest="command", required=True)
+    importer = sub.add_parser("import", help="Import CSV dumps that changed since the last import")
+    importer.add_argument("symbols", nargs="*")
+    importer.add_argument("--ohlcv-dir", default=OHLCV_DIR)
+    report = sub.add_parser("indicators", help="Print indicators and measured risk tiers")
+    report.add_argument("--benchmark", default=os.getenv("PRICE_BENCHMARK", DEFAULT_BENCHMARK))
+    args = parser.parse_args(argv)
+
+    store = PriceStore(args.store)
+    if args.command == "import":
+        started = time.monotonic()
+        imported = store.import_dir(args.ohlcv_dir, [s.upper() for s in args.symbols] or None)
+        print(f"✅ Imported {len(imported)} tickers ({sum(imported.values())} rows) in {time.monotonic() - started:.1f}s")
+        return
+    started = time.perf_counter()
+    snapshot = IndicatorSnapshot(store, args.benchmark.upper())
+    elapsed = (time.perf_counter() - started) * 1000
+    tiers = snapshot.risk_tiers()
+    for symbol, metrics in sorted(snapshot.metrics.items()):
+        print(f"{symbol:<8} vol {metrics.get('volatility', float('nan')):6.1%}  beta {metrics.get('beta', float('nan')):5.2f}  "
+              f"maxDD {metrics.get('max_drawdown', float('nan')):7.1%}  vs SMA200 {metrics.get('vs_sma_200', float('nan')):+6.1%}  "
+              f"{tiers.get(symbol, '-')}")
+    print(f"📈 {len(snapshot.metrics)} tickers in {elapsed:.0f}ms")
+
+if __name__ == "__main__":
+    main()
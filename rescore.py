@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Incremental rescoring of stored news after a lexicon change
+
+Every NewsItem records the lexicon_version that produced its sentiment and
+score. The rescorer walks rows whose version differs from the current one in
+id order, rescores each batch with the batch API and writes the results back
+with one bulk UPDATE per batch. It sleeps between batches so it can run next
+to live traffic, and because it only selects stale rows an interrupted run
+simply picks up where it left off.
+
+    python rescore.py --batch-size 500 --sleep 0.2
+"""
+
+import argparse
+import contextlib
+import logging
+import sys
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import bindparam, or_
+
+from models import db, NewsItem
+from sentiment import analyze_texts, lexicon_version, SCORERS
+from sectors import news_sectors, update_sector_sentiment
+from sentiment_index import update_index
+from strategy import get_strategy_rules
+from watermark import bump_watermark
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_SLEEP = 0.5
+
+def stale_rows_query(version: str):
+    return NewsItem.query.filter(or_(NewsItem.lexicon_version.is_(None), NewsItem.lexicon_version != version))
+
+class NewsRescorer:
+    """
+    Rescores NewsItem rows whose lexicon_version is out of date
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, sleep: float = DEFAULT_SLEEP,
+                 scorer: Optional[str] = None, backend: Optional[str] = None):
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self.scorer = scorer
+        self.backend = backend
+        self.version = lexicon_version(scorer)
+        self.last_id = 0
+        self.rescored = 0
+        self.changed = 0
+        self._stop = threading.Event()
+
+    def remaining(self) -> int:
+        return stale_rows_query(self.version).count()
+
+    def rescore_batch(self) -> int:
+        """
+        Rescore the next batch of stale rows after `last_id`.
+        Returns the number of rows updated (0 when nothing is left).
+        """
+        rows = (db.session.query(NewsItem.id, NewsItem.title, NewsItem.description, NewsItem.sentiment,
+                                 NewsItem.published_at, NewsItem.region)
+                .filter(NewsItem.id > self.last_id)
+                .filter(or_(NewsItem.lexicon_version.is_(None), NewsItem.lexicon_version != self.version))
+                .order_by(NewsItem.id)
+                .limit(self.batch_size)
+                .all())
+        if not rows:
+            return 0
+
+        texts = [(title or "") + ". " + (description or "") for _, title, description, _, _, _ in rows]
+        labels, scores = analyze_texts(texts, backend=self.backend, scorer=self.scorer)
+        rules = get_strategy_rules()
+        updates = []
+        moved = []
+        for (news_id, _, _, old_label, published_at, region), label, score in zip(rows, labels, scores):
+            updates.append({"_id": news_id, "sentiment": str(label), "score": float(score),
+                            "lexicon_version": self.version,
+                            "advice": rules.advise(str(label), float(score), region)})
+            if old_label != label:
+                self.changed += 1
+                moved.append((news_id, published_at, region, old_label, str(label)))
+
+        table = NewsItem.__table__
+        statement = (table.update()
+                     .where(table.c.id == bindparam("_id"))
+                     .values(sentiment=bindparam("sentiment"), score=bindparam("score"),
+                             lexicon_version=bindparam("lexicon_version"), advice=bindparam("advice")))
+        db.session.execute(statement, updates)
+        # move changed labels between sentiment index and sector counts
+        update_index(change for _, published_at, region, old_label, label in moved
+                     for change in ((published_at, region, old_label, -1), (published_at, region, label, 1)))
+        sectors = news_sectors([news_id for news_id, *_ in moved])
+        update_sector_sentiment(change for news_id, published_at, _, old_label, label in moved if news_id in sectors
+                                for change in ((published_at, sectors[news_id], old_label, -1),
+                                               (published_at, sectors[news_id], label, 1)))
+        # labels changed under cached views (e.g. /ai-advisor)
+        bump_watermark()
+        db.session.commit()
+
+        self.last_id = rows[-1][0]
+        self.rescored += len(rows)
+        return len(rows)
+
+    def run(self, max_batches: Optional[int] = None):
+        """
+        Rescore until no stale rows remain, `max_batches` is reached or stop() is called
+        """
+        batches = 0
+        while not self._stop.is_set():
+            if max_batches is not None and batches >= max_batches:
+                break
+            if not self.rescore_batch():
+                break
+            batches += 1
+            logger.info(f"Rescored {self.rescored} rows to lexicon {self.version} ({self.changed} labels changed)")
+            if self.sleep:
+                self._stop.wait(self.sleep)
+        return self.rescored
+
+    def stop(self):
+        self._stop.set()
+
+def start_background_rescore(app, batch_size: int = DEFAULT_BATCH_SIZE, sleep: float = DEFAULT_SLEEP) -> NewsRescorer:
+    """
+    Run a NewsRescorer in a daemon thread inside the app context
+    """
+    with app.app_context():
+        rescorer = NewsRescorer(batch_size=batch_size, sleep=sleep)
+
+    def worker():
+        with app.app_context():
+            try:
+                rescorer.run()
+                if rescorer.rescored:
+                    logger.info(f"Background rescoring finished: {rescorer.rescored} rows, {rescorer.changed} labels changed")
+            except Exception as e:
+                logger.error(f"Background rescoring stopped: {e}")
+            finally:
+                db.session.remove()
+
+    threading.Thread(target=worker, name="lexicon-rescore", daemon=True).start()
+    return rescorer
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rescore stored news whose lexicon version is out of date")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--sleep", type=float, default=DEFAULT_SLEEP, help="Seconds to pause between batches")
+    parser.add_argument("--max-batches", type=int, help="Stop after this many batches")
+    parser.add_argument("--scorer", choices=SCORERS)
+    parser.add_argument("--backend", choices=["scalar", "vectorized"])
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        from app import app
+    with app.app_context():
+        rescorer = NewsRescorer(batch_size=args.batch_size, sleep=args.sleep,
+                                scorer=args.scorer, backend=args.backend)
+        print(f"🔁 Rescoring {rescorer.remaining()} rows to lexicon {rescorer.version}")
+        started = time.monotonic()
+        try:
+            rescorer.run(max_batches=args.max_batches)
+        except KeyboardInterrupt:
+            print("⏸️  Interrupted; rerun to resume")
+        elapsed = max(time.monotonic() - started, 1e-9)
+        print(f"✅ Rescored {rescorer.rescored} rows ({rescorer.changed} labels changed) in {elapsed:.1f}s, "
+              f"{rescorer.remaining()} remaining")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
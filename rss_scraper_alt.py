@@ -6,6 +6,60 @@ from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+def parse_rss_item(item) -> Optional[Dict]:
+    """
+    Convert a single RSS <item> element into an article dict, or None if it
+    lacks a title or link
+    """
+    article = {}
+
+    # Extract title
+    title_elem = item.find('title')
+    if title_elem is not None:
+        article['title'] = title_elem.text.strip() if title_elem.text else ''
+
+    # Extract description
+    desc_elem = item.find('description')
+    if desc_elem is not None:
+        article['description'] = desc_elem.text.strip() if desc_elem.text else ''
+
+    # Extract link
+    link_elem = item.find('link')
+    if link_elem is not None:
+        article['url'] = link_elem.text.strip() if link_elem.text else ''
+
+    # Extract publication date
+    pub_date_elem = item.find('pubDate')
+    if pub_date_elem is not None and pub_date_elem.text:
+        try:
+            # Parse common date formats
+            date_str = pub_date_elem.text.strip()
+            # Try different date formats
+            for fmt in ['%a, %d %b %Y %H:%M:%S %z', '%a, %d %b %Y %H:%M:%S %Z']:
+                try:
+                    article['publishedAt'] = datetime.strptime(date_str, fmt)
+                    break
+                except ValueError:
+                    continue
+            else:
+                article['publishedAt'] = datetime.utcnow()
+        except Exception as e:
+            logger.warning(f"Could not parse date: {e}")
+            article['publishedAt'] = datetime.utcnow()
+    else:
+        article['publishedAt'] = datetime.utcnow()
+
+    # Extract source
+    source_elem = item.find('source')
+    if source_elem is not None:
+        article['source'] = source_elem.text.strip() if source_elem.text else 'RSS Feed'
+    else:
+        article['source'] = 'RSS Feed'
+
+    if article.get('title') and article.get('url'):
+        return article
+    return None
+
 def parse_rss_feed(url: str) -> List[Dict]:
     """
     Parse RSS feed using xml.etree instead of feedparser
@@ -24,52 +78,8 @@ def parse_rss_feed(url: str) -> List[Dict]:
         
         # Handle different RSS formats
         for item in root.findall('.//item'):
-            article = {}
-            
-            # Extract title
-            title_elem = item.find('title')
-            if title_elem is not None:
-                article['title'] = title_elem.text.strip() if title_elem.text else ''
-            
-            # Extract description
-            desc_elem = item.find('description')
-            if desc_elem is not None:
-                article['description'] = desc_elem.text.strip() if desc_elem.text else ''
-            
-            # Extract link
-            link_elem = item.find('link')
-            if link_elem is not None:
-                article['url'] = link_elem.text.strip() if link_elem.text else ''
-            
-            # Extract publication date
-            pub_date_elem = item.find('pubDate')
-            if pub_date_elem is not None and pub_date_elem.text:
-                try:
-                    # Parse common date formats
-                    date_str = pub_date_elem.text.strip()
-                    # Try different date formats
-                    for fmt in ['%a, %d %b %Y %H:%M:%S %z', '%a, %d %b %Y %H:%M:%S %Z']:
-                        try:
-                            article['publishedAt'] = datetime.strptime(date_str, fmt)
-                            break
-                        except ValueError:
-                            continue
-                    else:
-                        article['publishedAt'] = datetime.utcnow()
-                except Exception as e:
-                    logger.warning(f"Could not parse date: {e}")
-                    article['publishedAt'] = datetime.utcnow()
-            else:
-                article['publishedAt'] = datetime.utcnow()
-            
-            # Extract source
-            source_elem = item.find('source')
-            if source_elem is not None:
-                article['source'] = source_elem.text.strip() if source_elem.text else 'RSS Feed'
-            else:
-                article['source'] = 'RSS Feed'
-            
-            if article.get('title') and article.get('url'):
+            article = parse_rss_item(item)
+            if article:
                 articles.append(article)
         
         return articles
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+News-to-sector classification and rolling per-sector sentiment
+
+A SectorClassifier compiles sector keywords into a token-level Aho-Corasick
+automaton (the one the finance lexicon and entity extractor use) and maps
+tickers found by the entity extractor to their universe sector, so tagging an
+article is one pass over its tokens. Ambiguous single words
+(SECTOR_CONTEXT_KEYWORDS) only count in articles that also name a ticker. Tags are stored per article
+(news_sectors) and their sentiment is added to daily per-sector counters
+(sector_sentiment) in the ingest transaction. query_sector_sentiment() reads
+the last N days of those counters with one grouped query, and the advisor
+ranks sectors by it.
+
+Existing news can be tagged with:
+
+    python sectors.py reindex
+    python sectors.py show --days 7
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+
+from lexicon import AhoCorasickAutomaton, tokenize
+
+# Keywords and phrases that place an article in a sector
+SECTOR_KEYWORDS = {
+    "Technology": ["technology", "tech", "software", "semiconductor", "semiconductors", "chip", "chips",
+                   "chipmaker", "artificial intelligence", "generative ai", "ai chips", "ai models",
+                   "cloud computing", "cybersecurity", "data center", "smartphone", "smartphones", "saas",
+                   "big tech"],
+    "Healthcare": ["healthcare", "health care", "pharmaceutical", "pharma", "drugmaker", "biotech",
+                   "biotechnology", "vaccine", "vaccines", "fda", "clinical trial", "hospital", "hospitals",
+                   "medical device", "medical devices", "drug approval"],
+    "Financial Services": ["bank", "banks", "banking", "lender", "lenders", "insurer", "insurers", "brokerage",
+                           "asset manager", "fintech", "credit card", "payments", "mortgage", "mortgages",
+                           "wall street", "investment bank"],
+    "Energy": ["oil", "crude", "natural gas", "lng", "opec", "brent", "wti", "refinery", "refiners", "drilling",
+               "pipeline", "energy stocks", "energy companies", "energy prices", "petroleum", "shale"],
+    "Consumer Discretionary": ["retail sales", "retailer", "retailers", "consumer spending", "automaker",
+                               "automakers", "electric vehicle", "electric vehicles", "ev maker", "ev makers",
+                               "ev sales", "restaurant", "restaurants", "apparel", "luxury brands", "e commerce",
+                               "ecommerce", "travel demand", "travel stocks", "hotel", "hotels"],
+    "Consumer Staples": ["consumer staples", "grocery", "groceries", "supermarket", "beverage", "beverages",
+                         "packaged food", "food prices", "household products", "tobacco", "staples"],
+    "Industrials": ["industrial", "industrials", "manufacturing", "factory", "factories", "aerospace",
+                    "defense contractor", "airline", "airlines", "railroad", "freight", "logistics",
+                    "machinery", "construction"],
+    "Materials": ["steel", "copper", "aluminium", "aluminum", "mining", "miner", "miners", "chemicals",
+                  "lithium", "iron ore", "gold price", "commodities", "fertilizer"],
+    "Real Estate": ["real estate", "property market", "property developer", "property developers",
+                    "housing market", "home prices", "reit", "reits", "commercial property", "housing starts",
+                    "home sales"],
+    "Utilities": ["utilities", "utility company", "utility companies", "utility stocks", "power grid",
+                  "electricity", "power prices", "water utility", "renewable energy", "solar", "wind power",
+                  "nuclear power"],
+    "Communication Services": ["telecom", "telecoms", "wireless carrier", "broadband", "streaming",
+                               "social media", "media company", "media companies", "advertising", "5g",
+                               "video games", "entertainment"],
+}
+
+# Short or common words that name a sector but also turn up in unrelated
+# headlines ("energy" of a rally, "travel" advisories); they only tag an
+# article that also mentions a universe ticker
+SECTOR_CONTEXT_KEYWORDS = {
+    "Technology": ["ai"],
+    "Energy": ["energy"],
+    "Consumer Discretionary": ["ev", "evs", "travel", "luxury"],
+    "Real Estate": ["property", "properties"],
+    "Utilities": ["utility"],
+    "Communication Services": ["media"],
+}
+
+DEFAULT_WINDOW_DAYS = 7
+
+class SectorClassifier:
+    """
+    One-pass tagging of the sectors an article is about
+    """
+
+    def __init__(self, keywords: Dict[str, Iterable[str]], symbol_sectors: Optional[Dict[str, Set[str]]] = None,
+                 context_keywords: Optional[Dict[str, Iterable[str]]] = None):
+        """
+        keywords: sector -> keywords/phrases; symbol_sectors: ticker -> sectors it belongs to;
+        context_keywords: sector -> ambiguous keywords that need a ticker in the same article
+        """
+        self.sectors = list(dict.fromkeys(list(keywords) + list(context_keywords or {})))
+        self.symbol_sectors = symbol_sectors or {}
+        patterns = []
+        for needs_ticker, sector_map in ((False, keywords), (True, context_keywords or {})):
+            for sector, sector_keywords in sector_map.items():
+                for keyword in set(sector_keywords):
+                    tokens = tuple(tokenize(keyword))
+                    if tokens:
+                        patterns.append((tokens, (sector, needs_ticker)))
+        self.automaton = AhoCorasickAutomaton(patterns)
+
+    @classmethod
+    def from_universe(cls, stock_universe: Dict[str, Dict[str, Dict]],
+                      keywords: Dict[str, List[str]] = SECTOR_KEYWORDS,
+                      context_keywords: Dict[str, List[str]] = SECTOR_CONTEXT_KEYWORDS) -> "SectorClassifier":
+        """
+        Build from StockUniverse.sector_map() (sector -> symbol -> info)
+        """
+        symbol_sectors = {}
+        for sector, sector_stocks in stock_universe.items():
+            for symbol in sector_stocks:
+                symbol_sectors.setdefault(symbol, set()).add(sector)
+        return cls(keywords, symbol_sectors, context_keywords)
+
+    def classify(self, text: str, symbols: Iterable[str] = ()) -> Set[str]:
+        """
+        Sectors of an article; `symbols` are the tickers the entity extractor found in it
+        """
+        has_ticker = False
+        found = set()
+        for symbol in symbols:
+            if symbol in self.symbol_sectors:
+                has_ticker = True
+                found.update(self.symbol_sectors[symbol])
+        for _, _, (sector, needs_ticker) in self.automaton.search(tokenize(text or "")):
+            if has_ticker or not needs_ticker:
+                found.add(sector)
+        return found
+
+_default_classifier = None
+_classifier_universe = None
+
+def get_sector_classifier() -> SectorClassifier:
+    """Classifier for the stock universe, rebuilt when the universe is reloaded"""
+    global _default_classifier, _classifier_universe
+    from stock_universe import get_stock_universe
+    universe = get_stock_universe()
+    if _default_classifier is None or universe is not _classifier_universe:
+        _default_classifier = SectorClassifier.from_universe(universe.sector_map())
+        _classifier_universe = universe
+    return _default_classifier
+
+def _day(published_at: Optional[datetime]):
+    from market_window import to_utc_timestamp
+
+    if published_at is None:
+        return datetime.utcnow().date()
+    return datetime.utcfromtimestamp(to_utc_timestamp(published_at)).date()
+
+def update_sector_sentiment(changes: Iterable[Tuple[Optional[datetime], Iterable[str], Optional[str], int]]):
+    """
+    Apply (published_at, sectors, sentiment, delta) changes to the daily counters
+    inside the current transaction; the caller commits
+    """
+    from models import increment_counters, SectorSentiment
+
+    deltas = defaultdict(lambda: {"positive": 0, "negative": 0, "neutral": 0})
+    for published_at, sectors, sentiment, delta in changes:
+        if sentiment not in ("positive", "negative", "neutral"):
+            continue
+        day = _day(published_at)
+        for sector in sectors:
+            deltas[(sector, day)][sentiment] += delta
+    # added in SQL so concurrent ingests, backfills and rescores don't lose updates
+    rows = [{"sector": sector, "day": day, **counts} for (sector, day), counts in deltas.items()]
+    increment_counters(SectorSentiment, rows, ["positive", "negative", "neutral"])
+
+def tag_news(tagged: Iterable[Tuple[int, Iterable[str], Optional[datetime], Optional[str]]]) -> int:
+    """
+    Store (news_id, sectors, published_at, sentiment) tags and count their sentiment;
+    caller commits. Returns the number of tags written.
+    """
+    from models import db, NewsSector
+
+    tagged = [(news_id, sorted(sectors), published_at, sentiment)
+              for news_id, sectors, published_at, sentiment in tagged if sectors]
+    rows = [{"sector": sector, "news_id": news_id} for news_id, sectors, _, _ in tagged for sector in sectors]
+    if rows:
+        db.session.execute(NewsSector.__table__.insert(), rows)
+        update_sector_sentiment((published_at, sectors, sentiment, 1) for _, sectors, published_at, sentiment in tagged)
+    return len(rows)
+
+def news_sectors(news_ids: List[int]) -> Dict[int, List[str]]:
+    """Stored sector tags of the given news items"""
+    from models import db, NewsSector
+
+    sectors = defaultdict(list)
+    for i in range(0, len(news_ids), 500):
+        batch = news_ids[i:i + 500]
+        for sector, news_id in db.session.query(NewsSector.sector, NewsSector.news_id).filter(NewsSector.news_id.in_(batch)):
+            sectors[news_id].append(sector)
+    return dict(sectors)
+
+def query_sector_sentiment(days: int = DEFAULT_WINDOW_DAYS, now: Optional[datetime] = None) -> Dict[str, Dict]:
+    """
+    Sentiment of each sector's news over the last `days` days:
+    sector -> {"positive", "negative", "neutral", "total", "net"}
+    """
+    from models import db, SectorSentiment
+
+    since = ((now or datetime.utcnow()) - timedelta(days=days - 1)).date()
+    rows = (db.session.query(SectorSentiment.sector, func.sum(SectorSentiment.positive),
+                             func.sum(SectorSentiment.negative), func.sum(SectorSentiment.neutral))
+            .filter(SectorSentiment.day >= since)
+            .group_by(SectorSentiment.sector))
+    aggregates = {}
+    for sector, positive, negative, neutral in rows:
+        positive, negative, neutral = int(positive or 0), int(negative or 0), int(neutral or 0)
+        total = positive + negative + neutral
+        if total <= 0:
+            continue
+        aggregates[sector] = {"positive": positive, "negative": negative, "neutral": neutral,
+                              "total": total, "net": (positive - negative) / total}
+    return aggregates
+
+def reindex(batch_size: int = 1000) -> int:
+    """
+    Re-tag all stored news and rebuild the daily counters, in id-ordered batches
+    """
+    from entities import get_entity_extractor
+    from models import db, NewsItem, NewsSector, SectorSentiment
+
+    db.session.query(NewsSector).delete()
+    db.session.query(SectorSentiment).delete()
+    db.session.commit()
+    classifier = get_sector_classifier()
+    extractor = get_entity_extractor()
+    last_id = 0
+    tags = 0
+    while True:
+        rows = (db.session.query(NewsItem.id, NewsItem.title, NewsItem.description,
+                                 NewsItem.published_at, NewsItem.sentiment)
+                .filter(NewsItem.id > last_id).order_by(NewsItem.id).limit(batch_size).all())
+        if not rows:
+            break
+        tagged = []
+        for news_id, title, description, published_at, sentiment in rows:
+            text = (title or "") + ". " + (description or "")
+            tagged.append((news_id, classifier.classify(text, extractor.extract(text)), published_at, sentiment))
+        tags += tag_news(tagged)
+        db.session.commit()
+        last_id = rows[-1][0]
+    return tags
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sector tagging of stored news")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rebuild = sub.add_parser("reindex", help="Re-tag all stored news and rebuild sector sentiment")
+    rebuild.add_argument("--batch-size", type=int, default=1000)
+    show = sub.add_parser("show", help="Print rolling sentiment per sector")
+    show.add_argument("--days", type=int, default=DEFAULT_WINDOW_DAYS)
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        from app import app
+    with app.app_context():
+        if args.command == "reindex":
+            started = time.monotonic()
+            tags = reindex(batch_size=args.batch_size)
+            print(f"✅ Wrote {tags} sector tags in {time.monotonic() - started:.1f}s")
+        else:
+            aggregates = query_sector_sentiment(days=args.days)
+            for sector, stats in sorted(aggregates.items(), key=lambda item: item[1]["net"], reverse=True):
+                print(f"{stats['net']:+.2f}  {sector:<24} {stats['total']:>6} articles "
+                      f"({stats['positive']} positive, {stats['negative']} negative)")
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,76 @@
+import atexit
+import hashlib
 import logging
+import os
 import re
-from collections import Counter
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Simple sentiment analysis using keyword matching
-def analyze_text(text):
+# Sentiment keywords, compiled once at import
+POSITIVE_WORDS = frozenset([
+    'positive', 'good', 'great', 'excellent', 'strong', 'growth', 'profit', 'gain',
+    'rise', 'increase', 'up', 'higher', 'better', 'success', 'win', 'bullish',
+    'optimistic', 'recovery', 'surge', 'rally', 'boom', 'thrive', 'flourish'
+])
+
+NEGATIVE_WORDS = frozenset([
+    'negative', 'bad', 'poor', 'weak', 'loss', 'decline', 'fall', 'down', 'lower',
+    'worse', 'fail', 'crash', 'bearish', 'pessimistic', 'recession', 'drop',
+    'plunge', 'collapse', 'struggle', 'suffer', 'downturn'
+])
+
+# Scoring engine: 'keyword' (the word lists below), 'finance' (weighted
+# phrase lexicon from data/finance_lexicon.csv, see lexicon.py) or 'model'
+# (trained hashed naive Bayes, see sentiment_model.py)
+SCORERS = ("keyword", "finance", "model")
+SENTIMENT_SCORER = os.getenv("SENTIMENT_SCORER", "keyword")
+
+# Batch scoring backend: 'scalar' (pure Python) or 'vectorized' (NumPy)
+BACKENDS = ("scalar", "vectorized")
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "scalar")
+VECTOR_BATCH_SIZE = 5000
+
+# Memoized results: in-process LRU entries, plus an optional SQLite file that
+# survives restarts (set SENTIMENT_CACHE_PATH to an empty string to disable it).
+# Relative paths are anchored on the project directory, so the app, CLIs and
+# workers share one cache whatever directory they are started from.
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "10000"))
+SENTIMENT_CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH", os.path.join("instance", "sentiment_cache.db"))
+if SENTIMENT_CACHE_PATH:
+    SENTIMENT_CACHE_PATH = os.path.join(_PROJECT_DIR, SENTIMENT_CACHE_PATH)
+
+# word -> +1 (positive) / -1 (negative)
+LEXICON = {**{word: 1 for word in POSITIVE_WORDS}, **{word: -1 for word in NEGATIVE_WORDS}}
+
+# Matches only whole-word lexicon hits, so the scorer never materializes the
+# other tokens of the text. Equivalent to tokenizing with \b\w+\b and looking
+# every token up in LEXICON.
+_LEXICON_RE = re.compile(r'\b(?:' + '|'.join(sorted(LEXICON, key=len, reverse=True)) + r')\b')
+
+def _label_counts(positive_count, negative_count):
     """
-    Returns (label, score) where label is 'positive'|'neutral'|'negative' and score is confidence.
-    Uses simple keyword-based analysis instead of transformers to avoid deployment issues.
+    Map positive/negative keyword counts to (label, score)
     """
-    if not text:
-        return "neutral", 0.5
-    
-    # Convert to lowercase for analysis
-    text_lower = text.lower()
-    
-    # Define sentiment keywords
-    positive_words = [
-        'positive', 'good', 'great', 'excellent', 'strong', 'growth', 'profit', 'gain',
-        'rise', 'increase', 'up', 'higher', 'better', 'success', 'win', 'bullish',
-        'optimistic', 'recovery', 'surge', 'rally', 'boom', 'thrive', 'flourish'
-    ]
-    
-    negative_words = [
-        'negative', 'bad', 'poor', 'weak', 'loss', 'decline', 'fall', 'down', 'lower',
-        'worse', 'fail', 'crash', 'bearish', 'pessimistic', 'recession', 'drop',
-        'plunge', 'collapse', 'struggle', 'suffer', 'decline', 'downturn'
-    ]
-    
-    # Count occurrences
-    words = re.findall(r'\b\w+\b', text_lower)
-    word_count = Counter(words)
-    
-    positive_count = sum(word_count[word] for word in positive_words)
-    negative_count = sum(word_count[word] for word in negative_words)
-    
     total_sentiment_words = positive_count + negative_count
-    
+
     if total_sentiment_words == 0:
         return "neutral", 0.5
-    
+
     # Calculate sentiment score
     if positive_count > negative_count:
         sentiment = "positive"
@@ -53,8 +81,373 @@ def analyze_text(text):
     else:
         sentiment = "neutral"
         score = 0.5
-    
+
     # Ensure score is between 0.1 and 0.9
     score = max(0.1, min(0.9, score))
-    
-    return sentiment, score
\ No newline at end of file
+
+    return sentiment, score
+
+def count_sentiment_words(text):
+    """
+    Return (positive_count, negative_count) for a text in a single pass
+    """
+    positive_count = negative_count = 0
+    for word in _LEXICON_RE.findall(text.lower()):
+        if LEXICON[word] > 0:
+            positive_count += 1
+        else:
+            negative_count += 1
+    return positive_count, negative_count
+
+def _resolve_scorer(scorer):
+    scorer = scorer or SENTIMENT_SCORER
+    if scorer not in SCORERS:
+        raise ValueError(f"Unknown sentiment scorer '{scorer}', expected one of {', '.join(SCORERS)}")
+    return scorer
+
+_KEYWORD_VERSION = "keyword-" + hashlib.sha1(repr(sorted(LEXICON.items())).encode("utf-8")).hexdigest()[:12]
+
+def lexicon_version(scorer=None):
+    """
+    Identifier of the word lists (or model weights) behind a scorer; changes whenever they do
+    """
+    scorer = _resolve_scorer(scorer)
+    if scorer == "finance":
+        from lexicon import get_finance_lexicon
+        return get_finance_lexicon().version
+    if scorer == "model":
+        from sentiment_model import get_sentiment_model
+        return get_sentiment_model().version
+    return _KEYWORD_VERSION
+
+def _score_text(text, scorer):
+    if scorer == "finance":
+        from lexicon import get_finance_lexicon
+        return _label_counts(*get_finance_lexicon().weigh(text))
+    if scorer == "model":
+        from sentiment_model import get_sentiment_model
+        labels, scores = get_sentiment_model().predict([text])
+        return str(labels[0]), float(scores[0])
+    return _label_counts(*count_sentiment_words(text))
+
+def cache_key(text, version):
+    """
+    Hash of the normalized text (lowercased, whitespace collapsed) and the
+    lexicon version. Normalization never changes the word tokens, so equal
+    keys always mean equal results.
+    """
+    normalized = " ".join(text.lower().split())
+    return hashlib.blake2b(f"{version}\0{normalized}".encode("utf-8"), digest_size=16).hexdigest()
+
+class SentimentCache:
+    """
+    Bounded LRU of (label, score) results with an optional persistent SQLite
+    layer. New entries are written to disk in batches of `flush_every`.
+    """
+
+    def __init__(self, maxsize: int = SENTIMENT_CACHE_SIZE, path: Optional[str] = None, flush_every: int = 256):
+        self.maxsize = maxsize
+        self.path = path
+        self.flush_every = flush_every
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+                self._conn.execute("CREATE TABLE IF NOT EXISTS sentiment_cache "
+                                   "(key TEXT PRIMARY KEY, label TEXT NOT NULL, score REAL NOT NULL)")
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Persistent sentiment cache disabled ({path}): {e}")
+                self._conn = None
+
+    def get(self, key) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            if self._conn is not None:
+                row = self._conn.execute("SELECT label, score FROM sentiment_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    result = (row[0], row[1])
+                    self._remember(key, result)
+                    self.persistent_hits += 1
+                    return result
+            self.misses += 1
+            return None
+
+    def put(self, key, result: Tuple[str, float]):
+        with self._lock:
+            self._remember(key, result)
+            if self._conn is not None:
+                self._pending[key] = result
+                if len(self._pending) >= self.flush_every:
+                    self._flush_locked()
+
+    def _remember(self, key, result):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _flush_locked(self):
+        if not self._pending or self._conn is None:
+            return
+        try:
+            self._conn.executemany("INSERT OR REPLACE INTO sentiment_cache (key, label, score) VALUES (?, ?, ?)",
+                                   [(key, label, score) for key, (label, score) in self._pending.items()])
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not persist sentiment cache entries: {e}")
+        self._pending.clear()
+
+    def flush(self):
+        """Write pending entries to the persistent store"""
+        with self._lock:
+            self._flush_locked()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self.hits = self.persistent_hits = self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.persistent_hits) / lookups if lookups else 0.0,
+            "persistent": self._conn is not None
+        }
+
+_sentiment_cache = None
+_sentiment_cache_lock = threading.Lock()
+
+def get_sentiment_cache() -> Optional[SentimentCache]:
+    """Process-wide result cache, or None when SENTIMENT_CACHE_SIZE is 0"""
+    global _sentiment_cache
+    if SENTIMENT_CACHE_SIZE <= 0:
+        return None
+    if _sentiment_cache is None:
+        with _sentiment_cache_lock:
+            if _sentiment_cache is None:
+                _sentiment_cache = SentimentCache(SENTIMENT_CACHE_SIZE, path=SENTIMENT_CACHE_PATH or None)
+                atexit.register(_sentiment_cache.flush)
+    return _sentiment_cache
+
+# Simple sentiment analysis using keyword matching
+def analyze_text(text, scorer=None):
+    """
+    Returns (label, score) where label is 'positive'|'neutral'|'negative' and score is confidence.
+    Uses simple keyword-based analysis instead of transformers to avoid deployment issues.
+    scorer: 'keyword' or 'finance' (weighted phrases with negation); defaults to SENTIMENT_SCORER.
+    Results are memoized by normalized text and lexicon version, so repeated
+    headlines skip tokenization.
+    """
+    if not text:
+        return "neutral", 0.5
+    scorer = _resolve_scorer(scorer)
+    cache = get_sentiment_cache()
+    if cache is None:
+        return _score_text(text, scorer)
+    key = cache_key(text, lexicon_version(scorer))
+    result = cache.get(key)
+    if result is None:
+        result = _score_text(text, scorer)
+        cache.put(key, result)
+    return result
+
+class VectorizedLexiconScorer:
+    """
+    NumPy implementation of the keyword scorer for large batches.
+
+    A batch is joined into one lowercase byte buffer. Word boundaries are found
+    with a byte mask and every token is hashed to a 64-bit integer ID with a
+    polynomial rolling hash computed from prefix sums, so no per-token Python
+    objects are created. Matching token IDs against the lexicon gives a sparse
+    (document, term) matrix whose row sums are the positive/negative counts.
+
+    Python's \\w is Unicode-aware while the byte mask is ASCII-only, so texts
+    containing non-ASCII characters are scored with the scalar path to keep
+    results identical.
+    """
+
+    _PRIME = 1099511628211
+    _WORD_BYTES = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_"
+
+    def __init__(self, lexicon):
+        self._mod = 2 ** 64
+        self._prime = np.uint64(self._PRIME)
+        self._inverse_prime = np.uint64(pow(self._PRIME, -1, self._mod))
+        self._powers = np.ones(1, dtype=np.uint64)
+        self._inverse_powers = np.ones(1, dtype=np.uint64)
+        self._is_word = np.zeros(256, dtype=bool)
+        self._is_word[np.frombuffer(self._WORD_BYTES, dtype=np.uint8)] = True
+
+        words = sorted(lexicon)
+        hashes = np.array([self._hash_word(word) for word in words], dtype=np.uint64)
+        order = np.argsort(hashes)
+        self._term_ids = hashes[order]
+        polarity = np.array([lexicon[words[i]] for i in order], dtype=np.int8)
+        self._positive_terms = polarity > 0
+        self._min_len = min(len(word) for word in words)
+        self._max_len = max(len(word) for word in words)
+
+    @staticmethod
+    def _grow(table, base, n):
+        """Extend a table of base**i (mod 2**64) to at least n entries"""
+        if len(table) >= n:
+            return table
+        size = max(n, 2 * len(table))
+        grown = np.full(size, base, dtype=np.uint64)
+        grown[0] = 1
+        with np.errstate(over="ignore"):
+            return np.cumprod(grown, dtype=np.uint64)
+
+    def _hash_word(self, word):
+        value = 0
+        for i, byte in enumerate(word.encode("ascii")):
+            value = (value + (byte + 1) * pow(self._PRIME, i, self._mod)) % self._mod
+        return value
+
+    def token_hashes(self, buffer):
+        """
+        Return (token_starts, token_hashes) for all word tokens in a byte buffer
+        whose length is within the lexicon's word-length range
+        """
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        n = len(data)
+        self._powers = self._grow(self._powers, self._prime, n)
+        self._inverse_powers = self._grow(self._inverse_powers, self._inverse_prime, n)
+
+        # prefix[i] = sum((byte[k] + 1) * P**k for k < i), wrapping mod 2**64
+        prefix = np.zeros(n + 1, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            np.cumsum((data.astype(np.uint64) + np.uint64(1)) * self._powers[:n], out=prefix[1:])
+
+        # Token edges are where the word-character mask flips
+        mask = np.zeros(n + 2, dtype=bool)
+        mask[1:-1] = self._is_word[data]
+        edges = np.flatnonzero(mask[1:] != mask[:-1])
+        starts, ends = edges[0::2], edges[1::2]
+        lengths = ends - starts
+        keep = (lengths >= self._min_len) & (lengths <= self._max_len)
+        starts, ends = starts[keep], ends[keep]
+
+        # Normalize by P**start so a token hashes the same wherever it occurs
+        with np.errstate(over="ignore"):
+            hashes = (prefix[ends] - prefix[starts]) * self._inverse_powers[starts]
+        return starts, hashes
+
+    def count(self, texts):
+        """
+        Return (positive_counts, negative_counts) arrays for a list of texts
+        """
+        n = len(texts)
+        ascii_texts = [text if text and text.isascii() else "" for text in texts]
+        lengths = np.fromiter(map(len, ascii_texts), dtype=np.int64, count=n)
+        doc_starts = np.zeros(n, dtype=np.int64)
+        np.cumsum(lengths[:-1] + 1, out=doc_starts[1:])
+
+        starts, hashes = self.token_hashes(" ".join(ascii_texts).lower().encode("ascii"))
+        term_index = np.searchsorted(self._term_ids, hashes)
+        term_index[term_index == len(self._term_ids)] = 0
+        hits = self._term_ids[term_index] == hashes
+
+        # Sparse document-term matrix in coordinate form: (doc_ids[i], term_index[i])
+        doc_ids = np.searchsorted(doc_starts, starts[hits], side="right") - 1
+        positive = self._positive_terms[term_index[hits]]
+        positive_counts = np.bincount(doc_ids[positive], minlength=n)
+        negative_counts = np.bincount(doc_ids[~positive], minlength=n)
+
+        for i, text in enumerate(texts):
+            if text and not text.isascii():
+                positive_counts[i], negative_counts[i] = count_sentiment_words(text)
+        return positive_counts, negative_counts
+
+    def score(self, texts):
+        """
+        Vectorized equivalent of _label_counts over a batch.
+        Returns (labels, scores) as NumPy arrays.
+        """
+        positive_counts, negative_counts = self.count(texts)
+        total = positive_counts + negative_counts
+        # 0 = neutral, 1 = positive, 2 = negative
+        codes = np.where(positive_counts > negative_counts, 1,
+                         np.where(negative_counts > positive_counts, 2, 0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.maximum(positive_counts, negative_counts) / total
+        scores = np.where(codes > 0, np.clip(ratio, 0.1, 0.9), 0.5)
+        labels = np.array(["neutral", "positive", "negative"], dtype=object)[codes]
+        return labels, scores
+
+_vectorized_scorer = None
+
+def _get_vectorized_scorer():
+    global _vectorized_scorer
+    if _vectorized_scorer is None:
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("The vectorized sentiment backend requires numpy")
+        _vectorized_scorer = VectorizedLexiconScorer(LEXICON)
+    return _vectorized_scorer
+
+def analyze_texts(texts: Iterable[str], backend: str = None, scorer: str = None) -> Tuple[List[str], array]:
+    """
+    Batch variant of analyze_text.
+    Returns (labels, scores) where labels[i], scores[i] correspond to texts[i].
+    backend: 'scalar' (default, list + float array) or 'vectorized'
+    (NumPy arrays, for large batches); defaults to SENTIMENT_BACKEND.
+    The vectorized backend implements the keyword scorer only; the finance
+    scorer always runs on the scalar path and the model scorer is always
+    batched matrix ops. Batch scoring bypasses the result cache, which is
+    meant for the one-at-a-time ingestion path.
+    """
+    backend = backend or SENTIMENT_BACKEND
+    scorer = _resolve_scorer(scorer)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown sentiment backend '{backend}', expected one of {', '.join(BACKENDS)}")
+
+    if scorer == "model":
+        from sentiment_model import get_sentiment_model
+        model = get_sentiment_model()
+        texts = [text or "" for text in texts]
+        if not texts:
+            return np.array([], dtype=object), np.array([], dtype=float)
+        batches = [model.predict(texts[i:i + VECTOR_BATCH_SIZE])
+                   for i in range(0, len(texts), VECTOR_BATCH_SIZE)]
+        labels = np.concatenate([labels for labels, _ in batches])
+        scores = np.concatenate([scores for _, scores in batches])
+        # Empty texts stay neutral, as with the other scorers
+        empty = np.array([not text for text in texts])
+        labels[empty], scores[empty] = "neutral", 0.5
+        return labels, scores
+
+    if backend == "vectorized" and scorer == "keyword":
+        scorer = _get_vectorized_scorer()
+        texts = list(texts)
+        if not texts:
+            return np.array([], dtype=object), np.array([], dtype=float)
+        batches = [scorer.score(texts[i:i + VECTOR_BATCH_SIZE])
+                   for i in range(0, len(texts), VECTOR_BATCH_SIZE)]
+        return (np.concatenate([labels for labels, _ in batches]),
+                np.concatenate([scores for _, scores in batches]))
+
+    labels = []
+    scores = array('d')
+    for text in texts:
+        label, score = _score_text(text, scorer) if text else ("neutral", 0.5)
+        labels.append(label)
+        scores.append(score)
+    return labels, scores
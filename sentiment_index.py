@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Per-region sentiment index time series
+
+For every region (plus "ALL", the aggregate of all regions) and granularity
+(hour, day) the index stores positive/negative/neutral counts per time
+bucket and an exponentially weighted moving average of the net score,
+(positive - negative) / volume.
+Empty buckets count as a net score of 0, so the EWMA decays across gaps and
+only non-empty buckets need a row.
+
+Ingestion updates the index in the same transaction as the news: each
+touched bucket is upserted and its EWMA follows from the previous bucket's,
+so an update costs O(1) (articles landing in an older bucket re-chain the
+few buckets after it). rebuild_index() recomputes everything from history
+with NumPy in one pass, which is also how bulk backfills refresh it:
+
+    python sentiment_index.py rebuild
+"""
+
+import argparse
+import contextlib
+import math
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+
+from market_window import to_utc_timestamp
+from models import db, increment_counters, NewsItem, SentimentIndexPoint
+from watermark import bump_watermark
+
+ALL_REGIONS = "ALL"
+# News whose region is literally "ALL" get their own series under this name
+# instead of merging into the all-regions aggregate
+ALL_REGION_ALIAS = "REGION-ALL"
+GRANULARITIES = {"hour": 3600, "day": 86400}
+# EWMA spans: one day of hourly buckets, one week of daily buckets; alpha = 2 / (span + 1)
+EWMA_ALPHA = {"hour": 2 / (24 + 1), "day": 2 / (7 + 1)}
+_SENTIMENT_COLUMNS = {"positive": 0, "negative": 1, "neutral": 2}
+
+def bucket_id(published_at: datetime, granularity: str) -> int:
+    return int(to_utc_timestamp(published_at) // GRANULARITIES[granularity])
+
+def bucket_datetime(bucket: int, granularity: str) -> datetime:
+    return datetime.utcfromtimestamp(bucket * GRANULARITIES[granularity])
+
+def series_region(region: Optional[str]) -> str:
+    """
+    Index series a news item's region is counted under (besides ALL_REGIONS).
+    Upper-case, like the region /api/sentiment-index is queried with.
+    """
+    region = (region or "UNKNOWN").upper()
+    return ALL_REGION_ALIAS if region == ALL_REGIONS else region
+
+def net_score(positive, negative, neutral):
+    volume = positive + negative + neutral
+    return (positive - negative) / volume if volume else 0.0
+
+def ewma(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    EWMA seeded with the first value, y[t] = alpha * x[t] + (1 - alpha) * y[t-1],
+    computed in blocks with cumulative sums (block length keeps decay**-k finite)
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.empty_like(values)
+    if not len(values):
+        return out
+    decay = 1.0 - alpha
+    if decay <= 0:
+        out[:] = values
+        return out
+    block = max(1, min(256, int(250 / max(-math.log10(decay), 1e-12))))
+    previous = values[0]
+    for start in range(0, len(values), block):
+        x = values[start:start + block]
+        steps = np.arange(len(x))
+        y = decay ** steps * (alpha * np.cumsum(x * decay ** -steps)) + decay ** (steps + 1) * previous
+        out[start:start + len(x)] = y
+        previous = y[-1]
+    return out
+
+def update_index(changes: Iterable[Tuple[Optional[datetime], Optional[str], Optional[str], int]]):
+    """
+    Apply (published_at, region, sentiment, delta) changes inside the current
+    transaction; the caller commits. Ingest passes delta=1, rescoring moves an
+    article between labels with -1/+1.
+    """
+    deltas = defaultdict(lambda: [0, 0, 0])
+    for published_at, region, sentiment, delta in changes:
+        column = _SENTIMENT_COLUMNS.get(sentiment)
+        if published_at is None or column is None:
+            continue
+        for granularity in GRANULARITIES:
+            bucket = bucket_id(published_at, granularity)
+            for key_region in (series_region(region), ALL_REGIONS):
+                deltas[(key_region, granularity, bucket)][column] += delta
+
+    earliest = {}
+    rows = []
+    for (region, granularity, bucket), (positive, negative, neutral) in deltas.items():
+        start = bucket_datetime(bucket, granularity)
+        rows.append({"region": region, "granularity": granularity, "bucket_start": start,
+                     "positive": positive, "negative": negative, "neutral": neutral})
+        series = (region, granularity)
+        earliest[series] = min(earliest.get(series, start), start)
+    # counts are added in SQL so concurrent ingests, backfills and rescores don't lose updates
+    increment_counters(SentimentIndexPoint, rows, ["positive", "negative", "neutral"])
+
+    for (region, granularity), start in earliest.items():
+        _rechain(region, granularity, start)
+
+def _rechain(region: str, granularity: str, start: datetime):
+    """Recompute the EWMA of every bucket from `start` on, seeded by the bucket before it"""
+    alpha = EWMA_ALPHA[granularity]
+    # populate_existing: the counts were just changed in SQL under any points this session already holds
+    series = (SentimentIndexPoint.query.filter_by(region=region, granularity=granularity)
+              .execution_options(populate_existing=True))
+    previous = (series.filter(SentimentIndexPoint.bucket_start < start)
+                .order_by(SentimentIndexPoint.bucket_start.desc()).first())
+    last_bucket = bucket_id(previous.bucket_start, granularity) if previous else None
+    last_ewma = previous.ewma if previous else None
+    for point in series.filter(SentimentIndexPoint.bucket_start >= start).order_by(SentimentIndexPoint.bucket_start):
+        score = net_score(point.positive, point.negative, point.neutral)
+        bucket = bucket_id(point.bucket_start, granularity)
+        if last_ewma is None:
+            point.ewma = score
+        else:
+            point.ewma = alpha * score + (1 - alpha) ** (bucket - last_bucket) * last_ewma
+        last_bucket, last_ewma = bucket, point.ewma
+
+def rebuild_index(batch_size: int = 10000) -> int:
+    """
+    Recompute the whole index from stored news with vectorized bucketing and EWMA.
+    Returns the number of index rows written. Bumps the news watermark so clients
+    revalidating /api/sentiment-index see the rebuilt series.
+    """
+    timestamps, regions, sentiments = [], [], []
+    rows = (db.session.query(NewsItem.published_at, NewsItem.region, NewsItem.sentiment)
+            .filter(NewsItem.published_at.isnot(None))
+            .yield_per(batch_size))
+    for published_at, region, sentiment in rows:
+        column = _SENTIMENT_COLUMNS.get(sentiment)
+        if column is None:
+            continue
+        timestamps.append(to_utc_timestamp(published_at))
+        regions.append(series_region(region))
+        sentiments.append(column)
+
+    db.session.query(SentimentIndexPoint).delete()
+    if not timestamps:
+        bump_watermark()
+        db.session.commit()
+        return 0
+
+    timestamps = np.array(timestamps)
+    sentiments = np.array(sentiments)
+    region_names, region_codes = np.unique(np.array(regions, dtype=object).astype(str), return_inverse=True)
+    points = []
+    for granularity, seconds in GRANULARITIES.items():
+        buckets = (timestamps // seconds).astype(np.int64)
+        series_list = [(name, region_codes == code) for code, name in enumerate(region_names)]
+        series_list.append((ALL_REGIONS, np.ones(len(buckets), dtype=bool)))
+        for region, mask in series_list:
+            region_buckets = buckets[mask]
+            first = region_buckets.min()
+            span = region_buckets.max() - first + 1
+            counts = np.zeros((3, span), dtype=np.int64)
+            np.add.at(counts, (sentiments[mask], region_buckets - first), 1)
+            volume = counts.sum(axis=0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = np.where(volume > 0, (counts[0] - counts[1]) / volume, 0.0)
+            smoothed = ewma(scores, EWMA_ALPHA[granularity])
+            for offset in np.flatnonzero(volume):
+                points.append({
+                    "region": region,
+                    "granularity": granularity,
+                    "bucket_start": bucket_datetime(int(first + offset), granularity),
+                    "positive": int(counts[0, offset]),
+                    "negative": int(counts[1, offset]),
+                    "neutral": int(counts[2, offset]),
+                    "ewma": float(smoothed[offset]),
+                })
+    for i in range(0, len(points), batch_size):
+        db.session.execute(SentimentIndexPoint.__table__.insert(), points[i:i + batch_size])
+    bump_watermark()
+    db.session.commit()
+    return len(points)
+
+def ensure_index() -> int:
+    """
+    Build the index once for databases that have news but predate it, or whose
+    series names predate upper-case regions. Returns the number of points
+    written (0 when nothing had to be done).
+    """
+    if db.session.query(SentimentIndexPoint.region).first() is not None:
+        stale = (db.session.query(SentimentIndexPoint.region)
+                 .filter(SentimentIndexPoint.region != func.upper(SentimentIndexPoint.region)).first())
+        return rebuild_index() if stale is not None else 0
+    if db.session.query(NewsItem.id).first() is None:
+        return 0
+    return rebuild_index()
+
+def index_series(region: str = ALL_REGIONS, granularity: str = "day", since: Optional[datetime] = None,
+                 limit: int = 500) -> List[Dict]:
+    """
+    The newest `limit` points of a series, oldest first
+    """
+    query = SentimentIndexPoint.query.filter_by(region=region, granularity=granularity)
+    if since is not None:
+        query = query.filter(SentimentIndexPoint.bucket_start >= since)
+    points = query.order_by(SentimentIndexPoint.bucket_start.desc()).limit(limit).all()
+    return [{
+        "t": point.bucket_start,
+        "net": net_score(point.positive, point.negative, point.neutral),
+        "volume": point.positive + point.negative + point.neutral,
+        "ewma": point.ewma,
+    } for point in reversed(points)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-region sentiment index maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="Recompute the index from all stored news")
+    show = sub.add_parser("show", help="Print the newest points of a series")
+    show.add_argument("--region", default=ALL_REGIONS)
+    show.add_argument("--granularity", choices=GRANULARITIES, default="day")
+    show.add_argument("--limit", type=int, default=14)
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        from app import app
+    with app.app_context():
+        if args.command == "rebuild":
+            started = time.monotonic()
+            written = rebuild_index()
+            print(f"✅ Wrote {written} index points in {time.monotonic() - started:.1f}s")
+        else:
+            for point in index_series(args.region.upper(), args.granularity, limit=args.limit):
+                print(f"{point['t']:%Y-%m-%d %H:%M}  net {point['net']:+.2f}  ewma {point['ewma']:+.3f}  "
+                      f"volume {point['volume']}")
+
+if __name__ == "__main__":
+    main()
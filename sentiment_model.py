@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Hashed-feature naive Bayes sentiment model
+
+A middle ground between the keyword scorer and a transformer: unigrams and
+bigrams are hashed into a fixed number of feature buckets and scored with a
+multinomial naive Bayes model trained offline from labelled headlines. The
+weights are a single float32 .npy matrix (plus a small JSON sidecar) that is
+memory-mapped at load time, and inference for a batch is a gather plus a
+bincount per class, so a headline costs a few microseconds on CPU.
+
+    python sentiment_model.py train labelled_headlines.csv --out data/sentiment_model.npy
+    python sentiment_model.py evaluate labelled_headlines.csv
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import re
+import zlib
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sentiment_model.npy")
+LABELS = ("negative", "neutral", "positive")
+DEFAULT_N_FEATURES = 2 ** 17
+
+_TOKEN_RE = re.compile(r"\w+")
+
+def hashed_features(texts: Sequence[str], n_features: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sparse document-feature matrix in coordinate form.
+    Returns (doc_ids, feature_ids) with one entry per unigram/bigram occurrence;
+    features are crc32 hashes so IDs are stable across processes.
+    """
+    doc_ids = []
+    feature_ids = []
+    crc32 = zlib.crc32
+    for doc, text in enumerate(texts):
+        tokens = _TOKEN_RE.findall(text.lower()) if text else []
+        grams = tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+        feature_ids.extend(crc32(gram.encode("utf-8")) for gram in grams)
+        doc_ids.extend([doc] * len(grams))
+    return (np.asarray(doc_ids, dtype=np.int64),
+            np.asarray(feature_ids, dtype=np.int64) % n_features)
+
+class HashedNaiveBayes:
+    """
+    Multinomial naive Bayes over hashed features.
+    weights has shape (n_features + 1, n_classes): per-feature log likelihoods
+    followed by a row of log class priors.
+    """
+
+    def __init__(self, weights: np.ndarray, labels: Sequence[str] = LABELS, version: Optional[str] = None):
+        self.weights = weights
+        self.labels = np.array(labels, dtype=object)
+        self.n_features = weights.shape[0] - 1
+        self.version = version or "model"
+
+    @classmethod
+    def train(cls, texts: Sequence[str], labels: Sequence[str], n_features: int = DEFAULT_N_FEATURES,
+              alpha: float = 1.0) -> "HashedNaiveBayes":
+        label_index = {label: i for i, label in enumerate(LABELS)}
+        try:
+            y = np.array([label_index[label] for label in labels], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"Unknown label {e}, expected one of {', '.join(LABELS)}")
+        doc_ids, feature_ids = hashed_features(texts, n_features)
+
+        n_classes = len(LABELS)
+        counts = np.bincount(feature_ids * n_classes + y[doc_ids],
+                             minlength=n_features * n_classes).reshape(n_features, n_classes).astype(np.float64)
+        smoothed = counts + alpha
+        log_likelihood = np.log(smoothed) - np.log(smoothed.sum(axis=0, keepdims=True))
+        class_counts = np.bincount(y, minlength=n_classes) + 1.0
+        log_prior = np.log(class_counts / class_counts.sum())
+
+        weights = np.vstack([log_likelihood, log_prior[np.newaxis, :]]).astype(np.float32)
+        return cls(weights)
+
+    def save(self, path: str) -> str:
+        """Write the weights and sidecar; returns the weights path (np.save adds .npy when missing)"""
+        path = model_path(path)
+        np.save(path, self.weights)
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:12]
+        self.version = f"model-{digest}"
+        with open(_meta_path(path), "w") as f:
+            json.dump({"labels": list(self.labels), "n_features": self.n_features, "version": self.version}, f, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> "HashedNaiveBayes":
+        """Memory-map a saved model; pages are only read as features are used"""
+        path = model_path(path)
+        weights = np.load(path, mmap_mode="r")
+        with open(_meta_path(path)) as f:
+            meta = json.load(f)
+        return cls(weights, labels=meta["labels"], version=meta["version"])
+
+    def log_scores(self, texts: Sequence[str]) -> np.ndarray:
+        """Unnormalized class log-probabilities, shape (len(texts), n_classes)"""
+        n = len(texts)
+        doc_ids, feature_ids = hashed_features(texts, self.n_features)
+        gathered = np.asarray(self.weights[feature_ids], dtype=np.float64)
+        scores = np.empty((n, len(self.labels)))
+        for c in range(len(self.labels)):
+            scores[:, c] = np.bincount(doc_ids, weights=gathered[:, c], minlength=n)
+        return scores + np.asarray(self.weights[-1], dtype=np.float64)
+
+    def predict(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (labels, scores); score is the predicted class probability,
+        clamped to 0.1-0.9 like the keyword scorer
+        """
+        texts = list(texts)
+        if not texts:
+            return np.array([], dtype=object), np.array([], dtype=float)
+        log_scores = self.log_scores(texts)
+        log_scores -= log_scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(log_scores)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        scores = np.clip(probabilities[np.arange(len(texts)), best], 0.1, 0.9)
+        return self.labels[best], scores
+
+def model_path(path: str) -> str:
+    """The weights file np.save() writes for `path`"""
+    return path if path.endswith(".npy") else path + ".npy"
+
+def _meta_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".json"
+
+_default_model = None
+
+def get_sentiment_model() -> HashedNaiveBayes:
+    """Load the configured model once per process"""
+    global _default_model
+    if _default_model is None:
+        path = model_path(os.getenv("SENTIMENT_MODEL_PATH", DEFAULT_MODEL_PATH))
+        if not os.path.exists(path):
+            raise RuntimeError(f"Sentiment model not found at {path}; train one with 'python sentiment_model.py train'")
+        _default_model = HashedNaiveBayes.load(path)
+    return _default_model
+
+def read_labelled_csv(path: str) -> Tuple[List[str], List[str]]:
+    """Read text,label rows ('#' lines are comments)"""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = csv.DictReader(line for line in f if line.strip() and not line.startswith("#"))
+        pairs = [(row["text"], row["label"].strip().lower()) for row in rows]
+    return [text for text, _ in pairs], [label for _, label in pairs]
+
+def _accuracy(model: HashedNaiveBayes, texts: List[str], labels: List[str]) -> float:
+    predicted, _ = model.predict(texts)
+    return float(np.mean([p == l for p, l in zip(predicted, labels)])) if labels else 0.0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train or evaluate the hashed naive Bayes sentiment model")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train", help="Train from a CSV with text,label columns")
+    train.add_argument("data")
+    train.add_argument("--out", default=DEFAULT_MODEL_PATH)
+    train.add_argument("--features", type=int, default=DEFAULT_N_FEATURES, help="Number of hash buckets")
+    train.add_argument("--alpha", type=float, default=1.0, help="Additive smoothing")
+    train.add_argument("--holdout", type=float, default=0.1, help="Fraction held out for accuracy reporting")
+    evaluate = sub.add_parser("evaluate", help="Report accuracy of a saved model on a labelled CSV")
+    evaluate.add_argument("data")
+    evaluate.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    texts, labels = read_labelled_csv(args.data)
+    if args.command == "train":
+        pairs = list(zip(texts, labels))
+        random.Random(13).shuffle(pairs)
+        n_holdout = int(len(pairs) * args.holdout)
+        held_out, training = pairs[:n_holdout], pairs[n_holdout:]
+        model = HashedNaiveBayes.train([t for t, _ in training], [l for _, l in training],
+                                       n_features=args.features, alpha=args.alpha)
+        if held_out:
+            print(f"Holdout accuracy: {_accuracy(model, [t for t, _ in held_out], [l for _, l in held_out]):.3f} "
+                  f"({len(held_out)} examples)")
+        # Refit on everything before saving
+        model = HashedNaiveBayes.train(texts, labels, n_features=args.features, alpha=args.alpha)
+        path = model.save(args.out)
+        print(f"✅ Saved {model.version} ({os.path.getsize(path) / 1024:.0f} KiB) to {path}")
+    else:
+        model = HashedNaiveBayes.load(args.model)
+        print(f"Accuracy: {_accuracy(model, texts, labels):.3f} ({len(texts)} examples, {model.version})")
+
+if __name__ == "__main__":
+    main()
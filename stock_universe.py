@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Stock universe loaded from a data file
+
+Listings (symbol, name, sector, risk tier, exchange, description) live in
+data/stock_universe.csv, or a Parquet file with the same columns when pyarrow
+is installed. The file is read on first use into column tuples with posting
+lists per sector, risk tier and exchange, so a screen only visits the rows of
+its most selective filter. get_stock_universe() re-checks the file's mtime
+every few seconds and swaps in a new StockUniverse when it changes, and
+consumers that precompute from the universe (advisor pick index, entity
+extractor, sector classifier) rebuild when handed a different instance.
+
+    python stock_universe.py --sector Technology --risk Moderate
+"""
+
+import argparse
+import csv
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UNIVERSE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "stock_universe.csv")
+COLUMNS = ("symbol", "name", "sector", "risk", "exchange", "description")
+INDEXED_COLUMNS = ("sector", "risk", "exchange")
+RISK_TIERS = ("Conservative", "Moderate", "Aggressive")
+# Seconds between checks of the universe file for changes
+RELOAD_CHECK_INTERVAL = 5.0
+
+def read_listings(path: str) -> List[Dict[str, str]]:
+    """Rows of a CSV or Parquet universe file as dicts"""
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Reading a Parquet stock universe requires pyarrow")
+        return pq.read_table(path, columns=list(COLUMNS)).to_pylist()
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+class StockUniverse:
+    """
+    Column-oriented listings with posting-list indexes on sector, risk tier and exchange
+    """
+
+    def __init__(self, listings: Iterable[Dict[str, str]], version: int = 0):
+        columns = {column: [] for column in COLUMNS}
+        for line, listing in enumerate(listings, start=2):
+            symbol = (listing.get("symbol") or "").strip().upper()
+            risk = (listing.get("risk") or "").strip()
+            if not symbol or risk not in RISK_TIERS:
+                raise ValueError(f"Invalid listing on line {line}: symbol '{symbol}', risk '{risk}'")
+            columns["symbol"].append(symbol)
+            columns["name"].append((listing.get("name") or symbol).strip())
+            columns["sector"].append((listing.get("sector") or "").strip())
+            columns["risk"].append(risk)
+            columns["exchange"].append((listing.get("exchange") or "NASDAQ").strip().upper())
+            columns["description"].append((listing.get("description") or "").strip())
+        self.columns = {column: tuple(values) for column, values in columns.items()}
+        self.version = version
+
+        self._indexes = {column: {} for column in INDEXED_COLUMNS}
+        for column in INDEXED_COLUMNS:
+            for row, value in enumerate(self.columns[column]):
+                self._indexes[column].setdefault(value, []).append(row)
+        self._indexes = {column: {value: tuple(rows) for value, rows in index.items()}
+                         for column, index in self._indexes.items()}
+        self._exchanges = {}
+        for symbol, exchange in zip(self.columns["symbol"], self.columns["exchange"]):
+            self._exchanges.setdefault(symbol, exchange)
+        self._sector_map = None
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_UNIVERSE_PATH, version: int = 0) -> "StockUniverse":
+        return cls(read_listings(path), version=version)
+
+    def __len__(self):
+        return len(self.columns["symbol"])
+
+    def row(self, row: int) -> Dict[str, str]:
+        return {column: values[row] for column, values in self.columns.items()}
+
+    def values(self, column: str) -> List[str]:
+        """Distinct values of an indexed column"""
+        return sorted(self._indexes[column])
+
+    def exchange(self, symbol: str) -> Optional[str]:
+        return self._exchanges.get(symbol.upper())
+
+    def screen(self, sector: Optional[str] = None, risk: Optional[str] = None, exchange: Optional[str] = None,
+               limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Listings matching every given filter, in file order
+        """
+        filters = {"sector": sector, "risk": risk, "exchange": exchange.upper() if exchange else None}
+        postings = [self._indexes[column].get(value, ()) for column, value in filters.items() if value]
+        if not postings:
+            rows = range(len(self))
+        else:
+            postings.sort(key=len)
+            others = [set(p) for p in postings[1:]]
+            rows = [row for row in postings[0] if all(row in other for other in others)]
+        if limit is not None:
+            rows = rows[:limit]
+        return [self.row(row) for row in rows]
+
+    def sector_map(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """
+        sector -> symbol -> {"name", "sector", "risk", "description", "exchange"},
+        the shape FinancialAIAdvisor.stock_recommendations has always had
+        """
+        if self._sector_map is None:
+            sectors = {}
+            for row in range(len(self)):
+                listing = self.row(row)
+                sectors.setdefault(listing["sector"], {})[listing["symbol"]] = {
+                    "name": listing["name"],
+                    "sector": listing["sector"],
+                    "risk": listing["risk"],
+                    "description": listing["description"],
+                    "exchange": listing["exchange"],
+                }
+            self._sector_map = sectors
+        return self._sector_map
+
+_lock = threading.Lock()
+_universe = None
+_loaded = None  # (path, mtime) of the file behind _universe
+_checked_at = 0.0
+
+def get_stock_universe(path: Optional[str] = None) -> StockUniverse:
+    """
+    The configured universe, loaded on first use and reloaded when its file changes.
+    A file that fails to load is logged and the previous universe stays in use.
+    """
+    global _universe, _loaded, _checked_at
+    path = path or os.getenv("STOCK_UNIVERSE_PATH", DEFAULT_UNIVERSE_PATH)
+    now = time.monotonic()
+    if _universe is not None and _loaded[0] == path and now - _checked_at < RELOAD_CHECK_INTERVAL:
+        return _universe
+    with _lock:
+        _checked_at = now
+        try:
+            mtime = os.path.getmtime(path)
+            if _universe is None or _loaded != (path, mtime):
+                version = _universe.version + 1 if _universe is not None else 1
+                _universe = StockUniverse.from_file(path, version=version)
+                _loaded = (path, mtime)
+                logger.info(f"Loaded {len(_universe)} listings from {path}")
+        except (OSError, ValueError) as e:
+            if _universe is None:
+                raise
+            logger.warning(f"Keeping the previous stock universe, {path} failed to load: {e}")
+        return _universe
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen the stock universe")
+    parser.add_argument("--path", help="Universe file (default: STOCK_UNIVERSE_PATH or data/stock_universe.csv)")
+    parser.add_argument("--sector")
+    parser.add_argument("--risk", choices=RISK_TIERS)
+    parser.add_argument("--exchange")
+    parser.add_argument("--limit", type=int)
+    args = parser.parse_args(argv)
+
+    universe = get_stock_universe(args.path)
+    listings = universe.screen(sector=args.sector, risk=args.risk, exchange=args.exchange, limit=args.limit)
+    for listing in listings:
+        print(f"{listing['symbol']:<8} {listing['exchange']:<8} {listing['risk']:<13} {listing['sector']:<24} {listing['name']}")
+    print(f"📋 {len(listings)} of {len(universe)} listings")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,160 @@
-def generate_strategy(sentiment, region=None, user_type="investor"):
+#!/usr/bin/env python3
+"""
+Table-driven strategy advice
+
+Advice rules live in data/strategy_rules.csv, one row per (sentiment, score
+band, region, user type) with "*" as a wildcard. StrategyRules compiles them
+into a dict over every concrete combination, resolving overlaps once at load
+time (the rule with the most non-wildcard fields wins, then the earlier row),
+so advising is a single dict lookup. Ingestion stores the advice on each
+NewsItem with advise_batch(); after editing the rules, stored advice can be
+refreshed with:
+
+    python strategy.py readvise
+    python strategy.py show negative --score 0.9 --region US
+"""
+
+import argparse
+import contextlib
+import csv
+import hashlib
+import itertools
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "strategy_rules.csv")
+WILDCARD = "*"
+SENTIMENTS = ("positive", "neutral", "negative")
+USER_TYPES = ("investor", "student", "business")
+# Upper bounds of the confidence-score bands; scores from 0.8 up are "strong"
+SCORE_BANDS = (("weak", 0.6), ("moderate", 0.8), ("strong", float("inf")))
+FIELDS = ("sentiment", "score_band", "region", "user_type")
+
+def score_band(score: Optional[float]) -> str:
+    if score is None:
+        return WILDCARD
+    for band, upper in SCORE_BANDS:
+        if score < upper:
+            return band
+    return SCORE_BANDS[-1][0]
+
+class StrategyRules:
+    """
+    Decision table compiled to an O(1) lookup over (sentiment, score band, region, user type)
+    """
+
+    def __init__(self, rules: Iterable[Dict[str, str]]):
+        rules = [{field: (rule.get(field) or WILDCARD).strip() for field in FIELDS + ("advice",)} for rule in rules]
+        for rule in rules:
+            if rule["region"] != WILDCARD:
+                rule["region"] = rule["region"].upper()
+        self.rules = rules
+        # identifies the rule set, e.g. in ETags of views that fall back to generate_strategy()
+        self.version = hashlib.sha1(repr(rules).encode("utf-8")).hexdigest()[:12]
+        values = {field: {rule[field] for rule in rules} - {WILDCARD} for field in FIELDS}
+        self.regions = values["region"]
+        self.user_types = values["user_type"] | set(USER_TYPES)
+        self.sentiments = values["sentiment"] | set(SENTIMENTS)
+        bands = [band for band, _ in SCORE_BANDS]
+
+        self.table: Dict[Tuple[str, str, str, str], Optional[str]] = {}
+        for key in itertools.product(sorted(self.sentiments) + [WILDCARD], bands + [WILDCARD],
+                                     sorted(self.regions) + [WILDCARD], sorted(self.user_types) + [WILDCARD]):
+            best = None
+            for position, rule in enumerate(rules):
+                if all(rule[field] in (WILDCARD, value) for field, value in zip(FIELDS, key)):
+                    rank = (sum(rule[field] != WILDCARD for field in FIELDS), -position)
+                    if best is None or rank > best[0]:
+                        best = (rank, rule["advice"])
+            self.table[key] = best[1] if best else None
+
+    @classmethod
+    def from_csv(cls, path: str = DEFAULT_RULES_PATH) -> "StrategyRules":
+        with open(path, newline="", encoding="utf-8") as f:
+            return cls(csv.DictReader(f))
+
+    def advise(self, sentiment: Optional[str], score: Optional[float] = None, region: Optional[str] = None,
+               user_type: str = "investor") -> Optional[str]:
+        region = (region or "").upper()
+        key = (sentiment if sentiment in self.sentiments else WILDCARD,
+               score_band(score),
+               region if region in self.regions else WILDCARD,
+               user_type if user_type in self.user_types else WILDCARD)
+        return self.table[key]
+
+    def advise_batch(self, items: Iterable[Tuple[Optional[str], Optional[float], Optional[str]]],
+                     user_type: str = "investor") -> List[Optional[str]]:
+        """Advice for (sentiment, score, region) triples, e.g. a whole ingestion batch"""
+        return [self.advise(sentiment, score, region, user_type) for sentiment, score, region in items]
+
+_default_rules = None
+
+def get_strategy_rules() -> StrategyRules:
+    """Rules from STRATEGY_RULES_PATH (default data/strategy_rules.csv), compiled once per process"""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = StrategyRules.from_csv(os.getenv("STRATEGY_RULES_PATH", DEFAULT_RULES_PATH))
+    return _default_rules
+
+def generate_strategy(sentiment, region=None, user_type="investor", score=None):
     """
     sentiment: 'positive'|'neutral'|'negative'
     region: optional e.g. 'US', 'IN'
     user_type: 'investor','student','business'
+    score: optional confidence score of the sentiment
+    """
+    return get_strategy_rules().advise(sentiment, score, region, user_type)
+
+def readvise(batch_size: int = 1000) -> int:
+    """
+    Recompute the stored advice of every news item with the current rules
     """
-    # Basic mapping - extend with more rules or ML later
-    if sentiment == "negative":
-        if user_type == "investor":
-            return "Caution: Reduce exposure to high-volatility assets. Consider short-term bonds or gold ETFs."
-        if user_type == "student":
-            return "Caution: Keep emergency funds; avoid risky trading."
-        if user_type == "business":
-            return "Caution: Hedge currency risk and delay major non-essential expenditures."
-    elif sentiment == "positive":
-        if user_type == "investor":
-            return "Opportunity: Consider selective equity exposure; prioritize dividend or value stocks."
-        if user_type == "student":
-            return "Opportunity: Consider long-term investment with small SIPs."
-        if user_type == "business":
-            return "Opportunity: Consider gradual expansion; lock supplier contracts."
-    return "Neutral: Maintain diversification and monitor daily updates."
\ No newline at end of file
+    from sqlalchemy import bindparam
+
+    from models import db, NewsItem
+    from watermark import bump_watermark
+
+    rules = get_strategy_rules()
+    table = NewsItem.__table__
+    statement = table.update().where(table.c.id == bindparam("_id")).values(advice=bindparam("advice"))
+    last_id = 0
+    updated = 0
+    while True:
+        rows = (db.session.query(NewsItem.id, NewsItem.sentiment, NewsItem.score, NewsItem.region)
+                .filter(NewsItem.id > last_id).order_by(NewsItem.id).limit(batch_size).all())
+        if not rows:
+            break
+        advice = rules.advise_batch((sentiment, score, region) for _, sentiment, score, region in rows)
+        db.session.execute(statement, [{"_id": row[0], "advice": text} for row, text in zip(rows, advice)])
+        db.session.commit()
+        last_id = rows[-1][0]
+        updated += len(rows)
+    if updated:
+        # advice changed under views validated by the news watermark (e.g. /api/news/<id>)
+        bump_watermark()
+        db.session.commit()
+    return updated
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Strategy advice rules")
+    sub = parser.add_subparsers(dest="command", required=True)
+    refresh = sub.add_parser("readvise", help="Recompute stored advice for all news with the current rules")
+    refresh.add_argument("--batch-size", type=int, default=1000)
+    show = sub.add_parser("show", help="Print the advice for one case")
+    show.add_argument("sentiment", choices=SENTIMENTS)
+    show.add_argument("--score", type=float)
+    show.add_argument("--region")
+    show.add_argument("--user-type", default="investor")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        print(generate_strategy(args.sentiment, region=args.region, user_type=args.user_type, score=args.score))
+        return
+    with contextlib.redirect_stdout(sys.stderr):
+        from app import app
+    with app.app_context():
+        print(f"✅ Updated advice on {readvise(batch_size=args.batch_size)} news items")
+
+if __name__ == "__main__":
+    main()
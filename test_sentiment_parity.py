@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Label parity of the keyword scorer with the original analyze_text
+
+data/sentiment_regression.csv holds the original implementation's output
+(baseline_label, baseline_score) for each text, and the intended output
+(label, score). The two differ only on texts containing 'decline', which the
+original word list counted twice. Every path of the keyword scorer must
+reproduce the intended output exactly. Runs as a script or under pytest:
+
+    python test_sentiment_parity.py
+"""
+import csv
+import os
+import re
+
+# keep the check off the persistent result cache
+os.environ.setdefault("SENTIMENT_CACHE_PATH", "")
+
+from sentiment import analyze_text, analyze_texts, NUMPY_AVAILABLE
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sentiment_regression.csv")
+# The one intended behaviour change: 'decline' is counted once
+DECLINE_RE = re.compile(r"\bdecline\b")
+
+def read_corpus(path=CORPUS_PATH):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(line for line in f if line.strip() and not line.startswith("#")))
+
+def test_corpus_differs_from_baseline_only_on_decline():
+    for row in read_corpus():
+        if not DECLINE_RE.search(row["text"].lower()):
+            assert (row["label"], row["score"]) == (row["baseline_label"], row["baseline_score"]), row["text"]
+
+def _mismatches(results, rows):
+    return [(row["text"], (row["label"], float(row["score"])), (label, float(score)))
+            for row, (label, score) in zip(rows, results)
+            if label != row["label"] or abs(float(score) - float(row["score"])) > 1e-9]
+
+def test_analyze_text_parity():
+    rows = read_corpus()
+    results = [analyze_text(row["text"], scorer="keyword") for row in rows]
+    assert _mismatches(results, rows) == []
+
+def test_analyze_texts_parity():
+    rows = read_corpus()
+    texts = [row["text"] for row in rows]
+    backends = ["scalar", "vectorized"] if NUMPY_AVAILABLE else ["scalar"]
+    for backend in backends:
+        labels, scores = analyze_texts(texts, backend=backend, scorer="keyword")
+        assert _mismatches(zip(labels, scores), rows) == [], backend
+
+def main():
+    rows = read_corpus()
+    changed = sum(row["label"] != row["baseline_label"] for row in rows)
+    print(f"🔍 {len(rows)} texts, {changed} labels intentionally changed by the 'decline' fix")
+    failed = False
+    for check in (test_corpus_differs_from_baseline_only_on_decline, test_analyze_text_parity, test_analyze_texts_parity):
+        try:
+            check()
+            print(f"✅ {check.__name__}")
+        except AssertionError as e:
+            failed = True
+            print(f"❌ {check.__name__}: {e}")
+    raise SystemExit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Ingest watermark and watermark-keyed result caching
+
+Every code path that writes news (fetch routes, backfill, rescoring) calls
+bump_watermark() before committing, so the "news" watermark version changes
+atomically with the data and is visible to every process sharing the
+database. Reading it is a single primary-key lookup, which lets derived views
+such as /ai-advisor cache their results per watermark version and drop them
+the moment new data is committed.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Hashable, Optional, Tuple
+
+from models import db, Watermark
+
+NEWS_WATERMARK = "news"
+
+def bump_watermark(name: str = NEWS_WATERMARK) -> int:
+    """
+    Advance a watermark inside the current transaction; the caller commits.
+    Returns the new version (the row stays locked by this transaction until then).
+    """
+    table = Watermark.__table__
+    now = datetime.utcnow()
+    result = db.session.execute(
+        table.update().where(table.c.name == name).values(version=table.c.version + 1, updated_on=now))
+    if result.rowcount == 0:
+        db.session.execute(table.insert().values(name=name, version=1, updated_on=now))
+        return 1
+    return db.session.execute(db.select(table.c.version).where(table.c.name == name)).scalar()
+
+def read_watermark(name: str = NEWS_WATERMARK) -> Tuple[int, Optional[datetime]]:
+    """
+    Returns (version, updated_on); (0, None) before the first bump
+    """
+    row = db.session.query(Watermark.version, Watermark.updated_on).filter(Watermark.name == name).first()
+    return (row[0], row[1]) if row else (0, None)
+
+class WatermarkCache:
+    """
+    Bounded cache of results computed from one watermark version.
+    Entries are dropped wholesale as soon as a lookup sees a newer version;
+    `ttl` (seconds) additionally expires results that depend on the clock.
+    """
+
+    def __init__(self, maxsize: int = 32, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version, key: Hashable):
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+            entry = self._entries.get(key)
+            if entry is None or (self.ttl is not None and time.monotonic() - entry[1] > self.ttl):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, version, key: Hashable, result):
+        with self._lock:
+            if version != self.version:
+                # computed from a snapshot that is already stale
+                return
+            self._entries[key] = (result, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }